@@ -0,0 +1,58 @@
+import logging  # noqa
+import random
+import time
+
+from dictlist2 import DictList2
+
+
+def make_data(rows: int, groups: int) -> DictList2:
+    """Синтетическая выгрузка: группы ~ rows / 40, как в биллинге."""
+    rnd = random.Random(1)
+    return DictList2(
+        [
+            {
+                "account": rnd.randrange(groups),
+                "hours": rnd.randrange(100),
+                "cost": rnd.random() * 1000,
+            }
+            for _ in range(rows)
+        ]
+    )
+
+
+def report(name: str, rows: int, groups: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<10} rows={rows:>9} groups={groups:>7} "
+        f"total={elapsed:8.3f}s per_row={elapsed / rows * 1e6:6.2f}us"
+    )
+
+
+def main():
+    """
+    Время aggregate() и group_by() при росте числа строк и групп.
+
+    Время на строку должно оставаться примерно постоянным (линейный рост).
+    """
+    for rows in (10_000, 100_000, 1_000_000):
+        data = make_data(rows, groups=max(1, rows // 40))
+        started = time.perf_counter()
+        result = data.aggregate(
+            group_columns="account",
+            aggregations={
+                "hours": ["sum", "avg"],
+                "cost": ["min", "max"],
+                "account": "count",
+            },
+        )
+        report("aggregate", rows, len(result), started)
+
+        started = time.perf_counter()
+        result = data.group_by(
+            group_columns="account", total_columns=["hours", "cost"]
+        )
+        report("group_by", rows, len(result), started)
+
+
+if __name__ == "__main__":
+    main()
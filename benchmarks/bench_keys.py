@@ -0,0 +1,42 @@
+import logging  # noqa
+import time
+
+from bench_aggregate import make_data
+
+from dictlist2._keys import tuple_getter
+
+
+def measure(name: str, fields: list, get, rows) -> None:
+    started = time.perf_counter()
+    for item in rows:
+        get(item)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<10} fields={len(fields)} "
+        f"per_row={elapsed / len(rows) * 1e9:7.1f}ns"
+    )
+
+
+def main():
+    """
+    Стоимость построения ключа группы на строку: генераторное выражение
+    против общих функций из _keys (мягкий и строгий доступ).
+    """
+    rows = make_data(1_000_000, groups=25_000)
+    for fields in (
+        ["account"],
+        ["account", "hours"],
+        ["account", "hours", "cost"],
+    ):
+        measure(
+            "genexpr",
+            fields,
+            lambda item: tuple(item.get(k) for k in fields),
+            rows,
+        )
+        measure("get", fields, tuple_getter(fields), rows)
+        measure("strict", fields, tuple_getter(fields, strict=True), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import logging  # noqa
+import os
+import resource
+import time
+
+from bench_aggregate import make_data
+
+AGGREGATIONS = {
+    "hours": ["sum", "avg"],
+    "cost": ["min", "max"],
+    "account": "count",
+}
+
+
+def children_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def measure(function):
+    """
+    Время выполнения: (полное, CPU основного процесса, CPU обработчиков).
+
+    Процессы пула завершаются внутри вызова, поэтому их время уже
+    учтено в RUSAGE_CHILDREN.
+    """
+    started = time.perf_counter()
+    main_started = time.process_time()
+    children_started = children_time()
+    function()
+    return (
+        time.perf_counter() - started,
+        time.process_time() - main_started,
+        children_time() - children_started,
+    )
+
+
+def report(name: str, workers: int, single: float, function) -> None:
+    """
+    Печатает время и ускорение при workers процессах.
+
+    Основной процесс работает последовательно, поэтому single / main —
+    предел ускорения при любом числе ядер. estimate — ожидаемое время,
+    если обработчикам хватит ядер: main + workers_cpu / workers.
+    """
+    elapsed, main, children = measure(function)
+    estimate = main + children / workers
+    print(
+        f"{name:<9} workers={workers:<2} {elapsed:8.3f}s "
+        f"speedup={single / elapsed:5.2f}x main={main:6.3f}s "
+        f"workers_cpu={children:6.3f}s limit={single / main:5.1f}x "
+        f"estimate={estimate:6.3f}s ({single / estimate:4.2f}x)"
+    )
+
+
+def main():
+    """
+    Время aggregate() и group_by() в одном процессе и в нескольких.
+
+    Результаты параллельного и однопроцессного вариантов сравниваются.
+    Кроме полного времени печатается CPU основного процесса (часть,
+    которая не распараллеливается) и суммарный CPU обработчиков: на
+    машине с меньшим числом ядер, чем workers, реальное ускорение
+    измерить нельзя, и тогда смотреть нужно на estimate.
+    """
+    cores = os.cpu_count() or 1
+    rows = 1_000_000
+    data = make_data(rows, groups=rows // 40)
+    print(f"rows={rows} cores={cores}")
+
+    expected = data.aggregate("account", AGGREGATIONS)
+    single = measure(lambda: data.aggregate("account", AGGREGATIONS))[0]
+    print(f"aggregate workers=1  {single:8.3f}s")
+    for workers in sorted({2, 4, cores} - {1}):
+        result = data.aggregate("account", AGGREGATIONS, workers=workers)
+        assert result == expected
+        report(
+            "aggregate",
+            workers,
+            single,
+            lambda: data.aggregate("account", AGGREGATIONS, workers=workers),
+        )
+
+    fields = ["hours", "cost"]
+    expected = data.group_by("account", fields)
+    single = measure(lambda: data.group_by("account", fields))[0]
+    print(f"group_by  workers=1  {single:8.3f}s")
+    for workers in sorted({2, 4, cores} - {1}):
+        assert data.group_by("account", fields, workers=workers) == expected
+        report(
+            "group_by",
+            workers,
+            single,
+            lambda: data.group_by("account", fields, workers=workers),
+        )
+
+
+if __name__ == "__main__":
+    main()
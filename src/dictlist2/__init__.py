@@ -1,6 +1,32 @@
 import logging  # noqa
-from typing import Union, List, Any, Dict, Iterator, Tuple, Self
-from functools import reduce
+from itertools import islice
+from typing import Union, List, Any, Dict, Iterable, Iterator, Tuple, Self
+
+from ._aggregate import (  # noqa
+    Accumulator,
+    check_group_order,
+    distinct_keys,
+    group_sort_key,
+    hash_aggregate,
+    hash_group_by,
+    partition,
+    register_aggregation,
+)
+from ._columnar import ColumnarDictList
+from ._external import check_max_rows, external_sort
+from ._fingerprint import unique_rows
+from ._index import HashIndex, IndexSet, SortedIndex, index_fields
+from ._join import hash_join, merge_join, probe_join
+from ._numpy import numpy_aggregate
+from ._parallel import check_workers, parallel_aggregate, parallel_group_by
+from ._ordering import check_nulls, single_key, sort_rows
+from ._predicate import compile_where, range_bounds, split_where
+from ._query import Query
+from ._schema import Record, infer_fields, schema_for  # noqa
+from ._spill import check_max_groups, spill_aggregate, spill_group_by
+from ._stream import DictStream  # noqa
+from ._topn import partition_top, top_rows
+from ._view import AggregateView, ViewSet  # noqa
 
 
 class DictList2(list):
@@ -10,24 +36,276 @@ class DictList2(list):
     Предоставляет методы для удобной обработки коллекций словарей:
     - unique(): исключает дубликаты;
     - sort(): сортирует по одному или нескольким ключам;
+    - top() / bottom(): первые n строк сортировки без полной сортировки;
     - distinct(): возвращает уникальные значения по заданным ключам;
     - filter(): фильтрует по значению одного или нескольких полей;
     - gen_filter(): группирует и возвращает генератор (группа → элементы);
     - join(): внутреннее объединение по ключу;
     - left_join(): левое объединение по ключу;
+    - merge_join(): соединение слиянием отсортированных списков;
     - group_by(): группировка с суммированием полей;
-    - aggregate(): универсальная агрегация (sum, count, avg, min, max).
+    - aggregate(): универсальная агрегация (sum, count, avg, min, max);
+    - aggregate_view(): результат aggregate(), обновляемый при изменении
+      списка;
+    - query(): ленивый конвейер операций с выполнением за один проход;
+    - to_columns(): колоночное представление (ColumnarDictList);
+    - create_index(): хэш- и упорядоченные индексы по полям;
+    - with_schema(): компактное хранение строк с общей схемой полей.
 
     Подходит для подготовки отчётов, аналитики, группировки данных и
     построения таблиц без сторонних библиотек.
 
     Все методы возвращают новые списки, не модифицируя оригинальные данные.
+    Для входа, который не помещается в память, есть потоковый аналог
+    DictStream.
     """
 
-    def unique(self) -> Self:
+    # Индексы по полям (create_index); при изменении списка устаревают
+    _index_set = None
+
+    # Схема строк (with_schema); после изменения списка не используется
+    _schema = None
+
+    # Представления aggregate_view(); получают изменения списка
+    _views = None
+
+    def _invalidate_indexes(self) -> None:
+        if self._index_set is not None:
+            self._index_set.invalidate()
+        self._schema = None
+
+    def _notify(self, event: str, *items: Iterable[Any]) -> None:
+        """Сообщает представлениям об изменении списка (см. ViewSet)."""
+        if self._views is not None:
+            getattr(self._views, event)(self, *items)
+
+    def _like(self, rows: Iterable[Any]) -> Self:
+        """Новый список из строк этого списка (схема сохраняется)."""
+        result = DictList2(rows)
+        result._schema = self._schema
+        return result
+
+    def _schema_index(
+        self, by: Union[str, List[str], Dict[str, str]]
+    ) -> Union[Dict[str, int], None]:
+        """Индекс полей схемы для сортировки, если все поля by есть."""
+        if self._schema is None:
+            return None
+        index = self._schema.index
+        fields = [by] if isinstance(by, str) else list(by)
+        if any(field not in index for field in fields):
+            return None
+        if any(item._absent is not None for item in self):
+            return None
+        return index
+
+    def with_schema(self, fields: Union[List[str], None] = None) -> Self:
+        """
+        Компактная копия списка: строки хранятся кортежами значений с
+        общей для всех строк схемой полей (Record).
+
+        Строки остаются отображениями: row["x"], row.get("x"), in,
+        items() и сравнение со словарями работают как у dict, а все
+        методы DictList2 принимают такой список. filter() и sort()
+        читают поля по номеру в кортеже. Память на строку меньше в
+        несколько раз, потому что имена полей не повторяются.
+
+        data = DictList2([{"id": 1, "name": "Alice"}]).with_schema()
+        data[0]["name"]  # 'Alice'
+
+        :param fields: поля схемы; None — все поля строк в порядке
+            появления. Поле строки вне схемы — ValueError.
+        :return: новый список из Record
+        """
+        fields = tuple(fields) if fields is not None else infer_fields(self)
+        schema = schema_for(fields)
+        result = DictList2(schema.pack(item) for item in self)
+        result._schema = schema
+        return result
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._invalidate_indexes()
+        self._notify("appended", [item])
+
+    def extend(self, items: Any) -> None:
+        start = len(self)
+        super().extend(items)
+        self._invalidate_indexes()
+        if self._views is not None:
+            self._notify("appended", self[start:])
+
+    def insert(self, index: int, item: Any) -> None:
+        at_end = index >= len(self)
+        super().insert(index, item)
+        self._invalidate_indexes()
+        self._notify("appended" if at_end else "inserted", [item])
+
+    def remove(self, item: Any) -> None:
+        if self._views is not None:
+            # Удаляется первая равная строка, а не переданный объект
+            item = self[self.index(item)]
+        super().remove(item)
+        self._invalidate_indexes()
+        self._notify("removed", [item])
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        self._invalidate_indexes()
+        self._notify("removed", [item])
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._invalidate_indexes()
+        self._notify("cleared")
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._invalidate_indexes()
+        self._notify("reordered")
+
+    def __setitem__(self, index, value) -> None:
+        if self._views is None:
+            super().__setitem__(index, value)
+            self._invalidate_indexes()
+            return
+        if isinstance(index, slice):
+            value = list(value)
+            old, new = self[index], value
+        else:
+            old, new = [self[index]], [value]
+        super().__setitem__(index, value)
+        self._invalidate_indexes()
+        self._notify("removed", old)
+        self._notify("inserted", new)
+
+    def __delitem__(self, index) -> None:
+        old = None
+        if self._views is not None:
+            old = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        self._invalidate_indexes()
+        self._notify("removed", old)
+
+    def __iadd__(self, items) -> Self:
+        start = len(self)
+        result = super().__iadd__(items)
+        self._invalidate_indexes()
+        if self._views is not None:
+            self._notify("appended", self[start:])
+        return result
+
+    def __imul__(self, count: int) -> Self:
+        start = len(self)
+        result = super().__imul__(count)
+        self._invalidate_indexes()
+        if self._views is None:
+            return result
+        if start and count <= 0:
+            self._notify("cleared")
+        else:
+            self._notify("appended", self[start:])
+        return result
+
+    def create_index(
+        self, fields: Union[str, List[str]], kind: str = "hash"
+    ) -> None:
+        """
+        Создаёт индекс по полю или набору полей.
+
+        Хэш-индекс (kind="hash") используется автоматически:
+        - filter(), если все поля индекса есть в условии where;
+        - join() / left_join(), когда этот список — правый и индекс
+          построен ровно по полям ключа;
+        - gen_filter(), group_by(), aggregate() при группировке ровно
+          по полям индекса.
+
+        Упорядоченный индекс (kind="sorted") строится по одному полю и
+        используется:
+        - filter() с диапазоном по этому полю
+          ({"ts": {"between": (a, b)}}, {"ts": {">=": a, "<": b}});
+        - sort(by=поле, use_index=True) и top() / bottom() с
+          use_index=True, если поле есть во всех строках и не None.
+
+        После изменения списка (append, extend, __setitem__, ...) индекс
+        перестраивается при следующем использовании. Изменение самих
+        строк на месте (data[0]["ts"] = 0) список не видит: индекс
+        остаётся прежним, и filter() может пропустить строку, а sort()
+        с use_index=True — вернуть её не на своём месте. После таких
+        изменений вызовите refresh_indexes().
+
+        data.create_index("project")
+        data.create_index(["tenant", "id"])
+        data.create_index("ts", kind="sorted")
+
+        :param fields: поле или список полей индекса
+        :param kind: "hash" или "sorted"
+        """
+        fields = index_fields(fields)
+        if kind == "hash":
+            index = HashIndex(fields)
+        elif kind == "sorted":
+            if len(fields) != 1:
+                raise ValueError("Sorted index supports a single field")
+            index = SortedIndex(fields[0])
+        else:
+            raise ValueError(f"Unknown index kind: {kind}")
+
+        if self._index_set is None:
+            self._index_set = IndexSet()
+        index.build(self)
+        if kind == "hash":
+            self._index_set.add(index)
+        else:
+            self._index_set.add_sorted(index)
+
+    def drop_index(self, fields: Union[str, List[str]]) -> None:
+        """
+        Удаляет индекс, созданный create_index().
+
+        :param fields: поле или список полей индекса
+        """
+        if self._index_set is not None:
+            self._index_set.drop(index_fields(fields))
+
+    def refresh_indexes(self) -> None:
+        """
+        Помечает индексы устаревшими после изменения строк на месте;
+        они перестраиваются при следующем использовании.
+        """
+        if self._index_set is not None:
+            self._index_set.invalidate()
+
+    def _index(self, fields: Union[str, List[str]]) -> Union[HashIndex, None]:
+        """Актуальный индекс ровно по указанным полям или None."""
+        if self._index_set is None:
+            return None
+        return self._index_set.get(index_fields(fields), self)
+
+    def _partitions(
+        self, fields: Union[List[str], None]
+    ) -> Union[Dict[Tuple[Any, ...], List[Dict[str, Any]]], None]:
+        """Разбиение строк на группы по индексу или None."""
+        if not fields:
+            return None
+        index = self._index(fields)
+        if index is None:
+            return None
+        return {
+            key: [self[pos] for pos in positions]
+            for key, positions in index.buckets.items()
+        }
+
+    def unique(self, digest: bool = False) -> Self:
         """
         Возвращает список уникальных словарей на основе всех ключей и значений.
 
+        Значения могут быть списками и словарями (сравниваются по
+        содержимому). digest=True хранит вместо ключей строк их хэши —
+        меньше памяти на больших списках; совпадения хэшей проверяются
+        сравнением строк.
+
         data = DictList2([
             {"id": 1, "name": "Alice"},
             {"id": 2, "name": "Bob"},
@@ -43,23 +321,18 @@ class DictList2(list):
         {'id': 2, 'name': 'Bob'}
         {'id': 3, 'name': 'Charlie'}
 
+        :param digest: хранить хэши строк вместо их ключей.
         :return: Список уникальных словарей без дубликатов
         """
-        seen = set()
-        result = []
-
-        for item in self:
-            # Преобразуем словарь в кортеж пар (ключ, значение) -
-            # хэшируемое представление
-            key = frozenset(item.items())
-            if key not in seen:
-                seen.add(key)
-                result.append(item)
-
-        return DictList2(result)
+        return DictList2(unique_rows(self, digest))
 
     def sort(
-        self, by: Union[str, List[str]] = None, reverse: bool = False
+        self,
+        by: Union[str, List[str], Dict[str, str]] = None,
+        reverse: bool = False,
+        max_rows: Union[int, None] = None,
+        nulls: Union[str, None] = None,
+        use_index: bool = False,
     ) -> Self:
         """
         Сортировка списка словарей по одному или нескольким ключам.
@@ -92,27 +365,72 @@ class DictList2(list):
         {'city': 'Moscow', 'age': 25}
         {'city': 'Moscow', 'age': 30}
 
-        :param by: ключ (str) или список ключей (list[str]) для сортировки
+        # Пример 3: Своё направление для каждого ключа
+
+        sorted_data = data.sort(by={"city": "asc", "age": "desc"})
+
+        {'city': 'London', 'age': 40}
+        {'city': 'Moscow', 'age': 30}
+        {'city': 'Moscow', 'age': 25}
+
+        # Пример 4: Внешняя сортировка с бюджетом памяти
+
+        sorted_data = data.sort(by="id", max_rows=100_000)
+
+        :param by: ключ (str), список ключей (list[str]) или словарь
+            {ключ: "asc" | "desc"} с направлением для каждого ключа
         :param reverse: если True — сортировка в обратном порядке
+            (для словаря — меняет направление каждого ключа)
+        :param max_rows: бюджет памяти в строках: если строк больше,
+            список сортируется частями, которые сбрасываются во временные
+            файлы и сливаются (внешняя сортировка). None — в памяти
+        :param nulls: "first" или "last" — значения None в начале или
+            в конце независимо от направления. None — без особой
+            обработки (сравнение с None вызывает TypeError)
+        :param use_index: True — взять порядок из упорядоченного индекса
+            по полю by (create_index(..., kind="sorted")), если он есть.
+            Индекс не видит изменений строк на месте, см. create_index()
         :return: отсортированный список словарей
         """
+        check_max_rows(max_rows)
+        check_nulls(nulls)
         if by is None:
             return self
 
-        if isinstance(by, list):
-            return DictList2(
-                sorted(
-                    self,
-                    key=lambda item: tuple(item[key] for key in by),
-                    reverse=reverse,
-                )
+        field = by[0] if isinstance(by, list) and len(by) == 1 else by
+        if (
+            use_index
+            and isinstance(field, str)
+            and nulls is None
+            and self._index_set is not None
+        ):
+            index = self._index_set.get_sorted(field, self)
+            if index is not None and index.complete:
+                # Порядок уже есть в упорядоченном индексе
+                return self._like(self[pos] for pos in index.ordered(reverse))
+
+        if max_rows is not None and len(self) > max_rows:
+            # Во временные файлы пишутся только номера строк: ключи
+            # вычисляются заново при слиянии, словари не копируются
+            key, descending = single_key(by, reverse, nulls)
+            positions = external_sort(
+                range(len(self)),
+                key=lambda pos: key(self[pos]),
+                reverse=descending,
+                max_rows=max_rows,
             )
+            return self._like(self[pos] for pos in positions)
 
-        return DictList2(
-            sorted(self, key=lambda item: item[by], reverse=reverse)
-        )
+        # Разные направления — несколько устойчивых проходов
+        index = self._schema_index(by)
+        return self._like(sort_rows(self, by, reverse, nulls, index))
 
-    def distinct(self, by: Union[str, List[str], None] = None) -> Self:
+    def distinct(
+        self,
+        by: Union[str, List[str], None] = None,
+        digest: bool = False,
+        order: Union[str, None] = "sorted",
+    ) -> Self:
         """
         Возвращает уникальные элементы из списка словарей.
 
@@ -123,6 +441,12 @@ class DictList2(list):
 
         :param by: Ключ или список ключей, по которым нужно определить
                 уникальность.
+        :param digest: для by=None — хранить хэши строк вместо их ключей
+                (см. unique()).
+        :param order: порядок результата для `by`: "sorted" — по тем же
+                полям (None как ""), "first_seen" и None — в порядке
+                первого появления, без сортировки. Без `by` строки всегда
+                идут в порядке первого появления.
         :return: Список словарей с уникальными значениями.
 
         Примеры:
@@ -152,36 +476,14 @@ class DictList2(list):
         >>> data.distinct(by=["project", "name"])
         [{'project': 'A', 'name': 'Anna'}, {'project': 'B', 'name': 'Anna'}]
         """
+        check_group_order(order)
         if by is None:
             # Уникальность по всему словарю
-            seen = set()
-            result = []
-            for item in self:
-                key = frozenset(item.items())
-                if key not in seen:
-                    seen.add(key)
-                    result.append(item)
-            return DictList2(result)
+            return DictList2(unique_rows(self, digest))
 
         # Уникальность только по указанным полям
         keys = [by] if isinstance(by, str) else by
-        seen = set()
-        result = []
-        for item in self:
-            key = tuple(item.get(k) for k in keys)
-            if key not in seen:
-                seen.add(key)
-                result.append({k: item.get(k) for k in keys})
-
-        # Сортировка по тем же полям
-        return DictList2(
-            sorted(
-                result,
-                key=lambda row: tuple(
-                    row[k] if row[k] is not None else "" for k in keys
-                ),
-            )
-        )
+        return DictList2(distinct_keys(self, keys, order))
 
     def filter(
         self, where: Dict[str, Any], order: Union[str, List[str], None] = None
@@ -192,7 +494,16 @@ class DictList2(list):
         Сравнение выполняется по точному совпадению значений ключей. Также
         можно указать сортировку результата по одному или нескольким полям.
 
-        :param where: Условия фильтрации в виде словаря {ключ: значение}.
+        Вместо значения можно задать словарь операторов: "==", "!=",
+        ">", ">=", "<", "<=", "between", "in", "not in", "is None",
+        "startswith" (None сравнениям и диапазону не соответствует), а
+        также логические ключи "and", "or" (список условий) и "not".
+        Условие компилируется в функцию один раз на вызов. Если по полям
+        условия есть индекс (create_index), строки берутся из индекса
+        без полного просмотра.
+
+        :param where: Условия фильтрации в виде словаря {ключ: значение}
+            или {ключ: {оператор: значение}}.
         :param order: Ключ или список ключей для сортировки результата.
         :return: Отфильтрованный и (опционально) отсортированный список.
 
@@ -215,21 +526,72 @@ class DictList2(list):
         >>> data.filter(where={"role": "User"}, order="id")
         [{'id': 2, 'name': 'Bob', 'role': 'User'},
          {'id': 3, 'name': 'Alice', 'role': 'User'}]
-        """
 
-        def matches(item: Dict[str, Any]) -> bool:
-            return all(item.get(k) == v for k, v in where.items())
+        Фильтрация по диапазону:
 
-        filtered = [item for item in self if matches(item)]
+        >>> data.filter(where={"id": {">=": 2, "<": 3}})
+        [{'id': 2, 'name': 'Bob', 'role': 'User'}]
 
-        if order:
-            return DictList2(filtered).sort(by=order)
-        return DictList2(filtered)
+        Операторы и логика:
+
+        >>> data.filter(where={
+        ...     "or": [{"role": "Admin"}, {"name": {"startswith": "B"}}],
+        ...     "id": {"!=": 3},
+        ... })
+        [{'id': 1, 'name': 'Alice', 'role': 'Admin'},
+         {'id': 2, 'name': 'Bob', 'role': 'User'}]
+        """
+
+        schema = self._schema
+        matches = compile_where(where, schema.index if schema else None)
+        positions, ordered = self._candidates(where, order)
+        if positions is None:
+            filtered = [item for item in self if matches(item)]
+        else:
+            # Кандидаты по индексу, все условия проверяются явно
+            filtered = [self[pos] for pos in positions if matches(self[pos])]
+
+        if order and not ordered:
+            return self._like(filtered).sort(by=order)
+        return self._like(filtered)
+
+    def _candidates(
+        self, where: Dict[str, Any], order: Union[str, List[str], None]
+    ) -> Tuple[Union[List[int], None], bool]:
+        """
+        Номера строк-кандидатов для where по индексам.
+
+        :return: (номера строк или None — индекса нет, True — номера уже
+            упорядочены по order)
+        """
+        if self._index_set is None:
+            return None, False
+        equal, ranges = split_where(where)
+
+        index = self._index_set.best_for(equal, self)
+        if index is not None:
+            try:
+                key = tuple(equal[f] for f in index.fields)
+                return index.lookup(key), False
+            except TypeError:
+                pass  # нехэшируемое значение в условии
+
+        for field, condition in ranges.items():
+            index = self._index_set.get_sorted(field, self)
+            if index is not None:
+                positions = index.range(*range_bounds(condition))
+                if order == field or order == [field]:
+                    return positions, True
+                return sorted(positions), False
+
+        return None, False
 
     def gen_filter(
         self,
         by: Union[str, List[str], None],
         order: Union[str, List[str], Dict[str, str], None] = None,
+        limit: Union[int, None] = None,
+        group_order: Union[str, None] = "sorted",
     ) -> Iterator[Tuple[Dict[str, Any], Self]]:
         """
         Генератор: группирует элементы по уникальным значениям `by` и
@@ -238,7 +600,14 @@ class DictList2(list):
 
         :param by: Ключ или список ключей, по которым группировать.
         :param order: Ключ, список ключей или словарь {ключ: 'asc'|'desc'}
-                    для сортировки в каждой группе.
+                    для сортировки в каждой группе. Поле словаря может
+                    отсутствовать в строке — оно читается как None.
+        :param limit: Сколько первых элементов оставить в каждой группе
+                    («топ-N по группам»). Группы не собираются целиком:
+                    за один проход в каждой хранится не больше 2 × limit
+                    кандидатов.
+        :param group_order: Порядок групп, как `order` в distinct():
+                    "sorted", "first_seen" или None.
         :yield: Кортеж (значения группы, список элементов в группе).
 
         Примеры:
@@ -255,41 +624,125 @@ class DictList2(list):
         ...     print(key)
         ...     for row in group:
         ...         print("  ", row)
-        """
-        for group_key in self.distinct(by=by):
 
-            def matches(item: Dict[str, Any]) -> bool:
-                return all(item.get(k) == v for k, v in group_key.items())
+        >>> # Два самых загруженных сотрудника в каждом проекте
+        >>> data.gen_filter(by="project", order={"hours": "desc"}, limit=2)
+        """
+        check_group_order(group_order)
+        by_keys = [by] if isinstance(by, str) else by
+        # Поле словаря order может отсутствовать в строке (читается
+        # как None); поле или список полей обязательны, как в sort()
+        strict = not isinstance(order, dict)
+
+        if limit is not None and by_keys is not None:
+            key, reverse = (
+                single_key(order, strict=strict) if order else (None, False)
+            )
+            for group_key, group_items in partition_top(
+                self, by_keys, limit, key, reverse, group_order
+            ):
+                yield group_key, DictList2(group_items)
+            return
+
+        # Строки раскладываются по группам за один проход, а сортировка
+        # группы выполняется только когда потребитель до неё дошёл
+        partitions = self._partitions(by_keys)
+        for group_key, group_items in partition(
+            self, by_keys, partitions, group_order
+        ):
+            if order:
+                # Для словаря — своё направление у каждого поля
+                group_items = sort_rows(group_items, order, strict=strict)
+
+            if limit is not None:
+                group_items = group_items[:limit]
+            yield group_key, DictList2(group_items)
 
-            group_items = [item for item in self if matches(item)]
+    def top(
+        self,
+        n: int,
+        by: Union[str, List[str], Dict[str, str]],
+        reverse: bool = True,
+        nulls: Union[str, None] = None,
+        use_index: bool = False,
+    ) -> Self:
+        """
+        Первые n строк sort(by, reverse=reverse) без полной сортировки.
 
-            if isinstance(order, dict):
-                # Сортировка по каждому полю с направлением
-                keys = list(order.keys())
-                reverse_flags = [order[k] == "desc" for k in keys]
+        Правило одно для любой формы by: top() — начало sort(by,
+        reverse=True), bottom() — начало sort(by). Для поля и списка
+        полей это n наибольших и n наименьших значений. by={"s": "asc"}
+        равносилен by="s"; для by={"s": "desc"} top() даёт наименьшие s,
+        а bottom() — наибольшие (начало сортировки в заданных
+        направлениях). Используется куча (heapq.nlargest / nsmallest):
+        время O(строк × log n). Порядок равных ключей такой же, как у
+        sort().
 
-                def sort_key(item):
-                    return tuple(item.get(k) for k in keys)
+        data = DictList2([
+            {"user": "Anna", "hours": 5},
+            {"user": "Ivan", "hours": 8},
+            {"user": "Oleg", "hours": 5},
+        ])
 
-                group_items.sort(
-                    key=sort_key,
-                    reverse=(
-                        all(reverse_flags)
-                        if len(set(reverse_flags)) == 1
-                        else False
-                    ),
-                )
+        data.top(2, by="hours")
 
-            elif order:
-                group_items = DictList2(group_items).sort(by=order)
+        {'user': 'Ivan', 'hours': 8}
+        {'user': 'Anna', 'hours': 5}
 
-            yield group_key, DictList2(group_items)
+        :param n: сколько строк вернуть
+        :param by: ключ, список ключей или словарь направлений, как в sort()
+        :param reverse: как в sort(): True (по умолчанию) меняет
+            направление каждого поля by на обратное
+        :param nulls: положение None, как в sort()
+        :param use_index: взять порядок из упорядоченного индекса, как
+            в sort()
+        :return: список из не более чем n словарей в порядке сортировки
+        """
+        field = by[0] if isinstance(by, list) and len(by) == 1 else by
+        if (
+            use_index
+            and isinstance(field, str)
+            and nulls is None
+            and self._index_set is not None
+        ):
+            index = self._index_set.get_sorted(field, self)
+            if index is not None and index.complete:
+                positions = islice(index.ordered(reverse), max(n, 0))
+                return self._like(self[pos] for pos in positions)
+
+        key, descending = single_key(by, reverse, nulls)
+        return self._like(top_rows(self, n, key, descending))
+
+    def bottom(
+        self,
+        n: int,
+        by: Union[str, List[str], Dict[str, str]],
+        nulls: Union[str, None] = None,
+        use_index: bool = False,
+    ) -> Self:
+        """
+        Первые n строк sort(by) — наименьшие значения, как top(...,
+        reverse=False).
+
+        :param n: сколько строк вернуть
+        :param by: ключ, список ключей или словарь направлений, как в sort()
+        :param nulls: положение None, как в sort()
+        :param use_index: взять порядок из упорядоченного индекса, как
+            в sort()
+        :return: список из не более чем n словарей в порядке sort(by)
+        """
+        return self.top(n, by, reverse=False, nulls=nulls, use_index=use_index)
 
-    def join(self, right: Self, key: str) -> Self:
+    def join(
+        self, right: List[Dict[str, Any]], key: Union[str, List[str]]
+    ) -> Self:
         """
         Выполняет внутреннее объединение (inner join) текущего списка
         с другим по заданному ключу.
 
+        Каждой паре совпавших строк соответствует отдельная строка
+        результата. Ключ может быть составным (список полей).
+
         # Левый список (основной)
         left = DictList2([
             {"id": 1, "name": "Alice"},
@@ -300,6 +753,7 @@ class DictList2(list):
         # Правый список (дополняющий)
         right = [
             {"id": 1, "role": "Admin"},
+            {"id": 1, "role": "Owner"},
             {"id": 2, "role": "User"},
             {"id": 4, "role": "Guest"},
         ]
@@ -308,28 +762,29 @@ class DictList2(list):
         joined = left.join(right, key="id")
 
         {'id': 1, 'name': 'Alice', 'role': 'Admin'}
+        {'id': 1, 'name': 'Alice', 'role': 'Owner'}
         {'id': 2, 'name': 'Bob', 'role': 'User'}
 
-        :param dict_list: список словарей, с которым нужно объединить
-        :param key: ключ, по которому происходит объединение
+        # Составной ключ
+        joined = left.join(right, key=["tenant", "id"])
+
+        :param right: список словарей, с которым нужно объединить
+        :param key: ключ или список ключей, по которым происходит
+            объединение
         :return: список словарей, где ключ есть в обоих списках
         """
-        # Индекс правого списка по ключу
-        right_index = {item[key]: item for item in right}
-
-        # Объединяем только те элементы, у которых ключ есть в обоих списках
-        result = []
-        for item in self:
-            match = right_index.get(item.get(key))
-            if match:
-                result.append({**item, **match})
-        return DictList2(result)
+        return self._join(right, key, "inner")
 
-    def left_join(self, right: List[Dict[str, Any]], key: str) -> Self:
+    def left_join(
+        self, right: List[Dict[str, Any]], key: Union[str, List[str]]
+    ) -> Self:
         """
         Выполняет левое объединение (left join) текущего списка словарей
         с другим по указанному ключу.
 
+        Если правых совпадений несколько, левая строка повторяется для
+        каждого из них. Ключ может быть составным (список полей).
+
         # Пример левого списка (основа)
         left = DictList2([
             {"id": 1, "name": "Alice"},
@@ -352,29 +807,75 @@ class DictList2(list):
         {'id': 3, 'name': 'Charlie'}
 
         :param right: внешний список (тот, из которого дополняются поля)
-        :param key: имя ключа, по которому происходит объединение
+        :param key: имя ключа или список ключей, по которым происходит
+            объединение
         :return: новый список словарей с объединёнными значениями
         """
-        # Индекс правой таблицы по ключу
-        right_index = {item[key]: item for item in right}
+        return self._join(right, key, "left")
+
+    def _join(
+        self,
+        right: List[Dict[str, Any]],
+        key: Union[str, List[str]],
+        how: str,
+    ) -> Self:
+        index = right._index(key) if isinstance(right, DictList2) else None
+        if index is None or index.missing:
+            return DictList2(hash_join(self, right, key, how=how))
+
+        # Правый список уже проиндексирован по ключу соединения
+        def lookup(value: Any) -> List[Dict[str, Any]]:
+            value = (value,) if isinstance(key, str) else value
+            return [right[pos] for pos in index.buckets.get(value, ())]
+
+        return DictList2(probe_join(self, right, key, how, lookup=lookup))
+
+    def merge_join(
+        self,
+        right: List[Dict[str, Any]],
+        key: Union[str, List[str]],
+        how: str = "inner",
+    ) -> Self:
+        """
+        Соединение слиянием (sort-merge join) со списком, отсортированным
+        по тому же ключу.
+
+        Оба списка должны быть отсортированы по ключу по возрастанию
+        (например, результатом sort(by=key) или выгрузкой из БД с
+        ORDER BY). Индекс не строится: списки просматриваются синхронно,
+        в памяти хранится только серия правых строк с одинаковым ключом.
+        Если ключ на каком-либо входе убывает — ValueError.
+
+        left = DictList2([
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": "Bob"},
+        ])
+        right = [
+            {"id": 2, "role": "User"},
+            {"id": 3, "role": "Guest"},
+        ]
 
-        result = []
-        for left_item in self:
-            merged = dict(left_item)  # копируем левый элемент
-            right_item = right_index.get(left_item.get(key))
-            if right_item:
-                # добавляем недостающие поля из правого
-                for k, v in right_item.items():
-                    if k not in merged:
-                        merged[k] = v
-            result.append(merged)
+        left.merge_join(right, key="id", how="full")
 
-        return DictList2(result)
+        {'id': 1, 'name': 'Alice'}
+        {'id': 2, 'name': 'Bob', 'role': 'User'}
+        {'id': 3, 'role': 'Guest'}
+
+        :param right: отсортированный по ключу список словарей
+        :param key: ключ или список ключей соединения
+        :param how: "inner", "left", "right" или "full" — какие
+            несовпавшие строки попадают в результат
+        :return: список словарей в порядке возрастания ключа
+        """
+        return DictList2(merge_join(self, right, key, how=how))
 
     def group_by(
         self,
         group_columns: Union[str, List[str], None] = None,
         total_columns: Union[str, List[str], None] = None,
+        workers: Union[int, None] = None,
+        max_groups: Union[int, None] = None,
+        group_order: Union[str, None] = "sorted",
     ) -> Self:
         """
         Сгруппировать список словарей по указанным полям и просуммировать
@@ -402,8 +903,21 @@ class DictList2(list):
             Если None — без группировки.
         :param total_columns: поле или список полей для суммирования.
             Если None — только группировка.
+        :param workers: число процессов для группировки: процессы
+            (fork) читают строки сами, группы делятся между ними по
+            хэшу ключа, результат совпадает с однопроцессным. Без fork
+            (Windows) и при None — в текущем процессе.
+        :param max_groups: бюджет памяти в группах: при превышении группы
+            и строки раскладываются по хэшу ключа во временные файлы и
+            агрегируются по частям (в текущем процессе). None — в памяти
+        :param group_order: порядок групп, как `order` в distinct():
+            "sorted" — по полям группировки, "first_seen" — по первому
+            появлению, None — любой (без сортировки групп)
         :return: список словарей с результатами группировки и суммирования
         """
+        check_workers(workers)
+        check_max_groups(max_groups)
+        check_group_order(group_order)
         group_keys = (
             [group_columns]
             if isinstance(group_columns, str)
@@ -426,32 +940,58 @@ class DictList2(list):
                     total[field] += item.get(field, 0)
             return DictList2([total])
 
-        # Группировка по полям
-        result = []
-        unique_groups = DictList2(self).distinct(group_keys)
-
-        for group in unique_groups:
-            group_data = DictList2(self).filter(group)
-            group_total = {}
-
-            if sum_fields:
-                group_total = {field: 0 for field in sum_fields}
-                for item in group_data:
-                    for field in sum_fields:
-                        group_total[field] += item.get(field, 0)
+        if max_groups is not None:
+            return DictList2(
+                spill_group_by(
+                    self,
+                    group_keys,
+                    sum_fields,
+                    max_groups,
+                    order=group_order,
+                )
+            )
 
-            result.append({**group, **group_total})
+        if workers is not None and workers > 1:
+            return DictList2(
+                parallel_group_by(
+                    self, group_keys, sum_fields, workers, group_order
+                )
+            )
 
-        return DictList2(result)
+        # Группировка по полям за один проход
+        return DictList2(
+            hash_group_by(
+                self,
+                group_keys,
+                sum_fields,
+                self._partitions(group_keys),
+                group_order,
+            )
+        )
 
     def aggregate(
         self,
         group_columns: Union[str, List[str], None] = None,
-        aggregations: Dict[str, Union[str, List[str]]] = None,
-    ) -> List[Dict[str, Any]]:
+        aggregations: Dict[
+            Union[str, Tuple[str, ...]], Union[str, List[str]]
+        ] = None,
+        backend: str = "python",
+        workers: Union[int, None] = None,
+        max_groups: Union[int, None] = None,
+        group_order: Union[str, None] = "sorted",
+    ) -> Self:
         """
         Универсальная группировка с поддержкой агрегаций:
-        sum, count, avg, min, max.
+        sum, count, avg, min, max, count_distinct (точно),
+        approx_count_distinct (HyperLogLog, ошибка около 1.6 %),
+        approx_median и percentile_p95 (t-digest), first, last, stddev,
+        string_agg, weighted_avg, а также зарегистрированных через
+        register_aggregation().
+
+        Данные просматриваются один раз: для каждой группы хранятся
+        накопители, поэтому время растёт линейно от числа строк.
+        Приближённые накопители занимают ограниченную память на группу.
+        Значения None считаются нулём.
 
         data = DictList2([
             {"project": "A", "hours": 5},
@@ -475,9 +1015,35 @@ class DictList2(list):
         :param group_columns: Ключ или список ключей для группировки.
             Если None — все данные считаются одной группой.
         :param aggregations: Словарь вида {'hours': 'sum', 'id': 'count'}
-            или {'hours': ['sum', 'avg']}
+            или {'hours': ['sum', 'avg']}; ключ-кортеж полей передаёт
+            накопителю кортеж значений: {('price', 'qty'): 'weighted_avg'}
+            даёт поле 'price_qty_weighted_avg'
+        :param backend: "python" — накопители на чистом Python,
+            "numpy" — векторные ядра NumPy; если NumPy не установлен,
+            значения не числовые или нужен квантиль, используется "python"
+        :param workers: число процессов для backend="python":
+            процессы (fork) читают строки сами. При группировке группы
+            делятся между процессами по хэшу ключа, и результат
+            совпадает с однопроцессным точно. Без группировки строки
+            делятся на отрезки, частичные агрегаты объединяются (avg —
+            как сумма и количество), и для вещественных sum, avg, stddev и
+            weighted_avg могут отличаться в последнем знаке: десять
+            значений 0.1 дают v_sum 0.9999999999999999 в одном процессе
+            и 1.0 при workers=2. Целые значения совпадают точно.
+            Без fork (Windows) и при None — в текущем процессе.
+        :param max_groups: бюджет памяти в группах для group_columns:
+            при превышении группы и строки раскладываются по хэшу ключа
+            во временные файлы и агрегируются по частям (в текущем
+            процессе). None — все группы в памяти
+        :param group_order: порядок групп, как в group_by()
         :return: Список сгруппированных словарей с результатами агрегаций
         """
+        if backend not in ("python", "numpy"):
+            raise ValueError(f"Unknown aggregation backend: {backend}")
+        check_workers(workers)
+        check_max_groups(max_groups)
+        check_group_order(group_order)
+
         group_keys = (
             [group_columns]
             if isinstance(group_columns, str)
@@ -485,74 +1051,123 @@ class DictList2(list):
         )
         aggregations = aggregations or {}
 
-        # Универсальные агрегаторы
-        def apply_aggregation(items: List[dict], field: str, agg: str) -> Any:
-            values = [item.get(field, 0) for item in items]
-
-            def zero(value):
-                return 0 if value is None else value
-
-            if agg == "sum":
-                # return sum(values)
-                return reduce(lambda acc, x: acc + zero(x), values)
-            elif agg == "count":
-                return len(items)
-            elif agg == "avg":
-                return (
-                    reduce(lambda acc, x: acc + zero(x), values) / len(values)
-                    if values
-                    else 0
-                )
-            elif agg == "min":
-                return (
-                    reduce(
-                        lambda a, b: zero(a) if zero(a) < zero(b) else zero(b),
-                        values,
-                    )
-                    if values
-                    else 0
+        if backend == "numpy":
+            result = numpy_aggregate(
+                self, group_keys, aggregations, group_order
+            )
+            if result is not None:
+                return DictList2(result)
+
+        if max_groups is not None and group_keys:
+            return DictList2(
+                spill_aggregate(
+                    self,
+                    group_keys,
+                    aggregations,
+                    max_groups,
+                    order=group_order,
                 )
-            elif agg == "max":
-                return (
-                    reduce(
-                        lambda a, b: zero(a) if zero(a) > zero(b) else zero(b),
-                        values,
-                    )
-                    if values
-                    else 0
+            )
+
+        if workers is not None and workers > 1:
+            return DictList2(
+                parallel_aggregate(
+                    self, group_keys, aggregations, workers, group_order
                 )
-            else:
-                raise ValueError(f"Unknown aggregation type: {agg}")
-
-        if group_keys is None:
-            # Всё как одна группа
-            group_data = list(self)
-            result = {}
-            for field, ops in aggregations.items():
-                ops_list = [ops] if isinstance(ops, str) else ops
-                for op in ops_list:
-                    key = (
-                        f"{field}_{op}" if op != "count" else f"{field}_count"
-                    )
-                    result[key] = apply_aggregation(group_data, field, op)
-            return DictList2([result])
-
-        # Группировка по ключам
-        unique_groups = DictList2(self).distinct(group_keys)
-        results = []
-
-        for group_filter in unique_groups:
-            group_data = DictList2(self).filter(group_filter)
-            aggregated = {}
-
-            for field, ops in aggregations.items():
-                ops_list = [ops] if isinstance(ops, str) else ops
-                for op in ops_list:
-                    key = (
-                        f"{field}_{op}" if op != "count" else f"{field}_count"
-                    )
-                    aggregated[key] = apply_aggregation(group_data, field, op)
-
-            results.append({**group_filter, **aggregated})
-
-        return DictList2(results)
+            )
+
+        # Один потоковый проход: для каждой группы свои накопители
+        return DictList2(
+            hash_aggregate(
+                self,
+                group_keys,
+                aggregations,
+                self._partitions(group_keys),
+                group_order,
+            )
+        )
+
+    def aggregate_view(
+        self,
+        group_columns: Union[str, List[str], None] = None,
+        aggregations: Dict[
+            Union[str, Tuple[str, ...]], Union[str, List[str]]
+        ] = None,
+        group_order: Union[str, None] = "sorted",
+    ) -> AggregateView:
+        """
+        Результат aggregate(), который обновляется вместе со списком.
+
+        Накопители групп считаются один раз при создании. Строки,
+        добавленные в конец (append, extend, +=), учитываются сразу;
+        удалённые (remove, pop, del, замена) вычитаются, если все
+        операции обратимы (sum, count, avg, weighted_avg и накопители с
+        методом remove()). После остальных изменений (min, max и прочие
+        необратимые операции, reverse(), вставка в середину, clear())
+        группы пересчитываются при следующем чтении. Чтение стоит
+        O(групп) вместо O(строк). Для group_order="first_seen" и None,
+        а также если среди значений есть float, любое удаление или
+        перестановка ведёт к пересчёту: порядок групп и результат всегда
+        совпадают с aggregate().
+
+        view = data.aggregate_view("project", {"hours": "sum"})
+        data.append({"project": "A", "hours": 2})
+        view.collect()  # как data.aggregate("project", {"hours": "sum"})
+
+        Представление не мешает сборке мусора: список хранит на него
+        слабую ссылку. close() отключает его явно. Копии списка
+        (copy, pickle, срезы) приходят без представлений.
+
+        :param group_columns: поле или поля группировки, как в aggregate()
+        :param aggregations: операции, как в aggregate()
+        :param group_order: порядок групп, как в group_by()
+        :return: AggregateView; collect() или итерация — текущий результат
+        """
+        check_group_order(group_order)
+        group_keys = (
+            [group_columns]
+            if isinstance(group_columns, str)
+            else group_columns
+        )
+        view = AggregateView(self, group_keys, aggregations or {}, group_order)
+        if self._views is None:
+            self._views = ViewSet()
+        self._views.add(view)
+        return view
+
+    def query(self) -> Query:
+        """
+        Ленивый конвейер запроса к списку.
+
+        Шаги только записываются в план; данные читаются при collect()
+        или итерации. Соседние фильтры и проекции выполняются за один
+        проход, фильтры опускаются ниже сортировки и соединения (по
+        полям ключа), промежуточные DictList2 не создаются.
+
+        result = (
+            data.query()
+            .where({"role": "User"})
+            .join(projects, key="id")
+            .group("project", {"hours": "sum"})
+            .collect()
+        )
+
+        :return: объект Query
+        """
+        return Query(self)
+
+    def to_columns(self) -> ColumnarDictList:
+        """
+        Преобразует список в колоночное представление.
+
+        Каждое поле хранится отдельной колонкой (array для однотипных
+        чисел, иначе list), что экономит память на больших выборках.
+        ColumnarDictList поддерживает filter(), sort(), aggregate(),
+        join() и left_join(); словари создаются только в to_rows().
+
+        columns = data.to_columns()
+        columns.filter({"project": "A"}).sort("hours").to_rows()
+
+        :return: объект ColumnarDictList
+        """
+        return ColumnarDictList.from_rows(self)
@@ -0,0 +1,711 @@
+"""
+Однопроходная хэш-агрегация для DictList2.
+
+Вместо схемы «distinct() + filter() на каждую группу», которая стоит
+O(групп × строк), строки один раз просматриваются потоком: для каждой
+группы в словаре хранится набор накопителей, которые обновляются
+по мере чтения строк.
+
+Накопитель — класс с протоколом Accumulator: конструктор без
+аргументов (init), update(value), merge(other) и finalize(). Операции
+aggregate() ищутся по имени в реестре ACCUMULATORS; свои операции
+добавляются через register_aggregation().
+
+Накопители частичных результатов объединяются методом merge(): так
+работают параллельная агрегация (_parallel.py) и агрегация
+с выгрузкой на диск (_spill.py).
+Среднее хранится как сумма и количество, поэтому объединяется точно.
+Приближённые накопители (HyperLogLog, t-digest) — в _sketch.py.
+
+Поле агрегации — имя поля (отсутствующее поле даёт 0) или кортеж имён:
+тогда в update() передаётся кортеж значений (отсутствующее — None),
+например (значение, вес) для weighted_avg.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from ._fingerprint import freeze, row_key
+from ._keys import tuple_getter
+from ._sketch import (
+    HyperLogLogAccumulator,
+    MedianAccumulator,
+    P95Accumulator,
+)
+
+
+def zero(value: Any) -> Any:
+    """None считается нулём (семантика агрегаций DictList2)."""
+    return 0 if value is None else value
+
+
+Field = Union[str, Tuple[str, ...]]
+
+
+class Accumulator(ABC):
+    """
+    Протокол накопителя агрегации.
+
+    Конструктор вызывается без аргументов и задаёт пустое состояние.
+    update() учитывает значение одной строки, merge() — состояние
+    другого накопителя того же класса (строки other идут после строк
+    self), finalize() возвращает результат. Накопители передаются между
+    процессами через pickle, поэтому класс должен быть доступен по имени
+    модуля. Наследовать Accumulator необязательно — достаточно тех же
+    методов (так устроены накопители _sketch.py). Подкласс без
+    update(), merge() или finalize() не создаётся (TypeError), поэтому
+    ошибка видна сразу, а не при параллельной агрегации или выгрузке.
+
+    Необязательный метод remove(value) отменяет update(value); если он
+    есть у всех операций, aggregate_view() вычитает удалённые строки
+    без пересчёта.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def update(self, value: Any) -> None:
+        """Учитывает значение одной строки."""
+
+    @abstractmethod
+    def merge(self, other: "Accumulator") -> None:
+        """Добавляет состояние накопителя other."""
+
+    @abstractmethod
+    def finalize(self) -> Any:
+        """Результат агрегации."""
+
+
+class SumAccumulator(Accumulator):
+    """Накопитель суммы."""
+
+    __slots__ = ("value", "empty")
+
+    def __init__(self):
+        self.value = 0
+        self.empty = True
+
+    def update(self, value: Any) -> None:
+        if self.empty:
+            self.value = zero(value)
+            self.empty = False
+        else:
+            self.value = self.value + zero(value)
+
+    def remove(self, value: Any) -> None:
+        self.value = self.value - zero(value)
+
+    def merge(self, other: "SumAccumulator") -> None:
+        if other.empty:
+            return
+        if self.empty:
+            self.value = other.value
+            self.empty = False
+        else:
+            self.value = self.value + other.value
+
+    def finalize(self) -> Any:
+        return self.value
+
+
+class CountAccumulator(Accumulator):
+    """Накопитель количества строк в группе."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def update(self, value: Any) -> None:
+        self.value += 1
+
+    def remove(self, value: Any) -> None:
+        self.value -= 1
+
+    def merge(self, other: "CountAccumulator") -> None:
+        self.value += other.value
+
+    def finalize(self) -> Any:
+        return self.value
+
+
+class AvgAccumulator(Accumulator):
+    """Накопитель среднего: хранит сумму и количество."""
+
+    __slots__ = ("total", "count")
+
+    def __init__(self):
+        self.total = SumAccumulator()
+        self.count = 0
+
+    def update(self, value: Any) -> None:
+        self.total.update(value)
+        self.count += 1
+
+    def remove(self, value: Any) -> None:
+        self.total.remove(value)
+        self.count -= 1
+
+    def merge(self, other: "AvgAccumulator") -> None:
+        self.total.merge(other.total)
+        self.count += other.count
+
+    def finalize(self) -> Any:
+        return self.total.value / self.count if self.count else 0
+
+
+class MinAccumulator(Accumulator):
+    """Накопитель минимума."""
+
+    __slots__ = ("value", "empty")
+
+    def __init__(self):
+        self.value = 0
+        self.empty = True
+
+    def update(self, value: Any) -> None:
+        value = zero(value)
+        if self.empty or value < self.value:
+            self.value = value
+            self.empty = False
+
+    def merge(self, other: "MinAccumulator") -> None:
+        if not other.empty and (self.empty or other.value < self.value):
+            self.value = other.value
+            self.empty = False
+
+    def finalize(self) -> Any:
+        return self.value
+
+
+class MaxAccumulator(Accumulator):
+    """Накопитель максимума."""
+
+    __slots__ = ("value", "empty")
+
+    def __init__(self):
+        self.value = 0
+        self.empty = True
+
+    def update(self, value: Any) -> None:
+        value = zero(value)
+        if self.empty or value > self.value:
+            self.value = value
+            self.empty = False
+
+    def merge(self, other: "MaxAccumulator") -> None:
+        if not other.empty and (self.empty or other.value > self.value):
+            self.value = other.value
+            self.empty = False
+
+    def finalize(self) -> Any:
+        return self.value
+
+
+class CountDistinctAccumulator(Accumulator):
+    """Точное число различных значений (хранит сами значения)."""
+
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values = set()
+
+    def update(self, value: Any) -> None:
+        value = zero(value)
+        try:
+            self.values.add(value)
+        except TypeError:
+            self.values.add(freeze(value))
+
+    def merge(self, other: "CountDistinctAccumulator") -> None:
+        self.values |= other.values
+
+    def finalize(self) -> Any:
+        return len(self.values)
+
+
+class TotalAccumulator(Accumulator):
+    """Нарастающий итог, как в group_by(): 0 + значения."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def update(self, value: Any) -> None:
+        self.value += value
+
+    def remove(self, value: Any) -> None:
+        self.value -= value
+
+    def merge(self, other: "TotalAccumulator") -> None:
+        self.value += other.value
+
+    def finalize(self) -> Any:
+        return self.value
+
+
+class FirstAccumulator(Accumulator):
+    """Значение первой строки группы."""
+
+    __slots__ = ("value", "empty")
+
+    def __init__(self):
+        self.value = None
+        self.empty = True
+
+    def update(self, value: Any) -> None:
+        if self.empty:
+            self.value = value
+            self.empty = False
+
+    def merge(self, other: "FirstAccumulator") -> None:
+        if self.empty and not other.empty:
+            self.value = other.value
+            self.empty = False
+
+    def finalize(self) -> Any:
+        return self.value
+
+
+class LastAccumulator(Accumulator):
+    """Значение последней строки группы."""
+
+    __slots__ = ("value", "empty")
+
+    def __init__(self):
+        self.value = None
+        self.empty = True
+
+    def update(self, value: Any) -> None:
+        self.value = value
+        self.empty = False
+
+    def merge(self, other: "LastAccumulator") -> None:
+        if not other.empty:
+            self.value = other.value
+            self.empty = False
+
+    def finalize(self) -> Any:
+        return self.value
+
+
+class StddevAccumulator(Accumulator):
+    """
+    Выборочное стандартное отклонение (алгоритм Уэлфорда, объединение
+    частей — формулой Чана).
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value: Any) -> None:
+        value = zero(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "StddevAccumulator") -> None:
+        if not other.count:
+            return
+        if not self.count:
+            # Пустой накопитель принимает состояние целиком: пересчёт
+            # среднего по формуле Чана теряет последний знак
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    def finalize(self) -> Any:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class StringAggAccumulator(Accumulator):
+    """
+    Значения группы строками через ", ". None пропускается; отсутствующее
+    поле, как и в других агрегациях, читается как 0.
+    """
+
+    __slots__ = ("parts",)
+
+    separator = ", "
+
+    def __init__(self):
+        self.parts = []
+
+    def update(self, value: Any) -> None:
+        if value is not None:
+            self.parts.append(str(value))
+
+    def merge(self, other: "StringAggAccumulator") -> None:
+        self.parts.extend(other.parts)
+
+    def finalize(self) -> Any:
+        return self.separator.join(self.parts)
+
+
+class WeightedAvgAccumulator(Accumulator):
+    """
+    Взвешенное среднее по кортежу полей (значение, вес), например
+    {("price", "qty"): "weighted_avg"}. None считается нулём.
+    """
+
+    __slots__ = ("total", "weight")
+
+    def __init__(self):
+        self.total = 0
+        self.weight = 0
+
+    def update(self, value: Any) -> None:
+        value, weight = value
+        weight = zero(weight)
+        self.total += zero(value) * weight
+        self.weight += weight
+
+    def remove(self, value: Any) -> None:
+        value, weight = value
+        weight = zero(weight)
+        self.total -= zero(value) * weight
+        self.weight -= weight
+
+    def merge(self, other: "WeightedAvgAccumulator") -> None:
+        self.total += other.total
+        self.weight += other.weight
+
+    def finalize(self) -> Any:
+        return self.total / self.weight if self.weight else 0
+
+
+ACCUMULATORS = {
+    "sum": SumAccumulator,
+    "count": CountAccumulator,
+    "avg": AvgAccumulator,
+    "min": MinAccumulator,
+    "max": MaxAccumulator,
+    "count_distinct": CountDistinctAccumulator,
+    "approx_count_distinct": HyperLogLogAccumulator,
+    "approx_median": MedianAccumulator,
+    "percentile_p95": P95Accumulator,
+    "first": FirstAccumulator,
+    "last": LastAccumulator,
+    "stddev": StddevAccumulator,
+    "string_agg": StringAggAccumulator,
+    "weighted_avg": WeightedAvgAccumulator,
+}
+
+# Порядок групп в результате: по значениям ключа, по первому появлению,
+# любой (самый дешёвый)
+GROUP_ORDERS = ("sorted", "first_seen", None)
+
+
+def register_aggregation(
+    name: str, factory: Callable[[], Accumulator], replace: bool = False
+) -> None:
+    """
+    Регистрирует операцию агрегации для aggregate(), query(), DictStream.
+
+    :param name: имя операции; в результате поле называется
+        f"{поле}_{name}".
+    :param factory: класс накопителя (протокол Accumulator) или функция
+        без аргументов, возвращающая новый накопитель.
+    :param replace: разрешить замену уже зарегистрированной операции.
+    """
+    if not isinstance(name, str) or not name:
+        raise ValueError(
+            f"Aggregation name must be a non-empty string: {name!r}"
+        )
+    if not callable(factory):
+        raise TypeError(f"Aggregation factory must be callable: {factory!r}")
+    if name in ACCUMULATORS and not replace:
+        raise ValueError(f"Aggregation already registered: {name}")
+    ACCUMULATORS[name] = factory
+
+
+def field_name(field: Field) -> str:
+    """Префикс имени результата: "a" или "a_b" для кортежа полей."""
+    return field if isinstance(field, str) else "_".join(field)
+
+
+def value_reader(field: Field) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Чтение значения поля агрегации из строки: отсутствующее поле — 0,
+    для кортежа полей — кортеж значений (отсутствующее — None).
+    """
+    if isinstance(field, tuple):
+        return tuple_getter(field)
+    return lambda item: item.get(field, 0)
+
+
+def compile_aggregations(
+    aggregations: Dict[Field, Union[str, List[str]]],
+) -> Tuple[List[str], List[type], List[Tuple[Field, List[int]]]]:
+    """
+    Разворачивает описание агрегаций в плоский план.
+
+    :return: (имена выходных полей, классы накопителей,
+        [(поле, индексы накопителей этого поля)])
+    """
+    names = []
+    factories = []
+    slots = []
+    for field, ops in aggregations.items():
+        ops_list = [ops] if isinstance(ops, str) else ops
+        indexes = []
+        for op in ops_list:
+            factory = ACCUMULATORS.get(op)
+            if factory is None:
+                raise ValueError(f"Unknown aggregation type: {op}")
+            indexes.append(len(factories))
+            names.append(f"{field_name(field)}_{op}")
+            factories.append(factory)
+        slots.append((field, indexes))
+    return names, factories, slots
+
+
+def split_slots(
+    slots: List[Tuple[Field, List[int]]],
+) -> Tuple[List[Tuple[str, List[int]]], List[Tuple[Callable, List[int]]]]:
+    """
+    Делит план на простые поля (читаются item.get(field, 0) прямо в
+    цикле) и кортежи полей (читаются функцией value_reader()).
+    """
+    plain = [(f, indexes) for f, indexes in slots if isinstance(f, str)]
+    combined = [
+        (value_reader(f), indexes)
+        for f, indexes in slots
+        if not isinstance(f, str)
+    ]
+    return plain, combined
+
+
+def group_sort_key(key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Порядок групп как у distinct(): None сортируется как ""."""
+    return tuple(v if v is not None else "" for v in key)
+
+
+def check_group_order(order: Union[str, None]) -> None:
+    if order not in GROUP_ORDERS:
+        raise ValueError(f"Unknown group order: {order!r}")
+
+
+def ordered_groups(
+    groups: Dict[Tuple[Any, ...], Any], order: Union[str, None] = "sorted"
+) -> Iterable[Tuple[Any, ...]]:
+    """
+    Ключи групп в порядке вывода.
+
+    :param groups: словарь групп, заполненный в порядке первого появления.
+    :param order: "sorted" — по значениям ключа (None как ""),
+        "first_seen" и None — порядок словаря, без сортировки.
+    """
+    if order == "sorted":
+        return sorted(groups, key=group_sort_key)
+    return groups
+
+
+def distinct_keys(
+    rows: Iterable[Dict[str, Any]],
+    keys: List[str],
+    order: Union[str, None] = "sorted",
+) -> List[Dict[str, Any]]:
+    """
+    Различные значения полей keys, как distinct(by).
+
+    Значения-списки и словари сравниваются по замороженному
+    представлению (freeze()), а в результат попадают как есть.
+    """
+    get_key = tuple_getter(keys)
+    seen = {}
+    for item in rows:
+        key = get_key(item)
+        try:
+            seen.setdefault(key, key)
+        except TypeError:
+            # Список или словарь в значении поля
+            seen.setdefault(freeze(key), key)
+
+    # Словарь хранит ключи в порядке первого появления; сортировка —
+    # по тем же полям (None — как ""), равные — в порядке появления
+    found = seen.values()
+    if order == "sorted":
+        found = sorted(found, key=group_sort_key)
+    return [dict(zip(keys, key)) for key in found]
+
+
+def hash_aggregate(
+    rows: Iterable[Dict[str, Any]],
+    group_keys: Union[List[str], None],
+    aggregations: Dict[Field, Union[str, List[str]]],
+    partitions: Union[Dict[Tuple[Any, ...], Iterable[Dict]], None] = None,
+    order: Union[str, None] = "sorted",
+) -> List[Dict[str, Any]]:
+    """
+    Агрегирует строки за один проход.
+
+    :param rows: итерируемый источник словарей (читается один раз).
+    :param group_keys: список полей группировки; None — одна группа
+        на всю выборку (строка результата есть даже для пустых данных).
+    :param aggregations: описание агрегаций, как в DictList2.aggregate().
+    :param partitions: готовое разбиение ключ группы -> строки
+        (например, из индекса); тогда rows не читается.
+    :param order: порядок групп, см. ordered_groups().
+    :return: список словарей, группы упорядочены как в distinct().
+    """
+    names, factories, slots = compile_aggregations(aggregations)
+    plain, combined = split_slots(slots)
+    keys = group_keys or []
+    get_key = tuple_getter(keys)
+    groups = {}
+
+    def update_combined(state: list, item: Dict[str, Any]) -> None:
+        for read, indexes in combined:
+            value = read(item)
+            for index in indexes:
+                state[index].update(value)
+
+    def update(state: list, item: Dict[str, Any]) -> None:
+        for field, indexes in plain:
+            value = item.get(field, 0)
+            for index in indexes:
+                state[index].update(value)
+        update_combined(state, item)
+
+    if partitions is not None:
+        for key, part in partitions.items():
+            state = groups[key] = [factory() for factory in factories]
+            for item in part:
+                update(state, item)
+        rows = ()
+
+    if group_keys is None:
+        groups[()] = [factory() for factory in factories]
+
+    for item in rows:
+        key = get_key(item)
+        state = groups.get(key)
+        if state is None:
+            state = groups[key] = [factory() for factory in factories]
+        # Основной цикл без вызова update(): простые поля — inline
+        for field, indexes in plain:
+            value = item.get(field, 0)
+            for index in indexes:
+                state[index].update(value)
+        if combined:
+            update_combined(state, item)
+
+    result = []
+    for key in ordered_groups(groups, order):
+        row = dict(zip(keys, key))
+        for name, acc in zip(names, groups[key]):
+            row[name] = acc.finalize()
+        result.append(row)
+    return result
+
+
+def hash_group_by(
+    rows: Iterable[Dict[str, Any]],
+    group_keys: List[str],
+    sum_fields: Union[List[str], None],
+    partitions: Union[Dict[Tuple[Any, ...], Iterable[Dict]], None] = None,
+    order: Union[str, None] = "sorted",
+) -> List[Dict[str, Any]]:
+    """
+    Группирует строки за один проход, суммируя поля нарастающим итогом.
+
+    :param rows: итерируемый источник словарей (читается один раз).
+    :param group_keys: непустой список полей группировки.
+    :param sum_fields: поля для суммирования (отсутствующее поле — 0).
+    :param partitions: готовое разбиение ключ группы -> строки
+        (например, из индекса); тогда rows не читается.
+    :param order: порядок групп, см. ordered_groups().
+    :return: список словарей, группы упорядочены как в distinct().
+    """
+    fields = list(enumerate(sum_fields or []))
+    width = len(fields)
+    get_key = tuple_getter(group_keys)
+    groups = {}
+
+    if partitions is not None:
+        for key, part in partitions.items():
+            totals = groups[key] = [0] * width
+            for item in part:
+                for index, field in fields:
+                    totals[index] += item.get(field, 0)
+        rows = ()
+
+    for item in rows:
+        key = get_key(item)
+        totals = groups.get(key)
+        if totals is None:
+            totals = groups[key] = [0] * width
+        for index, field in fields:
+            totals[index] += item.get(field, 0)
+
+    result = []
+    for key in ordered_groups(groups, order):
+        row = dict(zip(group_keys, key))
+        for index, field in fields:
+            row[field] = groups[key][index]
+        result.append(row)
+    return result
+
+
+def partition(
+    rows: Iterable[Dict[str, Any]],
+    by: Union[List[str], None],
+    partitions: Union[Dict[Tuple[Any, ...], List[Dict]], None] = None,
+    order: Union[str, None] = "sorted",
+) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Раскладывает строки по группам за один проход.
+
+    :param rows: итерируемый источник словарей (читается один раз).
+    :param by: список полей группировки; None — группой считается
+        вся строка целиком (как distinct() без параметров).
+    :param partitions: готовое разбиение ключ группы -> строки
+        (например, из индекса); тогда rows не читается.
+    :param order: порядок групп, см. ordered_groups(); для by=None —
+        всегда порядок первого появления.
+    :return: пары (значения группы, строки группы) в порядке distinct().
+    """
+    if partitions is not None:
+        return [
+            (dict(zip(by, key)), partitions[key])
+            for key in ordered_groups(partitions, order)
+        ]
+
+    buckets = {}
+
+    if by is None:
+        for item in rows:
+            key = row_key(item)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = (item, [item])
+            else:
+                bucket[1].append(item)
+        return list(buckets.values())
+
+    get_key = tuple_getter(by)
+    for item in rows:
+        key = get_key(item)
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = bucket = []
+        bucket.append(item)
+
+    return [
+        (dict(zip(by, key)), buckets[key])
+        for key in ordered_groups(buckets, order)
+    ]
@@ -0,0 +1,313 @@
+"""
+Колоночное представление списка словарей.
+
+Каждое поле хранится отдельной колонкой: array('q') для целых,
+array('d') для вещественных и обычным списком для остальных значений.
+Строки-словари создаются только по запросу (to_rows(), итерация).
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Union
+
+from ._aggregate import compile_aggregations, group_sort_key
+from ._predicate import Where, is_logical, is_operator, value_test
+
+Row = Dict[str, Any]
+
+
+class _Missing:
+    """Маркер отсутствующего в строке поля."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+
+def _compact(values: List[Any]) -> Union[array, List[Any]]:
+    """Упаковывает однотипную числовую колонку в array."""
+    if values and all(type(v) is int for v in values):
+        if INT64_MIN <= min(values) and max(values) <= INT64_MAX:
+            return array("q", values)
+    if values and all(type(v) is float for v in values):
+        return array("d", values)
+    return values
+
+
+def _take(column: Sequence[Any], positions: List[int]) -> Sequence[Any]:
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in positions])
+    return [column[i] for i in positions]
+
+
+def _fields(value: Union[str, List[str]]) -> List[str]:
+    return [value] if isinstance(value, str) else list(value)
+
+
+class ColumnarDictList:
+    """
+    Колоночный аналог DictList2.
+
+    Поддерживает filter(), sort(), aggregate(), join() и left_join()
+    с той же семантикой, что и DictList2, но работает с колонками:
+    фильтр читает только колонки условия, сортировка переставляет
+    номера строк, агрегаты проходят по колонке значений подряд.
+
+    data = DictList2([...]).to_columns()
+    data.filter({"project": "A"}).aggregate(
+        "user", {"hours": "sum"}).to_rows()
+    """
+
+    def __init__(self, columns: Dict[str, Sequence[Any]], length: int):
+        self._columns = columns
+        self._length = length
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Row]) -> "ColumnarDictList":
+        """Строит колонки из итерируемого источника словарей."""
+        columns = {}
+        length = 0
+        for row in rows:
+            for field in row:
+                if field not in columns:
+                    columns[field] = [MISSING] * length
+            for field, column in columns.items():
+                column.append(row.get(field, MISSING))
+            length += 1
+        return cls(
+            {field: _compact(col) for field, col in columns.items()}, length
+        )
+
+    @property
+    def fields(self) -> List[str]:
+        """Имена колонок в порядке появления."""
+        return list(self._columns)
+
+    def column(self, field: str) -> Sequence[Any]:
+        """Колонка значений поля (отсутствующие значения — MISSING)."""
+        return self._columns[field]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Row]:
+        names = list(self._columns)
+        for values in zip(*self._columns.values()):
+            yield {f: v for f, v in zip(names, values) if v is not MISSING}
+
+    def __repr__(self) -> str:
+        return f"ColumnarDictList(fields={self.fields}, rows={len(self)})"
+
+    def to_rows(self):
+        """Преобразует в DictList2 из словарей."""
+        from . import DictList2
+
+        if not self._columns:
+            return DictList2([{} for _ in range(self._length)])
+        return DictList2(self)
+
+    def _values(self, field: str) -> Sequence[Any]:
+        """Колонка как для item.get(field): отсутствующие — None."""
+        column = self._columns.get(field)
+        if column is None:
+            return [None] * self._length
+        if isinstance(column, array):
+            return column
+        return [None if v is MISSING else v for v in column]
+
+    def take(self, positions: List[int]) -> "ColumnarDictList":
+        """Новый список из строк с указанными номерами."""
+        return ColumnarDictList(
+            {f: _take(col, positions) for f, col in self._columns.items()},
+            len(positions),
+        )
+
+    def _select(self, where: Where, positions: List[int]) -> List[int]:
+        """Номера из positions, строки которых удовлетворяют where."""
+        items = where.items() if isinstance(where, dict) else where
+        for field, expected in items:
+            if is_logical(field, expected):
+                if field == "not":
+                    excluded = set(self._select(expected, positions))
+                    positions = [i for i in positions if i not in excluded]
+                elif field == "and":
+                    for nested in expected:
+                        positions = self._select(nested, positions)
+                else:
+                    # Ветви «или» проверяют только ещё не подошедшие строки
+                    matched = set()
+                    for nested in expected:
+                        rest = [i for i in positions if i not in matched]
+                        matched.update(self._select(nested, rest))
+                    positions = [i for i in positions if i in matched]
+                continue
+            column = self._values(field)
+            if is_operator(expected):
+                test = value_test(expected)
+                positions = [i for i in positions if test(column[i])]
+            else:
+                positions = [i for i in positions if column[i] == expected]
+        return positions
+
+    def filter(
+        self, where: Where, order: Union[str, List[str], None] = None
+    ) -> "ColumnarDictList":
+        """
+        Фильтр по условиям на поля, как DictList2.filter(), в том числе
+        с логическими операциями "and", "or" и "not".
+        """
+        result = self.take(self._select(where, list(range(self._length))))
+        if order:
+            return result.sort(by=order)
+        return result
+
+    def sort(
+        self, by: Union[str, List[str], None] = None, reverse: bool = False
+    ) -> "ColumnarDictList":
+        """Сортировка по одному или нескольким полям, как DictList2.sort()."""
+        if by is None or not self._length:
+            # В пустом списке нет колонок, и проверять поля не по чему
+            return self
+        columns = []
+        for field in _fields(by):
+            column = self._columns.get(field)
+            if column is None or (
+                not isinstance(column, array) and MISSING in column
+            ):
+                raise KeyError(field)
+            columns.append(column)
+
+        if len(columns) == 1:
+            key = columns[0].__getitem__
+        else:
+            key = list(zip(*columns)).__getitem__
+        positions = sorted(range(self._length), key=key, reverse=reverse)
+        return self.take(positions)
+
+    def aggregate(
+        self,
+        group_columns: Union[str, List[str], None] = None,
+        aggregations: Dict[str, Union[str, List[str]]] = None,
+    ) -> "ColumnarDictList":
+        """
+        Группировка с агрегатами, как DictList2.aggregate() (в том числе
+        зарегистрированными). Каждая колонка значений читается подряд.
+        """
+        names, factories, slots = compile_aggregations(aggregations or {})
+        keys = [] if group_columns is None else _fields(group_columns)
+
+        # Номер группы для каждой строки
+        codes = []
+        groups = {}
+        if group_columns is None:
+            groups[()] = 0
+            codes = [0] * self._length
+        else:
+            key_columns = [self._values(k) for k in keys]
+            for key in zip(*key_columns) if keys else [()] * self._length:
+                code = groups.get(key)
+                if code is None:
+                    code = groups[key] = len(groups)
+                codes.append(code)
+
+        states = [[factory() for factory in factories] for _ in groups]
+        for field, indexes in slots:
+            if isinstance(field, tuple):
+                # Кортеж полей: кортежи значений, отсутствующее — None
+                column = list(zip(*[self._values(f) for f in field]))
+            else:
+                column = self._columns.get(field)
+                if column is None:
+                    column = [0] * self._length
+                elif not isinstance(column, array):
+                    column = [0 if v is MISSING else v for v in column]
+            for index in indexes:
+                for code, value in zip(codes, column):
+                    states[code][index].update(value)
+
+        rows = []
+        for key in sorted(groups, key=group_sort_key):
+            row = dict(zip(keys, key))
+            for name, acc in zip(names, states[groups[key]]):
+                row[name] = acc.finalize()
+            rows.append(row)
+        return ColumnarDictList.from_rows(rows)
+
+    def _join(
+        self, right: Iterable[Row], key: Union[str, List[str]], how: str
+    ) -> "ColumnarDictList":
+        if not isinstance(right, ColumnarDictList):
+            right = ColumnarDictList.from_rows(right)
+        fields = _fields(key)
+
+        # Индекс правой стороны: ключ -> номера строк
+        index = {}
+        if len(right):
+            right_keys = []
+            for field in fields:
+                column = right._columns.get(field)
+                if column is None or (
+                    not isinstance(column, array) and MISSING in column
+                ):
+                    raise KeyError(field)
+                right_keys.append(column)
+            for pos, value in enumerate(zip(*right_keys)):
+                index.setdefault(value, []).append(pos)
+
+        left_positions = []
+        right_positions = []
+        left_keys = [self._values(field) for field in fields]
+        for pos, value in enumerate(zip(*left_keys)):
+            matches = index.get(value)
+            if matches:
+                for match in matches:
+                    left_positions.append(pos)
+                    right_positions.append(match)
+            elif how == "left":
+                left_positions.append(pos)
+                right_positions.append(None)
+
+        columns = {
+            f: _take(col, left_positions) for f, col in self._columns.items()
+        }
+        for field, column in right._columns.items():
+            values = [
+                MISSING if pos is None else column[pos]
+                for pos in right_positions
+            ]
+            current = columns.get(field)
+            if current is None:
+                columns[field] = _compact(values)
+                continue
+            if how == "inner":
+                # Поля правой строки перекрывают левые
+                merged = [
+                    old if new is MISSING else new
+                    for old, new in zip(current, values)
+                ]
+            else:
+                # Из правой строки — только отсутствующие слева поля
+                merged = [
+                    new if old is MISSING else old
+                    for old, new in zip(current, values)
+                ]
+            columns[field] = _compact(merged)
+        return ColumnarDictList(columns, len(left_positions))
+
+    def join(
+        self, right: Iterable[Row], key: Union[str, List[str]]
+    ) -> "ColumnarDictList":
+        """Внутреннее соединение, как DictList2.join()."""
+        return self._join(right, key, "inner")
+
+    def left_join(
+        self, right: Iterable[Row], key: Union[str, List[str]]
+    ) -> "ColumnarDictList":
+        """Левое соединение, как DictList2.left_join()."""
+        return self._join(right, key, "left")
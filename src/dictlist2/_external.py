@@ -0,0 +1,94 @@
+"""
+Внешняя сортировка слиянием для данных больше памяти.
+
+Вход читается частями по max_rows строк; каждая часть сортируется
+в памяти и сбрасывается во временный файл (pickle пачками), после чего
+отсортированные части сливаются потоком через heapq.merge. В памяти
+одновременно находится одна часть и по одной пачке от каждого файла.
+
+Порядок совпадает с sorted(): heapq.merge при равных ключах отдаёт
+строки более ранних частей первыми, поэтому сортировка устойчива и
+при reverse=True.
+"""
+
+import heapq
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Union
+
+Row = Dict[str, Any]
+
+# Сколько записей сериализуется за один вызов pickle.dump
+BATCH = 1024
+
+
+def check_max_rows(max_rows: Union[int, None]) -> None:
+    """Проверяет бюджет памяти в строках (None — без ограничения)."""
+    if max_rows is None:
+        return
+    if isinstance(max_rows, bool) or not isinstance(max_rows, int):
+        raise ValueError(f"max_rows must be a positive integer: {max_rows!r}")
+    if max_rows < 1:
+        raise ValueError(f"max_rows must be a positive integer: {max_rows!r}")
+
+
+def spill(records: List[Any], directory: Union[str, None] = None):
+    """Записывает записи во временный файл и возвращает его."""
+    file = tempfile.TemporaryFile(dir=directory)
+    for start in range(0, len(records), BATCH):
+        pickle.dump(
+            records[start:start + BATCH],
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    file.seek(0)
+    return file
+
+
+def read_spilled(file) -> Iterator[Any]:
+    """Читает записи временного файла по пачкам."""
+    while True:
+        try:
+            batch = pickle.load(file)
+        except EOFError:
+            return
+        yield from batch
+
+
+def external_sort(
+    rows: Iterable[Any],
+    key: Callable[[Any], Any],
+    reverse: bool = False,
+    max_rows: int = 100_000,
+    directory: Union[str, None] = None,
+) -> Iterator[Any]:
+    """
+    Сортирует поток записей, держа в памяти не больше max_rows.
+
+    :param rows: итерируемый источник записей (читается один раз).
+    :param key: функция ключа сортировки.
+    :param reverse: обратный порядок, как в sorted().
+    :param max_rows: размер части, сортируемой в памяти.
+    :param directory: каталог временных файлов (по умолчанию системный).
+    :yield: записи в порядке sorted(rows, key=key, reverse=reverse).
+    """
+    runs = []
+    chunk = []
+    try:
+        for item in rows:
+            chunk.append(item)
+            if len(chunk) >= max_rows:
+                chunk.sort(key=key, reverse=reverse)
+                runs.append(spill(chunk, directory))
+                chunk = []
+        chunk.sort(key=key, reverse=reverse)
+        if not runs:
+            yield from chunk
+            return
+        # Последняя часть остаётся в памяти и сливается последней
+        streams = [read_spilled(file) for file in runs]
+        streams.append(chunk)
+        yield from heapq.merge(*streams, key=key, reverse=reverse)
+    finally:
+        for file in runs:
+            file.close()
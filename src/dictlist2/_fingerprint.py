@@ -0,0 +1,98 @@
+"""
+Отпечатки строк для unique() и distinct().
+
+Строка из хэшируемых значений сравнивается как frozenset(item.items()).
+Если в строке есть список, словарь или множество, frozenset вызывает
+TypeError — тогда вложенные контейнеры «замораживаются» рекурсивно:
+равные значения дают равные хэшируемые представления, а список и
+кортеж с одинаковыми элементами остаются различными, как при ==.
+
+С digest=True вместо представлений хранятся только их хэши (64 бита
+на 64-битных сборках) и ссылки на первые строки. Совпадение хэшей
+проверяется сравнением самих строк, поэтому коллизия не теряет
+уникальную строку.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Iterator, List
+
+Row = Dict[str, Any]
+
+# Метки вложенных контейнеров: отличают список от кортежа и словарь от
+# множества пар с теми же элементами
+_LIST = object()
+_TUPLE = object()
+_MAPPING = object()
+
+_MISSING = object()
+
+
+def freeze(value: Any) -> Hashable:
+    """Хэшируемое представление значения (вложенные контейнеры тоже)."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, Mapping):
+        return _MAPPING, frozenset(
+            (key, freeze(item)) for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return _LIST, tuple(freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return _TUPLE, tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        # Элементы множества всегда хэшируемы; set() == frozenset()
+        return frozenset(value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    raise TypeError(f"Unhashable value: {type(value).__name__}")
+
+
+def row_key(item: Row) -> FrozenSet:
+    """Хэшируемый ключ строки целиком; порядок полей не важен."""
+    try:
+        return frozenset(item.items())
+    except TypeError:
+        return frozenset((key, freeze(value)) for key, value in item.items())
+
+
+def unique_rows(rows: Iterable[Row], digest: bool = False) -> List[Row]:
+    """
+    Первые вхождения различных строк в порядке списка.
+
+    :param digest: хранить 64-битные хэши вместо ключей строк.
+    """
+    return list(iter_unique_rows(rows, digest))
+
+
+def iter_unique_rows(
+    rows: Iterable[Row], digest: bool = False
+) -> Iterator[Row]:
+    """Генератор первых вхождений различных строк, см. unique_rows()."""
+    if not digest:
+        seen = set()
+        for item in rows:
+            key = row_key(item)
+            if key not in seen:
+                seen.add(key)
+                yield item
+        return
+
+    firsts = {}
+    collisions = {}
+    for item in rows:
+        code = hash(row_key(item))
+        first = firsts.get(code, _MISSING)
+        if first is _MISSING:
+            firsts[code] = item
+        elif first == item:
+            continue
+        else:
+            # Разные строки с одним хэшем: сравниваются со всеми
+            others = collisions.setdefault(code, [])
+            if any(other == item for other in others):
+                continue
+            others.append(item)
+        yield item
@@ -0,0 +1,189 @@
+"""
+Индексы по полям DictList2.
+
+Хэш-индекс хранит для каждого значения ключа номера строк в порядке
+списка. Индекс строится один раз и используется методами filter(),
+join(), gen_filter(), group_by() и aggregate() для условий на равенство.
+
+Упорядоченный индекс хранит значения поля по возрастанию вместе с
+номерами строк: диапазон находится двоичным поиском за O(log n + k),
+а sort() по этому полю обходится без сортировки.
+
+При изменении списка индексы помечаются устаревшими и перестраиваются
+при следующем обращении.
+"""
+
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from ._keys import tuple_getter
+
+
+def index_fields(fields: Union[str, List[str]]) -> Tuple[str, ...]:
+    """Нормализует поле или список полей к кортежу."""
+    return (fields,) if isinstance(fields, str) else tuple(fields)
+
+
+class HashIndex:
+    """
+    Хэш-индекс: значение ключа (кортеж) -> номера строк.
+
+    :ivar fields: поля индекса.
+    :ivar buckets: словарь ключ -> список номеров строк; None — индекс
+        устарел и должен быть перестроен.
+    :ivar missing: True, если хотя бы в одной строке нет поля индекса.
+    """
+
+    __slots__ = ("fields", "buckets", "missing")
+
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        self.buckets = None
+        self.missing = False
+
+    def build(self, rows: Iterable[Dict[str, Any]]) -> None:
+        fields = self.fields
+        get_key = tuple_getter(fields)
+        buckets = {}
+        missing = False
+        for pos, item in enumerate(rows):
+            key = get_key(item)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [pos]
+            else:
+                bucket.append(pos)
+            if not missing:
+                missing = any(f not in item for f in fields)
+        self.buckets = buckets
+        self.missing = missing
+
+    def lookup(self, key: Tuple[Any, ...]) -> List[int]:
+        """Номера строк с заданным значением ключа (по возрастанию)."""
+        return self.buckets.get(key, [])
+
+
+class SortedIndex:
+    """
+    Упорядоченный индекс по одному полю.
+
+    :ivar field: поле индекса.
+    :ivar keys: значения поля по возрастанию (None — индекс устарел).
+    :ivar positions: номера строк в том же порядке; строки с равными
+        значениями идут в порядке списка.
+    :ivar complete: True, если поле есть во всех строках и не равно
+        None — тогда индекс задаёт полный порядок для sort().
+    """
+
+    __slots__ = ("field", "keys", "positions", "complete")
+
+    def __init__(self, field: str):
+        self.field = field
+        self.keys = None
+        self.positions = None
+        self.complete = False
+
+    def build(self, rows: Iterable[Dict[str, Any]]) -> None:
+        field = self.field
+        pairs = []
+        total = 0
+        for pos, item in enumerate(rows):
+            total += 1
+            value = item.get(field)
+            if value is not None:
+                pairs.append((value, pos))
+        pairs.sort(key=itemgetter(0))
+        self.keys = [value for value, _ in pairs]
+        self.positions = [pos for _, pos in pairs]
+        self.complete = len(pairs) == total
+
+    def range(
+        self,
+        low: Any = None,
+        low_inclusive: bool = True,
+        high: Any = None,
+        high_inclusive: bool = True,
+    ) -> List[int]:
+        """Номера строк с low <= значение <= high в порядке значений."""
+        keys = self.keys
+        start = 0
+        stop = len(keys)
+        if low is not None:
+            bisect = bisect_left if low_inclusive else bisect_right
+            start = bisect(keys, low)
+        if high is not None:
+            bisect = bisect_right if high_inclusive else bisect_left
+            stop = bisect(keys, high)
+        return self.positions[start:stop] if start < stop else []
+
+    def ordered(self, reverse: bool = False) -> Iterator[int]:
+        """
+        Номера строк в порядке sorted(..., reverse=reverse).
+
+        При reverse=True строки с равными значениями, как и в sorted(),
+        сохраняют исходный порядок.
+        """
+        if not reverse:
+            yield from self.positions
+            return
+        keys = self.keys
+        stop = len(keys)
+        while stop:
+            start = bisect_left(keys, keys[stop - 1], 0, stop)
+            yield from self.positions[start:stop]
+            stop = start
+
+
+class IndexSet:
+    """Набор индексов одного списка с ленивой перестройкой."""
+
+    __slots__ = ("indexes", "sorted")
+
+    def __init__(self):
+        self.indexes = {}
+        self.sorted = {}
+
+    def add(self, index: HashIndex) -> None:
+        self.indexes[index.fields] = index
+
+    def add_sorted(self, index: SortedIndex) -> None:
+        self.sorted[index.field] = index
+
+    def drop(self, fields: Tuple[str, ...]) -> None:
+        self.indexes.pop(fields, None)
+        if len(fields) == 1:
+            self.sorted.pop(fields[0], None)
+
+    def invalidate(self) -> None:
+        for index in self.indexes.values():
+            index.buckets = None
+        for index in self.sorted.values():
+            index.keys = None
+
+    def get_sorted(self, field: str, rows) -> Union[SortedIndex, None]:
+        """Актуальный упорядоченный индекс по полю или None."""
+        index = self.sorted.get(field)
+        if index is not None and index.keys is None:
+            index.build(rows)
+        return index
+
+    def get(self, fields: Tuple[str, ...], rows) -> Union[HashIndex, None]:
+        """Актуальный индекс по точному набору полей или None."""
+        index = self.indexes.get(fields)
+        if index is not None and index.buckets is None:
+            index.build(rows)
+        return index
+
+    def best_for(self, names: Iterable[str], rows) -> Union[HashIndex, None]:
+        """Индекс с наибольшим числом полей, все поля которого в names."""
+        names = set(names)
+        best = None
+        for fields, index in self.indexes.items():
+            if set(fields) <= names and (
+                best is None or len(fields) > len(best.fields)
+            ):
+                best = index
+        if best is not None and best.buckets is None:
+            best.build(rows)
+        return best
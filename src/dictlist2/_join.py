@@ -0,0 +1,227 @@
+"""
+Соединение списков словарей для DictList2.
+
+Хэш-соединение строит индекс по меньшему из двух списков и хранит для
+каждого значения ключа список строк, поэтому каждая пара совпавших
+строк даёт отдельную строку результата (реляционная семантика), а время
+работы линейно от размера входа и выхода.
+
+Соединение слиянием работает с уже отсортированными входами и не
+строит индекс вовсе.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ._keys import key_getter
+
+Row = Dict[str, Any]
+Key = Union[str, List[str]]
+
+
+def key_function(key: Key, strict: bool) -> Callable[[Row], Any]:
+    """
+    Функция извлечения ключа соединения из строки.
+
+    :param key: поле или список полей (составной ключ).
+    :param strict: True — отсутствие поля вызывает KeyError
+        (правый список), False — отсутствующее поле даёт None.
+    """
+    return key_getter(key, strict)
+
+
+def merge_inner(left: Row, right: Row) -> Row:
+    """Поля правой строки перекрывают поля левой."""
+    return {**left, **right}
+
+
+def merge_left(left: Row, right: Row) -> Row:
+    """Из правой строки добавляются только отсутствующие в левой поля."""
+    merged = dict(left)
+    for k, v in right.items():
+        if k not in merged:
+            merged[k] = v
+    return merged
+
+
+def hash_join(
+    left: List[Row],
+    right: Iterable[Row],
+    key: Key,
+    how: str = "inner",
+) -> List[Row]:
+    """
+    Соединяет два списка словарей по ключу.
+
+    Порядок результата: строки левого списка в исходном порядке,
+    для каждой из них — совпавшие правые строки в их исходном порядке.
+
+    :param left: левый список.
+    :param right: правый список (итерируемый источник словарей).
+    :param key: поле или список полей соединения.
+    :param how: "inner" — только совпавшие пары,
+        "left" — несовпавшие левые строки остаются без изменений.
+    :return: список объединённых словарей.
+    """
+    if how not in ("inner", "left"):
+        raise ValueError(f"Unknown join type: {how}")
+
+    right = right if isinstance(right, (list, tuple)) else list(right)
+    if len(right) <= len(left):
+        # Индекс по правому списку, левый просматривается потоком
+        return list(probe_join(left, right, key, how))
+
+    left_key = key_function(key, strict=False)
+    right_key = key_function(key, strict=True)
+    merge = merge_inner if how == "inner" else merge_left
+
+    # Индекс по левому списку: позиции строк для каждого ключа
+    positions = {}
+    for pos, item in enumerate(left):
+        positions.setdefault(left_key(item), []).append(pos)
+    found = [None] * len(left)
+    for item in right:
+        for pos in positions.get(right_key(item), ()):
+            if found[pos] is None:
+                found[pos] = [item]
+            else:
+                found[pos].append(item)
+
+    result = []
+    for item, rows in zip(left, found):
+        if rows:
+            for match in rows:
+                result.append(merge(item, match))
+        elif how == "left":
+            result.append(dict(item))
+    return result
+
+
+def probe_join(
+    left: Iterable[Row],
+    right: Iterable[Row],
+    key: Key,
+    how: str = "inner",
+    lookup: Optional[Callable[[Any], Optional[List[Row]]]] = None,
+) -> Iterator[Row]:
+    """
+    Хэш-соединение с индексом по правому входу и потоковым левым.
+
+    Левый вход читается один раз и не материализуется, поэтому функция
+    подходит для ленивых конвейеров.
+
+    :param left: левый вход (итерируемый источник словарей).
+    :param right: правый вход, по которому строится индекс.
+    :param key: поле или список полей соединения.
+    :param how: "inner" или "left".
+    :param lookup: готовый поиск правых строк по значению ключа
+        (например, из индекса правого списка); тогда right не читается.
+    :yield: объединённые словари в порядке левого входа.
+    """
+    if how not in ("inner", "left"):
+        raise ValueError(f"Unknown join type: {how}")
+
+    left_key = key_function(key, strict=False)
+    merge = merge_inner if how == "inner" else merge_left
+
+    if lookup is None:
+        right_key = key_function(key, strict=True)
+        index = {}
+        for item in right:
+            index.setdefault(right_key(item), []).append(item)
+        lookup = index.get
+
+    for item in left:
+        rows = lookup(left_key(item))
+        if rows:
+            for match in rows:
+                yield merge(item, match)
+        elif how == "left":
+            yield dict(item)
+
+
+def _ordered(
+    rows: Iterable[Row], get_key: Callable[[Row], Any], side: str
+) -> Iterator[Tuple[Any, Row]]:
+    """Выдаёт пары (ключ, строка), проверяя неубывание ключа."""
+    previous = None
+    first = True
+    for row in rows:
+        key = get_key(row)
+        if not first and key < previous:
+            raise ValueError(f"merge join: {side} input is not sorted by key")
+        previous = key
+        first = False
+        yield key, row
+
+
+def merge_join(
+    left: Iterable[Row],
+    right: Iterable[Row],
+    key: Key,
+    how: str = "inner",
+) -> Iterator[Row]:
+    """
+    Соединение слиянием двух входов, отсортированных по ключу.
+
+    Входы читаются синхронно и однократно; в памяти хранится только
+    серия правых строк с текущим значением ключа. Если ключ на
+    каком-либо входе убывает, выбрасывается ValueError.
+
+    :param left: левый вход, отсортированный по ключу.
+    :param right: правый вход, отсортированный по ключу.
+    :param key: поле или список полей соединения.
+    :param how: "inner", "left", "right" или "full".
+    :yield: объединённые словари в порядке возрастания ключа.
+    """
+    if how not in ("inner", "left", "right", "full"):
+        raise ValueError(f"Unknown join type: {how}")
+
+    keep_left = how in ("left", "full")
+    keep_right = how in ("right", "full")
+    merge = merge_left if how == "left" else merge_inner
+
+    left_rows = _ordered(left, key_function(key, strict=False), "left")
+    right_rows = _ordered(right, key_function(key, strict=True), "right")
+    lt = next(left_rows, None)
+    rt = next(right_rows, None)
+
+    while lt is not None and rt is not None:
+        if lt[0] < rt[0]:
+            if keep_left:
+                yield dict(lt[1])
+            lt = next(left_rows, None)
+        elif rt[0] < lt[0]:
+            if keep_right:
+                yield dict(rt[1])
+            rt = next(right_rows, None)
+        else:
+            # Серия правых строк с одинаковым ключом
+            current = rt[0]
+            run = []
+            while rt is not None and rt[0] == current:
+                run.append(rt[1])
+                rt = next(right_rows, None)
+            while lt is not None and lt[0] == current:
+                for match in run:
+                    yield merge(lt[1], match)
+                lt = next(left_rows, None)
+
+    while lt is not None:
+        if keep_left:
+            yield dict(lt[1])
+        lt = next(left_rows, None)
+
+    while rt is not None:
+        if keep_right:
+            yield dict(rt[1])
+        rt = next(right_rows, None)
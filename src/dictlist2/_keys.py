@@ -0,0 +1,82 @@
+"""
+Извлечение ключей из строк.
+
+Список полей один раз превращается в самую быструю функцию доступа:
+
+- строгий доступ (отсутствие поля — KeyError) — operator.itemgetter;
+- мягкий доступ (отсутствие поля — None) для одного поля —
+  operator.methodcaller("get", поле);
+- кортеж значений — сгенерированная функция вида
+  ``return (item.get(_f0), item.get(_f1))`` без генераторного выражения.
+
+Функции кэшируются по набору полей и общие для всех методов DictList2,
+поэтому повторные вызовы с теми же полями ничего не компилируют.
+"""
+
+from functools import lru_cache
+from operator import itemgetter, methodcaller
+from typing import Any, Callable, Dict, Hashable, List, Tuple, Union
+
+Row = Dict[str, Any]
+Fields = Union[str, List[str], Tuple[str, ...]]
+
+
+def _as_tuple(fields: Fields) -> Tuple[Hashable, ...]:
+    return (fields,) if isinstance(fields, str) else tuple(fields)
+
+
+@lru_cache(maxsize=256)
+def _value_getter(field: Hashable, strict: bool) -> Callable[[Row], Any]:
+    if strict:
+        return itemgetter(field)
+    return methodcaller("get", field)
+
+
+@lru_cache(maxsize=256)
+def _tuple_getter(
+    fields: Tuple[Hashable, ...], strict: bool
+) -> Callable[[Row], Tuple[Any, ...]]:
+    if strict and len(fields) > 1:
+        # itemgetter с несколькими полями сам возвращает кортеж
+        return itemgetter(*fields)
+
+    namespace = {f"_f{pos}": field for pos, field in enumerate(fields)}
+    template = "item[_f{}]" if strict else "item.get(_f{})"
+    values = [template.format(pos) for pos in range(len(fields))]
+    body = "(" + "".join(value + ", " for value in values).rstrip() + ")"
+    exec(f"def getter(item):\n    return {body}\n", namespace)
+    return namespace["getter"]
+
+
+def value_getter(
+    field: Hashable, strict: bool = False
+) -> Callable[[Row], Any]:
+    """
+    Функция чтения одного поля.
+
+    :param strict: True — item[field] (KeyError), False — item.get(field).
+    """
+    return _value_getter(field, strict)
+
+
+def tuple_getter(
+    fields: Fields, strict: bool = False
+) -> Callable[[Row], Tuple[Any, ...]]:
+    """
+    Функция, возвращающая кортеж значений полей (и для одного поля).
+
+    :param fields: поле или список полей.
+    :param strict: True — отсутствие поля вызывает KeyError,
+        False — отсутствующее поле даёт None.
+    """
+    return _tuple_getter(_as_tuple(fields), strict)
+
+
+def key_getter(fields: Fields, strict: bool = False) -> Callable[[Row], Any]:
+    """
+    Ключ соединения или сортировки: значение для строки-поля, кортеж
+    для списка полей.
+    """
+    if isinstance(fields, str):
+        return _value_getter(fields, strict)
+    return _tuple_getter(tuple(fields), strict)
@@ -0,0 +1,243 @@
+"""
+Векторизованная агрегация на NumPy (необязательная зависимость).
+
+Ключи групп кодируются целыми номерами за один проход, после чего
+sum/count/avg/min/max считаются ядрами NumPy (bincount, reduceat).
+Для целых колонок count_distinct считается через np.unique, а
+approx_count_distinct — векторным splitmix64 с теми же регистрами
+HyperLogLog, что и в _sketch.py, поэтому результат совпадает с
+реализацией на Python. Если NumPy не установлен, значения не числовые
+или нужен квантиль, функция возвращает None, и вызывающий код использует
+реализацию на чистом Python.
+
+Типы результатов те же, что у накопителей на Python: в колонке из
+целых и вещественных (в том числе None, который читается как 0) сумма
+группы из одних целых — int, а min / max — исходное значение первой
+строки с экстремумом.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from ._aggregate import compile_aggregations, ordered_groups, zero
+from ._keys import tuple_getter
+from ._sketch import MASK, PRECISION, REGISTERS, SPARSE, hll_estimate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy необязателен
+    np = None
+
+# Запас, при котором сумма int64 гарантированно не переполняется
+INT64_SAFE = 2**62
+# Целые до 2**53 и их суммы представимы в float64 точно
+FLOAT_EXACT = 2**53
+
+# Операции, которые считаются ядрами NumPy
+NUMPY_OPS = {
+    "sum",
+    "count",
+    "avg",
+    "min",
+    "max",
+    "count_distinct",
+    "approx_count_distinct",
+}
+DISTINCT_OPS = ("count_distinct", "approx_count_distinct")
+
+
+def mix64(values):
+    """splitmix64 для массива uint64, как _sketch.mix64()."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(
+        0xBF58476D1CE4E5B9
+    )
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(
+        0x94D049BB133111EB
+    )
+    return values ^ (values >> np.uint64(31))
+
+
+def first_extremes(ufunc, ordered, starts, by_code, values: list) -> list:
+    """
+    min / max каждой группы как исходное значение Python: первая строка
+    группы, равная экстремуму (так его выбирают MinAccumulator и
+    MaxAccumulator).
+    """
+    extremes = ufunc.reduceat(ordered, starts)
+    sizes = np.diff(np.append(starts, len(ordered)))
+    hits = np.flatnonzero(ordered == np.repeat(extremes, sizes))
+    first = hits[np.searchsorted(hits, starts)]
+    return [values[position] for position in by_code[first].tolist()]
+
+
+def distinct_counts(codes, array, size: int, approx: bool) -> list:
+    """
+    Число различных значений целой колонки в каждой группе.
+
+    approx=True — оценка HyperLogLog по хэшам, как у
+    HyperLogLogAccumulator: до SPARSE различных хэшей счёт точный.
+    """
+    if approx:
+        array = mix64(array.astype(np.uint64))
+    # Пары (группа, значение) по возрастанию; первая из равных — новая
+    by_pair = np.lexsort((array, codes))
+    group_codes, array = codes[by_pair], array[by_pair]
+    first = np.ones(len(array), dtype=bool)
+    first[1:] = (group_codes[1:] != group_codes[:-1]) | (
+        array[1:] != array[:-1]
+    )
+    group_codes, array = group_codes[first], array[first]
+    exact = np.bincount(group_codes, minlength=size)
+    if not approx:
+        return exact.tolist()
+
+    result = exact.tolist()
+    dense = np.flatnonzero(exact > SPARSE)
+    if not len(dense):
+        return result
+
+    # Регистры только для групп, вышедших из точного режима
+    slot = np.full(size, -1, dtype=np.intp)
+    slot[dense] = np.arange(len(dense))
+    group_slots = slot[group_codes]
+    chosen = group_slots >= 0
+    group_slots, hashes = group_slots[chosen], array[chosen]
+    index = (hashes >> np.uint64(64 - PRECISION)).astype(np.intp)
+    low = (hashes & np.uint64(MASK >> PRECISION)).astype(np.float64)
+    # bit_length через показатель frexp (точен для чисел < 2**53)
+    bits = np.where(low > 0, np.frexp(low)[1], 0)
+    rank = (65 - PRECISION - bits).astype(np.uint8)
+    registers = np.zeros((len(dense), REGISTERS), dtype=np.uint8)
+    np.maximum.at(registers, (group_slots, index), rank)
+    for position, code in enumerate(dense.tolist()):
+        result[code] = round(hll_estimate(registers[position].tobytes()))
+    return result
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def numpy_aggregate(
+    rows: Iterable[Dict[str, Any]],
+    group_keys: Union[List[str], None],
+    aggregations: Dict[str, Union[str, List[str]]],
+    order: Union[str, None] = "sorted",
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Агрегация с теми же результатами, что и hash_aggregate().
+
+    :param order: порядок групп, см. ordered_groups().
+    :return: список словарей или None, если NumPy недоступен либо
+        данные нельзя представить числовыми массивами.
+    """
+    compile_aggregations(aggregations)
+    if np is None:
+        return None
+    for field, ops in aggregations.items():
+        ops_list = [ops] if isinstance(ops, str) else ops
+        if not isinstance(field, str) or any(
+            op not in NUMPY_OPS for op in ops_list
+        ):
+            return None
+
+    keys = group_keys or []
+    get_key = tuple_getter(keys)
+    fields = list(aggregations)
+    groups = {}
+    codes = []
+    values = {field: [] for field in fields}
+
+    if group_keys is None:
+        groups[()] = 0
+
+    for item in rows:
+        key = get_key(item)
+        code = groups.get(key)
+        if code is None:
+            code = groups[key] = len(groups)
+        codes.append(code)
+        for field in fields:
+            values[field].append(zero(item.get(field, 0)))
+
+    if not codes:
+        # Пустые данные: считать нечего, результат тривиален
+        return None
+
+    size = len(groups)
+    codes = np.asarray(codes, dtype=np.intp)
+    by_code = np.argsort(codes, kind="stable")
+    sorted_codes = codes[by_code]
+    starts = np.flatnonzero(
+        np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1]))
+    )
+    counts = np.bincount(codes, minlength=size).tolist()
+
+    columns = {}
+    for field, ops in aggregations.items():
+        ops_list = [ops] if isinstance(ops, str) else ops
+        if all(op == "count" for op in ops_list):
+            for op in ops_list:
+                columns[f"{field}_{op}"] = counts
+            continue
+        array = np.asarray(values[field])
+        if array.dtype.kind not in "if":
+            return None
+        if array.dtype.kind != "i" and any(
+            op in DISTINCT_OPS for op in ops_list
+        ):
+            return None
+        ordered = array[by_code]
+        integral = None
+        if array.dtype.kind == "i":
+            if int(np.abs(array).max()) * len(array) >= INT64_SAFE:
+                return None
+            # Целые суммируются точно в int64
+            sums = np.add.reduceat(ordered, starts).tolist()
+        else:
+            if np.isnan(array).any():
+                return None
+            # bincount складывает значения в порядке строк, как Python
+            sums = np.bincount(codes, weights=array, minlength=size).tolist()
+            is_int = np.fromiter(
+                (type(v) is int for v in values[field]), bool, len(array)
+            )
+            if is_int.any():
+                # Целые и вещественные вперемешку: сумма группы из одних
+                # целых возвращается как int
+                if float(np.abs(array).max()) * len(array) >= FLOAT_EXACT:
+                    return None
+                integral = np.logical_and.reduceat(is_int[by_code], starts)
+                sums = [
+                    int(total) if whole else total
+                    for total, whole in zip(sums, integral.tolist())
+                ]
+        for op in ops_list:
+            name = f"{field}_{op}"
+            if op == "sum":
+                columns[name] = sums
+            elif op == "count":
+                columns[name] = counts
+            elif op in DISTINCT_OPS:
+                columns[name] = distinct_counts(
+                    codes, array, size, op == "approx_count_distinct"
+                )
+            elif op == "avg":
+                columns[name] = [s / c for s, c in zip(sums, counts)]
+            elif integral is None:
+                ufunc = np.minimum if op == "min" else np.maximum
+                columns[name] = ufunc.reduceat(ordered, starts).tolist()
+            else:
+                ufunc = np.minimum if op == "min" else np.maximum
+                columns[name] = first_extremes(
+                    ufunc, ordered, starts, by_code, values[field]
+                )
+
+    result = []
+    for key in ordered_groups(groups, order):
+        code = groups[key]
+        row = dict(zip(keys, key))
+        for name, column in columns.items():
+            row[name] = column[code]
+        result.append(row)
+    return result
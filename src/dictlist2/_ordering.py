@@ -0,0 +1,201 @@
+"""
+Порядок сортировки DictList2: ключи, направления и положение None.
+
+by задаётся полем, списком полей или словарём {поле: "asc" | "desc"}.
+В памяти строки с разными направлениями сортируются несколькими
+устойчивыми проходами — от младшего ключа к старшему, каждый со своим
+reverse, — поэтому значения любых типов не нужно «обращать». Кучам
+(top()) и внешней сортировке нужен один ключ: в нём поля против общего
+направления оборачиваются в Descending с обратным сравнением.
+
+nulls="first" / "last" ставит None в начало или в конец независимо от
+направления поля. По умолчанию None не обрабатывается особо и, как в
+sorted(), сравнение с ним вызывает TypeError. Отсутствие поля в строке
+вызывает KeyError; с strict=False (порядок внутри групп gen_filter())
+отсутствующее поле читается как None.
+"""
+
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from ._keys import key_getter, tuple_getter, value_getter
+
+Row = Dict[str, Any]
+By = Union[str, List[str], Dict[str, str]]
+
+DIRECTIONS = {"asc": False, "desc": True}
+NULLS = (None, "first", "last")
+
+
+class Descending:
+    """Обёртка значения с обратным порядком сравнения."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: "Descending") -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: "Descending") -> bool:
+        return other.value < self.value
+
+
+def check_nulls(nulls: Union[str, None]) -> None:
+    if nulls not in NULLS:
+        raise ValueError(f"Unknown nulls placement: {nulls!r}")
+
+
+def sort_fields(by: By) -> List[Tuple[str, bool]]:
+    """Поля сортировки с направлением: [(поле, по убыванию)]."""
+    if isinstance(by, str):
+        return [(by, False)]
+    if isinstance(by, dict):
+        fields = []
+        for field, direction in by.items():
+            if direction not in DIRECTIONS:
+                raise ValueError(f"Unknown sort direction: {direction!r}")
+            fields.append((field, DIRECTIONS[direction]))
+        return fields
+    return [(field, False) for field in by]
+
+
+def _getter(
+    fields: List[str],
+    index: Union[Dict[str, int], None],
+    strict: bool = True,
+) -> Callable[[Row], Any]:
+    """
+    Значение поля (кортеж для нескольких), как item[field].
+
+    С strict=False ключ — всегда кортеж item.get(): равные None
+    сравниваются как равные кортежи, без None < None.
+    """
+    if not strict:
+        return tuple_getter(fields)
+    if index is None:
+        return key_getter(fields[0] if len(fields) == 1 else fields, True)
+    # Строки схемы без пропусков: значения читаются по номерам
+    values = itemgetter(*[index[field] for field in fields])
+    return lambda item: values(item._values)
+
+
+def _field_key(
+    field: str,
+    descending: bool,
+    nulls: Union[str, None],
+    index: Union[Dict[str, int], None] = None,
+    strict: bool = True,
+) -> Callable[[Row], Any]:
+    """Ключ одного поля; None получает признак, ставящий его по nulls."""
+    if nulls is None:
+        return _getter([field], index, strict)
+    get = _getter([field], index) if strict else value_getter(field)
+
+    # Проход по убыванию переворачивает и признак, поэтому он
+    # выбирается с учётом направления
+    if (nulls == "last") != descending:
+
+        def key(item: Row) -> Tuple[bool, Any]:
+            value = get(item)
+            return value is None, value
+
+    else:
+
+        def key(item: Row) -> Tuple[bool, Any]:
+            value = get(item)
+            return value is not None, value
+
+    return key
+
+
+def _descending(key: Callable[[Row], Any]) -> Callable[[Row], Any]:
+    return lambda item: Descending(key(item))
+
+
+def _run_key(
+    fields: List[Tuple[str, bool]],
+    nulls: Union[str, None],
+    index: Union[Dict[str, int], None] = None,
+    strict: bool = True,
+) -> Callable[[Row], Any]:
+    """Ключ для полей одного направления (кортеж для нескольких)."""
+    if nulls is None:
+        return _getter([field for field, _ in fields], index, strict)
+    keys = [
+        _field_key(field, desc, nulls, index, strict)
+        for field, desc in fields
+    ]
+    if len(keys) == 1:
+        return keys[0]
+    return lambda item: tuple(key(item) for key in keys)
+
+
+def sort_passes(
+    by: By,
+    reverse: bool = False,
+    nulls: Union[str, None] = None,
+    index: Union[Dict[str, int], None] = None,
+    strict: bool = True,
+) -> List[Tuple[Callable[[Row], Any], bool]]:
+    """
+    Проходы устойчивой сортировки: [(ключ, reverse)] от младшего ключа
+    к старшему. Соседние поля одного направления сортируются за один
+    проход; reverse=True меняет направление всех полей.
+
+    :param index: поле -> номер значения, если все строки — Record
+        одной схемы без пропущенных полей.
+    :param strict: False — отсутствующее поле читается как None.
+    """
+    check_nulls(nulls)
+    runs = []
+    for field, descending in sort_fields(by):
+        descending = descending != reverse
+        if runs and runs[-1][1] == descending:
+            runs[-1][0].append((field, descending))
+        else:
+            runs.append(([(field, descending)], descending))
+    return [
+        (_run_key(fields, nulls, index, strict), desc)
+        for fields, desc in runs[::-1]
+    ]
+
+
+def sort_rows(
+    rows: Iterable[Row],
+    by: By,
+    reverse: bool = False,
+    nulls: Union[str, None] = None,
+    index: Union[Dict[str, int], None] = None,
+    strict: bool = True,
+) -> List[Row]:
+    """Новый список строк, отсортированный по by (устойчиво)."""
+    rows = list(rows)
+    for key, descending in sort_passes(by, reverse, nulls, index, strict):
+        rows.sort(key=key, reverse=descending)
+    return rows
+
+
+def single_key(
+    by: By,
+    reverse: bool = False,
+    nulls: Union[str, None] = None,
+    strict: bool = True,
+) -> Tuple[Callable[[Row], Any], bool]:
+    """
+    Один ключ для порядка by: (ключ, reverse для sorted()/heapq).
+
+    Если все поля одного направления, ключ обычный; иначе поля по
+    убыванию оборачиваются в Descending, и reverse равен False.
+    """
+    passes = sort_passes(by, reverse, nulls, strict=strict)
+    if len(passes) == 1:
+        return passes[0]
+
+    keys = []
+    for field, descending in sort_fields(by):
+        descending = descending != reverse
+        key = _field_key(field, descending, nulls, strict=strict)
+        keys.append(_descending(key) if descending else key)
+    return lambda item: tuple(key(item) for key in keys), False
@@ -0,0 +1,345 @@
+"""
+Параллельная агрегация на нескольких ядрах.
+
+Строки не копируются в обработчики и не читаются основным процессом:
+список регистрируется в модуле до запуска пула, а процессы создаются
+через fork и видят его по наследству (copy-on-write). Каждому
+обработчику передаются только границы непрерывного отрезка строк.
+
+Группировка идёт в два шага. Сначала обработчики раскладывают свои
+отрезки по хэшу ключа группы и возвращают номера строк (array) для
+каждого владельца; основной процесс только склеивает эти массивы.
+Затем каждый владелец агрегирует свои группы целиком, в исходном
+порядке строк, поэтому результат совпадает с однопроцессным точно, в
+том числе для сумм вещественных чисел. Без группировки отрезки
+агрегируются независимо и объединяются накопителями через merge(), и
+суммы вещественных чисел могут отличаться в последнем знаке.
+
+На сборках Python без GIL (3.13t) вместо процессов используются потоки
+с тем же общим списком. Если нет ни fork, ни сборки без GIL (Windows),
+вычисление идёт в текущем процессе, как без workers.
+"""
+
+import heapq
+import multiprocessing
+import sys
+from array import array
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import contextmanager
+from itertools import count
+from operator import itemgetter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ._aggregate import (
+    compile_aggregations,
+    hash_aggregate,
+    hash_group_by,
+    ordered_groups,
+    split_slots,
+)
+from ._keys import tuple_getter
+
+Row = Dict[str, Any]
+Key = Tuple[Any, ...]
+Owned = List[Tuple[int, Key, Row]]
+
+# Данные, общие с обработчиками: номер -> (списки строк, ...)
+_SHARED: Dict[int, Tuple[Any, ...]] = {}
+_tokens = count()
+
+
+def check_workers(workers: Union[int, None]) -> None:
+    """Проверяет параметр workers (None — без параллельности)."""
+    if workers is None:
+        return
+    if isinstance(workers, bool) or not isinstance(workers, int):
+        raise ValueError(f"workers must be a positive integer: {workers!r}")
+    if workers < 1:
+        raise ValueError(f"workers must be a positive integer: {workers!r}")
+
+
+def _free_threaded() -> bool:
+    gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return gil_enabled is not None and not gil_enabled()
+
+
+def can_share() -> bool:
+    """Есть ли пул, обработчики которого видят _SHARED без передачи."""
+    return _free_threaded() or (
+        "fork" in multiprocessing.get_all_start_methods()
+    )
+
+
+@contextmanager
+def shared_pool(workers: int, *objects: Any) -> Iterator[Tuple[Executor, int]]:
+    """
+    Пул и номер объектов в _SHARED на время блока.
+
+    Объекты регистрируются до создания пула: процессы fork получают
+    их по наследству, потоки сборки без GIL читают напрямую.
+    """
+    token = next(_tokens)
+    _SHARED[token] = objects
+    try:
+        if _free_threaded():
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            context = multiprocessing.get_context("fork")
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        with pool:
+            yield pool, token
+    finally:
+        del _SHARED[token]
+
+
+def ranges(size: int, parts: int) -> List[Tuple[int, int]]:
+    """Границы [start, stop) не более parts непрерывных отрезков."""
+    step = max(1, -(-size // parts))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def route_range(
+    token: int, group_keys: List[str], owners: int, start: int, stop: int
+) -> List[array]:
+    """
+    Раскладывает строки отрезка по владельцам по хэшу ключа группы.
+
+    Хэш строк и чисел одинаков во всех процессах: fork наследует
+    случайную соль родителя.
+
+    :return: номера строк каждого владельца по возрастанию.
+    """
+    rows = _SHARED[token][0]
+    get_key = tuple_getter(group_keys)
+    parts = [array("q") for _ in range(owners)]
+    for pos in range(start, stop):
+        parts[hash(get_key(rows[pos])) % owners].append(pos)
+    return parts
+
+
+def _accumulate(
+    token: int,
+    group_keys: List[str],
+    aggregations: Dict[Any, Union[str, List[str]]],
+    positions: Iterable[int],
+) -> Tuple[Dict[Key, list], List[int]]:
+    """
+    Накопители групп по строкам с номерами positions, как в цикле
+    hash_aggregate().
+
+    :return: (ключ группы -> накопители, номер первой строки каждой
+        группы в порядке первого появления)
+    """
+    rows = _SHARED[token][0]
+    _, factories, slots = compile_aggregations(aggregations)
+    plain, combined = split_slots(slots)
+    get_key = tuple_getter(group_keys)
+    groups = {}
+    firsts = []
+    for pos in positions:
+        item = rows[pos]
+        key = get_key(item)
+        state = groups.get(key)
+        if state is None:
+            state = groups[key] = [factory() for factory in factories]
+            firsts.append(pos)
+        for field, indexes in plain:
+            value = item.get(field, 0)
+            for index in indexes:
+                state[index].update(value)
+        for read, indexes in combined:
+            value = read(item)
+            for index in indexes:
+                state[index].update(value)
+    return groups, firsts
+
+
+def aggregate_owned(
+    token: int,
+    group_keys: List[str],
+    aggregations: Dict[Any, Union[str, List[str]]],
+    positions: array,
+) -> Owned:
+    """
+    Агрегирует группы владельца (каждая группа целиком здесь).
+
+    :return: [(номер первой строки, ключ, строка результата)] в порядке
+        первого появления.
+    """
+    names = compile_aggregations(aggregations)[0]
+    groups, firsts = _accumulate(token, group_keys, aggregations, positions)
+    result = []
+    for pos, (key, states) in zip(firsts, groups.items()):
+        row = dict(zip(group_keys, key))
+        for name, acc in zip(names, states):
+            row[name] = acc.finalize()
+        result.append((pos, key, row))
+    return result
+
+
+def group_by_owned(
+    token: int,
+    group_keys: List[str],
+    sum_fields: Union[List[str], None],
+    positions: array,
+) -> Owned:
+    """Группировка строк владельца, результат как у aggregate_owned()."""
+    rows = _SHARED[token][0]
+    fields = list(enumerate(sum_fields or []))
+    width = len(fields)
+    get_key = tuple_getter(group_keys)
+    groups = {}
+    firsts = []
+    for pos in positions:
+        item = rows[pos]
+        key = get_key(item)
+        totals = groups.get(key)
+        if totals is None:
+            totals = groups[key] = [0] * width
+            firsts.append(pos)
+        for index, field in fields:
+            totals[index] += item.get(field, 0)
+
+    result = []
+    for pos, (key, totals) in zip(firsts, groups.items()):
+        row = dict(zip(group_keys, key))
+        for index, field in fields:
+            row[field] = totals[index]
+        result.append((pos, key, row))
+    return result
+
+
+def aggregate_range(
+    token: int,
+    aggregations: Dict[Any, Union[str, List[str]]],
+    start: int,
+    stop: int,
+) -> List[Any]:
+    """Накопители одной группы по отрезку строк (без группировки)."""
+    groups, _ = _accumulate(token, [], aggregations, range(start, stop))
+    return groups[()]
+
+
+def _grouped(
+    pool: Executor,
+    token: int,
+    size: int,
+    group_keys: List[str],
+    function,
+    argument: Any,
+    workers: int,
+    order: Union[str, None],
+) -> List[Row]:
+    """
+    Двухшаговая группировка: раскладка отрезков по владельцам, затем
+    function(token, group_keys, argument, номера строк) у владельцев.
+    """
+    routed = [
+        pool.submit(route_range, token, group_keys, workers, start, stop)
+        for start, stop in ranges(size, workers)
+    ]
+    owned = [array("q") for _ in range(workers)]
+    # Отрезки идут по порядку, поэтому номера владельца возрастают
+    for future in routed:
+        for positions, part in zip(owned, future.result()):
+            positions.extend(part)
+
+    futures = [
+        pool.submit(function, token, group_keys, argument, positions)
+        for positions in owned
+        if positions
+    ]
+    parts = [future.result() for future in futures]
+    # Группы владельцев не пересекаются; порядок первого появления —
+    # слияние по номеру первой строки
+    groups = {
+        key: row for _, key, row in heapq.merge(*parts, key=itemgetter(0))
+    }
+    return [groups[key] for key in ordered_groups(groups, order)]
+
+
+def parallel_aggregate(
+    rows: Iterable[Row],
+    group_keys: Union[List[str], None],
+    aggregations: Dict[str, Union[str, List[str]]],
+    workers: int,
+    order: Union[str, None] = "sorted",
+) -> List[Row]:
+    """
+    Агрегация с теми же результатами, что и hash_aggregate().
+
+    :param workers: число процессов.
+    :param order: порядок групп, см. ordered_groups().
+    :return: список словарей, группы упорядочены как в distinct().
+    """
+    names, factories, _ = compile_aggregations(aggregations)
+    rows = rows if isinstance(rows, Sequence) else list(rows)
+    if not can_share():
+        return hash_aggregate(rows, group_keys, aggregations, None, order)
+
+    with shared_pool(workers, rows) as (pool, token):
+        if group_keys is not None:
+            return _grouped(
+                pool,
+                token,
+                len(rows),
+                group_keys,
+                aggregate_owned,
+                aggregations,
+                workers,
+                order,
+            )
+        futures = [
+            pool.submit(aggregate_range, token, aggregations, start, stop)
+            for start, stop in ranges(len(rows), workers)
+        ]
+        total = [factory() for factory in factories]
+        for future in futures:
+            for acc, other in zip(total, future.result()):
+                acc.merge(other)
+
+    return [{name: acc.finalize() for name, acc in zip(names, total)}]
+
+
+def parallel_group_by(
+    rows: Iterable[Row],
+    group_keys: List[str],
+    sum_fields: Union[List[str], None],
+    workers: int,
+    order: Union[str, None] = "sorted",
+) -> List[Row]:
+    """
+    Группировка с теми же результатами, что и hash_group_by().
+
+    :param workers: число процессов.
+    :param order: порядок групп, см. ordered_groups().
+    :return: список словарей, группы упорядочены как в distinct().
+    """
+    rows = rows if isinstance(rows, Sequence) else list(rows)
+    if not can_share():
+        return hash_group_by(rows, group_keys, sum_fields, None, order)
+
+    with shared_pool(workers, rows) as (pool, token):
+        return _grouped(
+            pool,
+            token,
+            len(rows),
+            group_keys,
+            group_by_owned,
+            sum_fields,
+            workers,
+            order,
+        )
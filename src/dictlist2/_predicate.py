@@ -0,0 +1,245 @@
+"""
+Условия фильтрации для DictList2.filter().
+
+Значение в where сравнивается на равенство, а словарь из операторов
+задаёт проверку поля:
+
+    {"ts": {"between": (a, b)}}         a <= ts <= b
+    {"ts": {">=": a, "<": b}}           a <= ts < b
+    {"role": {"in": ["Admin", "User"]}} принадлежность набору
+    {"role": {"not in": ["Guest"]}}
+    {"role": {"!=": "Guest"}}           (и "==")
+    {"closed": {"is None": True}}       None или поле отсутствует
+    {"name": {"startswith": "A"}}       только для строк
+
+Условия на разные поля объединяются через «и». Логические операции
+задаются ключами "and", "or" (список условий) и "not" (одно условие):
+
+    {"or": [{"role": "Admin"}, {"hours": {">": 8}}], "not": {"id": 1}}
+
+Значения None и отсутствующие поля не удовлетворяют сравнениям
+">", ">=", "<", "<=" и "between".
+
+Условие компилируется один раз в функцию Python: поля и значения
+становятся константами функции, поэтому при проверке строки словарь
+условия не разбирается. Для строк со схемой (Record) поля читаются
+из кортежа значений по номеру.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+Row = Dict[str, Any]
+Where = Union[Dict[str, Any], Iterable[Tuple[str, Any]]]
+
+RANGE_OPERATORS = (">", ">=", "<", "<=", "between")
+
+# Шаблоны проверок: {X} — первое обращение к значению (с присваиванием),
+# {x} — последующие, {c} — константа условия
+TEMPLATES = {
+    "==": "{X} == {c}",
+    "!=": "{X} != {c}",
+    ">": "{X} is not None and {x} > {c}",
+    ">=": "{X} is not None and {x} >= {c}",
+    "<": "{X} is not None and {x} < {c}",
+    "<=": "{X} is not None and {x} <= {c}",
+    "in": "{X} in {c}",
+    "not in": "{X} not in {c}",
+    "startswith": "isinstance({X}, str) and {x}.startswith({c})",
+}
+
+OPERATORS = set(TEMPLATES) | {"between", "is None"}
+
+
+def is_operator(value: Any) -> bool:
+    """Является ли значение условия словарём операторов."""
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(op in OPERATORS for op in value)
+    )
+
+
+def is_logical(field: Any, value: Any) -> bool:
+    """Является ли пара (ключ, значение) логической операцией."""
+    if field in ("and", "or"):
+        return isinstance(value, (list, tuple))
+    return field == "not" and isinstance(value, dict)
+
+
+def _members(values: Iterable[Any]) -> Union[frozenset, tuple]:
+    """Набор для оператора in: frozenset, если значения хэшируемые."""
+    values = tuple(values)
+    try:
+        return frozenset(values)
+    except TypeError:
+        return values
+
+
+class _Compiler:
+    """Собирает исходный текст функции проверки и её константы."""
+
+    def __init__(self, index: Union[Dict[str, int], None] = None):
+        self.namespace = {}
+        self.index = index
+
+    def const(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def variable(self) -> str:
+        name = f"_x{len(self.namespace)}"
+        self.namespace[name] = None
+        return name
+
+    def value(self, field: Any) -> str:
+        """Чтение поля: по номеру в строке схемы или через get()."""
+        if self.index is not None and field in self.index:
+            return f"item._values[{self.index[field]}]"
+        return f"item.get({self.const(field)})"
+
+    def where(self, where: Where) -> str:
+        items = where.items() if isinstance(where, dict) else where
+        parts = []
+        for field, value in items:
+            if is_logical(field, value):
+                if field == "not":
+                    parts.append(f"not ({self.where(value)})")
+                else:
+                    branches = [f"({self.where(w)})" for w in value]
+                    empty = "True" if field == "and" else "False"
+                    joined = f" {field} ".join(branches) or empty
+                    parts.append(f"({joined})")
+            elif is_operator(value):
+                source = self.value(field)
+                parts.append(self.operators(source, value, assign=True))
+            else:
+                source = self.value(field)
+                parts.append(f"{source} == {self.const(value)}")
+        return " and ".join(parts) or "True"
+
+    def operators(
+        self, source: str, operators: Dict[str, Any], assign: bool
+    ) -> str:
+        """Проверки одного значения; source вычисляется один раз."""
+        if assign:
+            x = self.variable()
+            first = f"({x} := {source})"
+        else:
+            x = first = source
+        tests = []
+        for op, value in operators.items():
+            X = first if not tests else x
+            if op == "between":
+                low, high = value
+                tests.append(
+                    f"{X} is not None and "
+                    f"{self.const(low)} <= {x} <= {self.const(high)}"
+                )
+            elif op == "is None":
+                tests.append(f"{X} is None" if value else f"{X} is not None")
+            else:
+                if op in ("in", "not in"):
+                    value = _members(value)
+                elif op == "startswith" and isinstance(value, list):
+                    value = tuple(value)
+                tests.append(
+                    TEMPLATES[op].format(X=X, x=x, c=self.const(value))
+                )
+        return "(" + ") and (".join(tests) + ")"
+
+    def build(self, name: str, argument: str, body: str) -> Callable:
+        source = f"def {name}({argument}):\n    return {body}\n"
+        exec(source, self.namespace)
+        return self.namespace[name]
+
+
+def compile_where(
+    where: Where, index: Union[Dict[str, int], None] = None
+) -> Callable[[Row], bool]:
+    """
+    Функция проверки строки по условиям where (словарь или пары).
+
+    :param index: поле -> номер значения для строк схемы (Record);
+        такие поля читаются из кортежа значений по номеру.
+    """
+    compiler = _Compiler(index)
+    return compiler.build("predicate", "item", compiler.where(where))
+
+
+def value_test(operators: Dict[str, Any]) -> Callable[[Any], bool]:
+    """Функция проверки одного значения по словарю операторов."""
+    compiler = _Compiler()
+    body = compiler.operators("value", operators, assign=False)
+    return compiler.build("test", "value", body)
+
+
+def range_bounds(
+    condition: Dict[str, Any],
+) -> Tuple[Any, bool, Any, bool]:
+    """
+    Границы диапазона (нижняя, включительно, верхняя, включительно).
+
+    Отсутствующая граница — None. При нескольких нижних (верхних)
+    границах берётся самая строгая; прочие операторы не учитываются.
+    """
+    low, low_inclusive, high, high_inclusive = None, True, None, True
+
+    def raise_low(value, inclusive):
+        nonlocal low, low_inclusive
+        if low is None or value > low or (value == low and not inclusive):
+            low, low_inclusive = value, inclusive
+
+    def lower_high(value, inclusive):
+        nonlocal high, high_inclusive
+        if high is None or value < high or (value == high and not inclusive):
+            high, high_inclusive = value, inclusive
+
+    for op, value in condition.items():
+        if op == "between":
+            raise_low(value[0], True)
+            lower_high(value[1], True)
+        elif op == ">":
+            raise_low(value, False)
+        elif op == ">=":
+            raise_low(value, True)
+        elif op == "<":
+            lower_high(value, False)
+        elif op == "<=":
+            lower_high(value, True)
+    return low, low_inclusive, high, high_inclusive
+
+
+def split_where(
+    where: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Условия верхнего уровня, пригодные для индексов.
+
+    :return: (равенства {поле: значение}, диапазоны {поле: операторы});
+        логические операции и прочие операторы не включаются.
+    """
+    equal = {}
+    ranges = {}
+    for field, value in where.items():
+        if is_logical(field, value):
+            continue
+        if is_operator(value):
+            if any(op in RANGE_OPERATORS for op in value):
+                ranges[field] = value
+        else:
+            equal[field] = value
+    return equal, ranges
+
+
+def fields_of(where: Where) -> List[Any]:
+    """Все поля, упомянутые в условии (включая вложенные)."""
+    items = where.items() if isinstance(where, dict) else where
+    fields = []
+    for field, value in items:
+        if is_logical(field, value):
+            for nested in [value] if field == "not" else value:
+                fields.extend(fields_of(nested))
+        else:
+            fields.append(field)
+    return fields
@@ -0,0 +1,230 @@
+"""
+Ленивый конвейер запросов к DictList2.
+
+Query только записывает логический план (список шагов). Данные
+читаются при collect() или итерации: перед выполнением план
+оптимизируется, а построчные шаги (where, select) сливаются в один
+проход по данным без промежуточных списков.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from ._aggregate import hash_aggregate
+from ._join import probe_join
+from ._predicate import compile_where, fields_of
+
+Row = Dict[str, Any]
+Step = Tuple[Any, ...]
+
+# Шаги, которые обрабатывают строки по одной и сливаются в один проход
+ROW_STEPS = ("where", "select")
+
+
+def _fields(value: Union[str, List[str], None]) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    return (value,) if isinstance(value, str) else tuple(value)
+
+
+def _condition_fields(step: Step) -> set:
+    return set(fields_of(step[1]))
+
+
+def _can_push(where: Step, step: Step) -> bool:
+    """Можно ли выполнить фильтр where раньше шага step."""
+    kind = step[0]
+    if kind == "sort":
+        # Сортировка не меняет строк, фильтр с ней перестановочен
+        return True
+    if kind == "select":
+        # Фильтр только по оставленным полям
+        return _condition_fields(where) <= set(step[1])
+    if kind == "join":
+        # Фильтр только по полям ключа: значение ключа у совпавших
+        # строк одинаково слева и справа
+        return _condition_fields(where) <= set(_fields(step[2]))
+    return False
+
+
+def optimize(steps: Iterable[Step]) -> List[Step]:
+    """
+    Оптимизирует логический план.
+
+    - фильтры опускаются ниже sort, select (по оставленным полям)
+      и join (по полям ключа — тогда фильтр применяется и к правому
+      входу ещё до построения индекса);
+    - соседние фильтры объединяются в один.
+    """
+    plan = list(steps)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(1, len(plan)):
+            step, prev = plan[i], plan[i - 1]
+            if step[0] == "where" and prev[0] == "where":
+                plan[i - 1] = ("where", prev[1] + step[1])
+                del plan[i]
+                changed = True
+                break
+            if step[0] == "where" and _can_push(step, prev):
+                if prev[0] == "join":
+                    prev = prev[:4] + (prev[4] + step[1],)
+                plan[i - 1], plan[i] = step, prev
+                changed = True
+                break
+    return plan
+
+
+def _scan(rows: Iterable[Row], ops: List[Step]) -> Iterator[Row]:
+    """Один проход, выполняющий подряд идущие where/select."""
+    compiled = [
+        (op[0], compile_where(op[1]) if op[0] == "where" else op[1])
+        for op in ops
+    ]
+    for item in rows:
+        for kind, arg in compiled:
+            if kind == "where":
+                if not arg(item):
+                    break
+            else:
+                item = {k: item.get(k) for k in arg}
+        else:
+            yield item
+
+
+def _blocking(rows: Iterable[Row], step: Step) -> Iterable[Row]:
+    from . import DictList2
+
+    kind = step[0]
+    if kind == "sort":
+        return DictList2(rows).sort(by=step[1], reverse=step[2])
+    if kind == "distinct":
+        return DictList2(rows).distinct(by=step[1])
+    if kind == "join":
+        _, right, key, how, conditions = step
+        if conditions:
+            matches = compile_where(conditions)
+            right = [item for item in right if matches(item)]
+        return probe_join(rows, right, key, how)
+    if kind == "group":
+        keys = step[1]
+        keys = [keys] if isinstance(keys, str) else keys
+        return hash_aggregate(rows, keys, step[2] or {})
+    raise ValueError(f"Unknown query step: {kind}")
+
+
+def execute(source: Iterable[Row], steps: List[Step]) -> Iterator[Row]:
+    """Выполняет оптимизированный план, начиная с первой итерации."""
+    rows = iter(source)
+    run = []
+    for step in steps:
+        if step[0] in ROW_STEPS:
+            run.append(step)
+            continue
+        if run:
+            rows = _scan(rows, run)
+            run = []
+        rows = _blocking(rows, step)
+    if run:
+        rows = _scan(rows, run)
+    yield from rows
+
+
+def _describe(step: Step) -> str:
+    kind = step[0]
+    if kind == "where":
+        return "where(" + ", ".join(f"{k}={v!r}" for k, v in step[1]) + ")"
+    if kind == "select":
+        return "select(" + ", ".join(step[1]) + ")"
+    if kind == "sort":
+        return f"sort(by={step[1]!r}, reverse={step[2]})"
+    if kind == "distinct":
+        return f"distinct(by={step[1]!r})"
+    if kind == "join":
+        text = f"join(key={step[2]!r}, how={step[3]!r}"
+        if step[4]:
+            text += ", right " + _describe(("where", step[4]))
+        return text + ")"
+    return f"group(by={step[1]!r}, aggregations={step[2]!r})"
+
+
+class Query:
+    """
+    Ленивый запрос к списку словарей.
+
+    Каждый метод возвращает новый Query с добавленным шагом; исходные
+    данные не читаются до вызова collect() или итерации.
+
+    >>> data.query().where({"role": "User"}).join(
+    ...     roles, key="id").group("project", {"hours": "sum"}).collect()
+    """
+
+    def __init__(self, source: Iterable[Row], steps: Tuple[Step, ...] = ()):
+        self._source = source
+        self._steps = tuple(steps)
+
+    def _add(self, *step: Any) -> "Query":
+        return Query(self._source, self._steps + (step,))
+
+    def where(self, where: Dict[str, Any]) -> "Query":
+        """Фильтр с условиями и операторами, как filter()."""
+        return self._add("where", tuple(where.items()))
+
+    def select(self, fields: Union[str, List[str]]) -> "Query":
+        """Оставляет только указанные поля (отсутствующие — None)."""
+        return self._add("select", _fields(fields))
+
+    def sort(
+        self, by: Union[str, List[str], None] = None, reverse: bool = False
+    ) -> "Query":
+        """Сортировка, как DictList2.sort()."""
+        return self._add("sort", by, reverse)
+
+    def distinct(self, by: Union[str, List[str], None] = None) -> "Query":
+        """Уникальные значения, как DictList2.distinct()."""
+        return self._add("distinct", by)
+
+    def join(
+        self,
+        right: List[Row],
+        key: Union[str, List[str]],
+        how: str = "inner",
+    ) -> "Query":
+        """Хэш-соединение ("inner" или "left") с индексом по right."""
+        if how not in ("inner", "left"):
+            raise ValueError(f"Unknown join type: {how}")
+        return self._add("join", right, key, how, ())
+
+    def group(
+        self,
+        group_columns: Union[str, List[str], None] = None,
+        aggregations: Dict[str, Union[str, List[str]]] = None,
+    ) -> "Query":
+        """Группировка с агрегатами, как DictList2.aggregate()."""
+        return self._add("group", group_columns, aggregations)
+
+    def explain(self) -> List[str]:
+        """
+        Оптимизированный план: по строке на каждый проход по данным.
+
+        Построчные шаги, выполняемые в одном проходе, соединены " + ".
+        """
+        lines = []
+        run = ["scan"]
+        for step in optimize(self._steps):
+            if step[0] in ROW_STEPS:
+                run.append(_describe(step))
+                continue
+            lines.append(" + ".join(run))
+            run = [_describe(step)]
+        lines.append(" + ".join(run))
+        return lines
+
+    def __iter__(self) -> Iterator[Row]:
+        return execute(self._source, optimize(self._steps))
+
+    def collect(self):
+        """Выполняет запрос и возвращает DictList2."""
+        from . import DictList2
+
+        return DictList2(self)
@@ -0,0 +1,131 @@
+"""
+Компактное представление строк с общей схемой.
+
+Строка-словарь хранит собственную хэш-таблицу с одними и теми же
+именами полей. Record хранит только кортеж значений, а соответствие
+поле -> номер общее для всех строк схемы (атрибут класса). Record —
+неизменяемое отображение: row["x"], row.get("x"), in, items() и
+сравнение со словарями работают как у dict.
+
+Отсутствующее в строке поле хранится как None и отмечается в _absent,
+поэтому row["x"] для него вызывает KeyError, а row.get("x") — None.
+"""
+
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Tuple, Union
+
+
+class Record(Mapping):
+    """
+    Строка схемы: кортеж значений и общий индекс полей.
+
+    :ivar _values: значения полей в порядке схемы.
+    :ivar _absent: номера отсутствующих полей или None, если есть все.
+    """
+
+    __slots__ = ("_values", "_absent")
+
+    _fields: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    def __init__(
+        self,
+        values: Tuple[Any, ...],
+        absent: Union[FrozenSet[int], None] = None,
+    ):
+        self._values = values
+        self._absent = absent
+
+    def __getitem__(self, key: str) -> Any:
+        index = self._index.get(key)
+        if index is None or (
+            self._absent is not None and index in self._absent
+        ):
+            raise KeyError(key)
+        return self._values[index]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._index.get(key)
+        if index is None or (
+            self._absent is not None and index in self._absent
+        ):
+            return default
+        return self._values[index]
+
+    def __contains__(self, key: Any) -> bool:
+        index = self._index.get(key)
+        return index is not None and (
+            self._absent is None or index not in self._absent
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        if self._absent is None:
+            return iter(self._fields)
+        absent = self._absent
+        return (f for i, f in enumerate(self._fields) if i not in absent)
+
+    def __len__(self) -> int:
+        return len(self._fields) - len(self._absent or ())
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __reduce__(self):
+        return record, (self._fields, self._values, self._absent)
+
+
+class Schema:
+    """
+    Схема строк: поля, индекс поле -> номер и класс Record.
+
+    Схемы с одинаковым набором полей общие (schema_for()).
+    """
+
+    __slots__ = ("fields", "index", "record")
+
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        self.index = {field: pos for pos, field in enumerate(fields)}
+        self.record = type(
+            "Record",
+            (Record,),
+            {"__slots__": (), "_fields": fields, "_index": self.index},
+        )
+
+    def pack(self, row: Mapping) -> Record:
+        """Упаковывает словарь в Record; лишние поля — ValueError."""
+        values = tuple(row.get(field) for field in self.fields)
+        absent = None
+        present = len(self.fields)
+        if len(row) != present or any(f not in row for f in self.fields):
+            absent = frozenset(
+                pos
+                for pos, field in enumerate(self.fields)
+                if field not in row
+            )
+            present -= len(absent)
+            if len(row) != present:
+                extra = [field for field in row if field not in self.index]
+                raise ValueError(f"Fields not in schema: {extra}")
+        return self.record(values, absent)
+
+
+@lru_cache(maxsize=None)
+def schema_for(fields: Tuple[str, ...]) -> Schema:
+    """Общая схема для набора полей."""
+    return Schema(fields)
+
+
+def record(
+    fields: Tuple[str, ...],
+    values: Tuple[Any, ...],
+    absent: Union[FrozenSet[int], None] = None,
+) -> Record:
+    """Восстанавливает Record (используется pickle)."""
+    return schema_for(fields).record(values, absent)
+
+
+def infer_fields(rows: Iterable[Mapping]) -> Tuple[str, ...]:
+    """Все поля строк в порядке первого появления."""
+    return tuple(dict.fromkeys(field for row in rows for field in row))
@@ -0,0 +1,261 @@
+"""
+Приближённые накопители с ограниченной памятью на группу.
+
+- HyperLogLogAccumulator — число различных значений (HyperLogLog,
+  4096 регистров, стандартная ошибка около 1.6 %). Пока различных хэшей
+  не больше SPARSE, они хранятся множеством и счёт точный.
+- TDigestAccumulator — квантиль (merging t-digest, сжатие COMPRESSION).
+  Пока значений не больше BUFFER, квантиль точный и совпадает с
+  линейной интерполяцией numpy.quantile.
+
+Оба накопителя объединяются методом merge() (параллельная агрегация,
+выгрузка на диск). Хэш значения не зависит от процесса (hash() строк
+в каждом процессе свой), поэтому регистры разных процессов совместимы.
+Результат HyperLogLog не зависит от порядка строк и разбиения на
+части; результат t-digest от разбиения может незначительно меняться.
+"""
+
+import math
+from hashlib import blake2b
+from typing import Any, List, Tuple
+
+MASK = (1 << 64) - 1
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+# Точный режим HyperLogLog: столько различных хэшей хранится множеством
+SPARSE = 64
+
+COMPRESSION = 100
+BUFFER = 5 * COMPRESSION
+
+
+def _zero(value: Any) -> Any:
+    return 0 if value is None else value
+
+
+def mix64(value: int) -> int:
+    """Перемешивание splitmix64 (тот же хэш считает ядро NumPy)."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+
+def hash64(value: Any) -> int:
+    """64-битный хэш значения, одинаковый во всех процессах."""
+    if isinstance(value, float) and value.is_integer():
+        # 1.0 == 1: равные числа дают равный хэш
+        value = int(value)
+    if isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+        return mix64(value & MASK)
+    data = repr(value).encode("utf-8", "surrogatepass")
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+
+
+def hll_estimate(registers: bytes) -> float:
+    """Оценка HyperLogLog по регистрам (линейный счёт для малых)."""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / sum(2.0**-r for r in registers)
+    zeros = registers.count(0)
+    if estimate <= 2.5 * m and zeros:
+        return m * math.log(m / zeros)
+    return estimate
+
+
+class HyperLogLogAccumulator:
+    """Приближённое число различных значений (None считается нулём)."""
+
+    __slots__ = ("hashes", "registers")
+
+    def __init__(self):
+        self.hashes = set()
+        self.registers = None
+
+    def update(self, value: Any) -> None:
+        self.add_hash(hash64(_zero(value)))
+
+    def add_hash(self, code: int) -> None:
+        """Добавляет уже посчитанный hash64() значения."""
+        if self.registers is None:
+            self.hashes.add(code)
+            if len(self.hashes) > SPARSE:
+                self._densify()
+            return
+        index = code >> (64 - PRECISION)
+        rank = 65 - PRECISION - (code & (MASK >> PRECISION)).bit_length()
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def _densify(self) -> None:
+        hashes = self.hashes
+        self.hashes = None
+        self.registers = bytearray(REGISTERS)
+        for code in hashes:
+            self.add_hash(code)
+
+    def merge(self, other: "HyperLogLogAccumulator") -> None:
+        if other.registers is None:
+            for code in other.hashes:
+                self.add_hash(code)
+            return
+        if self.registers is None:
+            self._densify()
+        registers = self.registers
+        for index, rank in enumerate(other.registers):
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def finalize(self) -> Any:
+        if self.registers is None:
+            return len(self.hashes)
+        return round(hll_estimate(self.registers))
+
+
+def _k(q: float) -> float:
+    """Шкала t-digest k1: мелкие центроиды у краёв распределения."""
+    return COMPRESSION / (2 * math.pi) * math.asin(2 * q - 1)
+
+
+def compress(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Сливает соседние точки (среднее, вес), пока позволяет шкала k1."""
+    points.sort(key=lambda point: point[0])
+    total = sum(weight for _, weight in points)
+    result = []
+    mean, weight = points[0]
+    done = 0.0
+    k_left = _k(0.0)
+    for value, count in points[1:]:
+        q = (done + weight + count) / total
+        if _k(min(q, 1.0)) - k_left <= 1:
+            weight += count
+            mean += (value - mean) * count / weight
+        else:
+            result.append((mean, weight))
+            done += weight
+            k_left = _k(done / total)
+            mean, weight = value, count
+    result.append((mean, weight))
+    return result
+
+
+class TDigestAccumulator:
+    """
+    Приближённый квантиль q (None считается нулём).
+
+    :ivar centroids: сжатые точки (среднее, вес), по возрастанию.
+    :ivar buffer: значения, ещё не вошедшие в центроиды.
+    """
+
+    __slots__ = ("q", "centroids", "buffer", "low", "high")
+
+    def __init__(self, q: float = 0.5):
+        self.q = q
+        self.centroids = []
+        self.buffer = []
+        self.low = None
+        self.high = None
+
+    def update(self, value: Any) -> None:
+        value = _zero(value)
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+        self.buffer.append(value)
+        if len(self.buffer) >= BUFFER:
+            self._compress()
+
+    def _compress(self) -> None:
+        points = self.centroids + [(value, 1) for value in self.buffer]
+        self.centroids = compress(points)
+        self.buffer = []
+
+    def merge(self, other: "TDigestAccumulator") -> None:
+        if other.low is None:
+            return
+        if self.low is None:
+            # Пустой накопитель принимает состояние целиком: группа,
+            # посчитанная в другом процессе, не сжимается повторно
+            self.centroids = list(other.centroids)
+            self.buffer = list(other.buffer)
+            self.low, self.high = other.low, other.high
+            return
+        if other.low < self.low:
+            self.low = other.low
+        if other.high > self.high:
+            self.high = other.high
+        if not other.centroids and not self.centroids:
+            self.buffer.extend(other.buffer)
+            if len(self.buffer) >= BUFFER:
+                self._compress()
+            return
+        points = self.centroids + other.centroids
+        points.extend((value, 1) for value in self.buffer + other.buffer)
+        self.centroids = compress(points)
+        self.buffer = []
+
+    def finalize(self) -> Any:
+        if self.low is None:
+            return 0
+        if not self.centroids:
+            # Мало значений: точный квантиль
+            return exact_quantile(sorted(self.buffer), self.q)
+        if self.buffer:
+            self._compress()
+        return centroid_quantile(self.centroids, self.q, self.low, self.high)
+
+
+def exact_quantile(values: List[Any], q: float) -> float:
+    """Квантиль отсортированных значений с линейной интерполяцией."""
+    position = q * (len(values) - 1)
+    index = int(position)
+    if index + 1 >= len(values):
+        return float(values[-1])
+    fraction = position - index
+    return values[index] + (values[index + 1] - values[index]) * fraction
+
+
+def centroid_quantile(
+    centroids: List[Tuple[float, float]], q: float, low: Any, high: Any
+) -> float:
+    """
+    Квантиль по центроидам: центр центроида стоит на середине его веса,
+    между центрами — линейная интерполяция, у краёв — до min и max.
+    """
+    total = sum(weight for _, weight in centroids)
+    # Для центроидов веса 1 совпадает с exact_quantile()
+    target = q * (total - 1) + 0.5
+    previous_mean, previous_center = low, 0.0
+    done = 0.0
+    for mean, weight in centroids:
+        center = done + weight / 2
+        if target <= center:
+            if center == previous_center:
+                return float(mean)
+            fraction = (target - previous_center) / (center - previous_center)
+            return previous_mean + (mean - previous_mean) * fraction
+        previous_mean, previous_center = mean, center
+        done += weight
+    if total == previous_center:
+        return float(high)
+    fraction = (target - previous_center) / (total - previous_center)
+    return previous_mean + (high - previous_mean) * min(fraction, 1.0)
+
+
+class MedianAccumulator(TDigestAccumulator):
+    """Приближённая медиана."""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(0.5)
+
+
+class P95Accumulator(TDigestAccumulator):
+    """Приближённый 95-й перцентиль."""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(0.95)
@@ -0,0 +1,270 @@
+"""
+Хэш-агрегация с выгрузкой на диск (grace hash) для большого числа групп.
+
+Пока число групп не превышает max_groups, строки агрегируются в памяти,
+как в hash_aggregate(). При переполнении накопленные состояния групп и
+все последующие строки раскладываются по хэшу ключа во временные файлы
+(секции). Затем секции по очереди агрегируются отдельно, при
+необходимости с повторным разбиением, и отсортированный результат
+каждой записывается на диск. Результаты секций сливаются потоком в
+порядке distinct() или первого появления группы; без требований к
+порядку (order=None) секции выводятся одна за другой.
+
+Состояния групп попадают в секцию раньше их строк, а строки — в исходном
+порядке, поэтому результат совпадает с агрегацией в памяти точно.
+"""
+
+import heapq
+import pickle
+import tempfile
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from ._aggregate import (
+    TotalAccumulator,
+    compile_aggregations,
+    group_sort_key,
+    value_reader,
+)
+from ._keys import tuple_getter
+
+Row = Dict[str, Any]
+Key = Tuple[Any, ...]
+# (ключ группы, номер первой строки, состояние накопителей или None,
+#  значения полей строки или None)
+Record = Tuple[Key, int, Union[list, None], Union[tuple, None]]
+
+# Число секций при разбиении: на каждом уровне секция выбирается по
+# следующим 4 битам хэша ключа; когда биты хэша кончаются, секция
+# агрегируется в памяти (ключи с одинаковым хэшем не разделить)
+FANOUT = 16
+BITS = 4
+LEVELS = 64 // BITS
+
+
+def _partition(key: Key, level: int) -> int:
+    return (hash(key) >> (BITS * level)) % FANOUT
+
+
+def check_max_groups(max_groups: Union[int, None]) -> None:
+    """Проверяет бюджет памяти в группах (None — без ограничения)."""
+    if max_groups is None:
+        return
+    if isinstance(max_groups, bool) or not isinstance(max_groups, int):
+        raise ValueError(
+            f"max_groups must be a positive integer: {max_groups!r}"
+        )
+    if max_groups < 1:
+        raise ValueError(
+            f"max_groups must be a positive integer: {max_groups!r}"
+        )
+
+
+def _write(file, record: Record) -> None:
+    pickle.dump(record, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read(file) -> Iterator[Record]:
+    file.seek(0)
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
+
+
+class _Plan:
+    """Накопители и поля агрегации, общие для всех секций."""
+
+    def __init__(
+        self,
+        factories: List[Callable[[], Any]],
+        slots: List[Tuple[str, List[int]]],
+        max_groups: int,
+        directory: Union[str, None],
+        order: Union[str, None] = "sorted",
+    ):
+        self.factories = factories
+        self.slots = [indexes for _, indexes in slots]
+        self.max_groups = max_groups
+        self.directory = directory
+        self.order = order
+
+    def _order_key(self, key: Key, first: int) -> Any:
+        if self.order == "sorted":
+            return group_sort_key(key), first
+        return first
+
+    def aggregate(
+        self, records: Iterable[Record], level: int
+    ) -> Iterator[Tuple[Tuple[Any, ...], Key, list]]:
+        """
+        Агрегирует записи; при переполнении — через секции на диске.
+
+        :yield: (ключ порядка, ключ группы, накопители) в порядке
+            self.order; равные ключи порядка — по первой строке группы.
+        """
+        groups = {}
+        files = None
+        runs = []
+        try:
+            for record in records:
+                key, first, states, values = record
+                entry = groups.get(key)
+                if entry is None:
+                    if (
+                        files is None
+                        and len(groups) >= self.max_groups
+                        and level < LEVELS
+                    ):
+                        files = self._spill(groups, level)
+                        groups = {}
+                    if files is not None:
+                        _write(files[_partition(key, level)], record)
+                        continue
+                    entry = groups[key] = [
+                        first,
+                        [factory() for factory in self.factories],
+                    ]
+                self._apply(entry[1], states, values)
+
+            if files is None:
+                entries = (
+                    (self._order_key(key, entry[0]), key, entry[1])
+                    for key, entry in groups.items()
+                )
+                if self.order is None:
+                    yield from entries
+                else:
+                    yield from sorted(entries, key=itemgetter(0))
+                return
+
+            # Секции агрегируются по очереди, в памяти — одна секция;
+            # отсортированный результат каждой сбрасывается на диск
+            for file in files:
+                run = tempfile.TemporaryFile(dir=self.directory)
+                runs.append(run)
+                for entry in self.aggregate(_read(file), level + 1):
+                    _write(run, entry)
+                file.close()
+            streams = [_read(run) for run in runs]
+            if self.order is None:
+                yield from chain(*streams)
+            else:
+                yield from heapq.merge(*streams, key=itemgetter(0))
+        finally:
+            for file in (files or []) + runs:
+                file.close()
+
+    def _apply(
+        self,
+        accumulators: list,
+        states: Union[list, None],
+        values: Union[tuple, None],
+    ) -> None:
+        if states is not None:
+            for acc, other in zip(accumulators, states):
+                acc.merge(other)
+            return
+        for value, indexes in zip(values, self.slots):
+            for index in indexes:
+                accumulators[index].update(value)
+
+    def _spill(self, groups: Dict[Key, list], level: int) -> list:
+        """Переносит состояния групп в секции на диске."""
+        files = [
+            tempfile.TemporaryFile(dir=self.directory) for _ in range(FANOUT)
+        ]
+        for key, (first, states) in groups.items():
+            _write(files[_partition(key, level)], (key, first, states, None))
+        return files
+
+
+def _records(
+    rows: Iterable[Row], group_keys: List[str], fields: List[Any]
+) -> Iterator[Record]:
+    get_key = tuple_getter(group_keys)
+    readers = [value_reader(field) for field in fields]
+    for pos, item in enumerate(rows):
+        yield get_key(item), pos, None, tuple(read(item) for read in readers)
+
+
+def _stream(
+    rows: Iterable[Row],
+    group_keys: List[str],
+    names: List[str],
+    factories: List[Callable[[], Any]],
+    slots: List[Tuple[str, List[int]]],
+    max_groups: int,
+    directory: Union[str, None],
+    order: Union[str, None],
+) -> Iterator[Row]:
+    plan = _Plan(factories, slots, max_groups, directory, order)
+    records = _records(rows, group_keys, [field for field, _ in slots])
+    for _, key, accumulators in plan.aggregate(records, level=0):
+        row = dict(zip(group_keys, key))
+        for name, acc in zip(names, accumulators):
+            row[name] = acc.finalize()
+        yield row
+
+
+def spill_aggregate(
+    rows: Iterable[Row],
+    group_keys: List[str],
+    aggregations: Dict[str, Union[str, List[str]]],
+    max_groups: int,
+    directory: Union[str, None] = None,
+    order: Union[str, None] = "sorted",
+) -> Iterator[Row]:
+    """
+    Агрегация с теми же результатами, что и hash_aggregate().
+
+    :param group_keys: непустой список полей группировки.
+    :param max_groups: сколько групп держать в памяти.
+    :param directory: каталог временных файлов (по умолчанию системный).
+    :param order: порядок групп, см. ordered_groups(); при None группы
+        выводятся по секциям.
+    :yield: строки результата в порядке order.
+    """
+    names, factories, slots = compile_aggregations(aggregations)
+    return _stream(
+        rows,
+        group_keys,
+        names,
+        factories,
+        slots,
+        max_groups,
+        directory,
+        order,
+    )
+
+
+def spill_group_by(
+    rows: Iterable[Row],
+    group_keys: List[str],
+    sum_fields: Union[List[str], None],
+    max_groups: int,
+    directory: Union[str, None] = None,
+    order: Union[str, None] = "sorted",
+) -> Iterator[Row]:
+    """
+    Группировка с теми же результатами, что и hash_group_by().
+
+    :param max_groups: сколько групп держать в памяти.
+    :param order: порядок групп, как в spill_aggregate().
+    :yield: строки результата в порядке order.
+    """
+    fields = list(sum_fields or [])
+    slots = [(field, [index]) for index, field in enumerate(fields)]
+    factories = [TotalAccumulator] * len(fields)
+    return _stream(
+        rows,
+        group_keys,
+        fields,
+        factories,
+        slots,
+        max_groups,
+        directory,
+        order,
+    )
@@ -0,0 +1,161 @@
+"""
+Потоковая обработка словарей без загрузки всего входа в память.
+
+DictStream оборачивает любой итерируемый источник (курсор БД, генератор,
+файл JSONL). Построчные операции возвращают новый DictStream и ничего
+не читают; агрегирующие операции читают источник один раз и хранят
+только состояние групп.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from ._aggregate import (
+    check_group_order,
+    distinct_keys,
+    hash_aggregate,
+)
+from ._external import check_max_rows, external_sort
+from ._fingerprint import iter_unique_rows
+from ._join import probe_join
+from ._ordering import single_key
+from ._predicate import compile_where
+from ._spill import check_max_groups, spill_aggregate
+
+Row = Dict[str, Any]
+
+
+class DictStream:
+    """
+    Поток словарей — однопроходный аналог DictList2.
+
+    Источник читается один раз: повторная итерация по тому же потоку
+    ничего не вернёт.
+
+    >>> rows = DictStream.from_jsonl("billing.jsonl")
+    >>> rows.filter({"status": "paid"}).aggregate(
+    ...     "account", {"amount": "sum"})
+    """
+
+    def __init__(self, source: Iterable[Row]):
+        self._source = source
+
+    @classmethod
+    def from_jsonl(cls, path: str, encoding: str = "utf-8") -> "DictStream":
+        """Поток строк файла JSON Lines (пустые строки пропускаются)."""
+
+        def read() -> Iterator[Row]:
+            with open(path, encoding=encoding) as file:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+
+        return cls(read())
+
+    def __iter__(self) -> Iterator[Row]:
+        return iter(self._source)
+
+    def collect(self):
+        """Читает поток целиком и возвращает DictList2."""
+        from . import DictList2
+
+        return DictList2(self)
+
+    def filter(self, where: Dict[str, Any]) -> "DictStream":
+        """Фильтр с условиями и операторами, как DictList2.filter()."""
+        matches = compile_where(where)
+        return DictStream(item for item in self if matches(item))
+
+    def unique(self, digest: bool = False) -> "DictStream":
+        """
+        Исключает дубликаты по всем ключам и значениям, как
+        DictList2.unique() (в том числе строки со списками и словарями).
+
+        В памяти хранятся только отпечатки уже встреченных строк;
+        digest=True — их 64-битные хэши и первые строки.
+        """
+        return DictStream(iter_unique_rows(self, digest))
+
+    def sort(
+        self,
+        by: Union[str, List[str], Dict[str, str], None] = None,
+        reverse: bool = False,
+        max_rows: int = 100_000,
+        nulls: Union[str, None] = None,
+    ) -> "DictStream":
+        """
+        Внешняя сортировка, как DictList2.sort().
+
+        В памяти сортируется не больше max_rows строк; остальные части
+        сбрасываются во временные файлы и сливаются потоком при чтении.
+        """
+        check_max_rows(max_rows)
+        if by is None:
+            return self
+        key, descending = single_key(by, reverse, nulls)
+        return DictStream(external_sort(self, key, descending, max_rows))
+
+    def distinct(
+        self,
+        by: Union[str, List[str], None] = None,
+        order: Union[str, None] = "sorted",
+    ):
+        """Уникальные значения, как DictList2.distinct() (DictList2)."""
+        from . import DictList2
+
+        check_group_order(order)
+        if by is None:
+            return DictList2(self.unique())
+        keys = [by] if isinstance(by, str) else by
+        return DictList2(distinct_keys(self, keys, order))
+
+    def join(
+        self, right: Iterable[Row], key: Union[str, List[str]]
+    ) -> "DictStream":
+        """Внутреннее соединение с правым списком в памяти."""
+        return DictStream(probe_join(self, right, key, how="inner"))
+
+    def left_join(
+        self, right: Iterable[Row], key: Union[str, List[str]]
+    ) -> "DictStream":
+        """Левое соединение с правым списком в памяти."""
+        return DictStream(probe_join(self, right, key, how="left"))
+
+    def aggregate(
+        self,
+        group_columns: Union[str, List[str], None] = None,
+        aggregations: Dict[str, Union[str, List[str]]] = None,
+        max_groups: Union[int, None] = None,
+        group_order: Union[str, None] = "sorted",
+    ):
+        """
+        Агрегация за один проход, как DictList2.aggregate().
+
+        С max_groups в памяти держится не больше max_groups групп,
+        остальное выгружается на диск, а результат возвращается потоком
+        (DictStream), а не списком.
+        """
+        from . import DictList2
+
+        check_max_groups(max_groups)
+        check_group_order(group_order)
+        group_keys = (
+            [group_columns]
+            if isinstance(group_columns, str)
+            else group_columns
+        )
+        if max_groups is not None and group_keys:
+            return DictStream(
+                spill_aggregate(
+                    self,
+                    group_keys,
+                    aggregations or {},
+                    max_groups,
+                    order=group_order,
+                )
+            )
+        return DictList2(
+            hash_aggregate(
+                self, group_keys, aggregations or {}, order=group_order
+            )
+        )
@@ -0,0 +1,76 @@
+"""
+Частичная сортировка: первые n строк без сортировки всего списка.
+
+Для списка целиком используются heapq.nsmallest / heapq.nlargest —
+O(строк × log n) вместо O(строк × log строк). Обе функции устойчивы:
+результат совпадает с sorted(...)[:n], в том числе для равных ключей.
+
+Для групп строки читаются один раз, и в каждой группе хранится не
+больше 2n кандидатов: когда буфер группы заполняется, из него остаются
+n лучших.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from ._aggregate import ordered_groups
+from ._keys import tuple_getter
+
+Row = Dict[str, Any]
+
+
+def top_rows(
+    rows: Iterable[Row],
+    n: int,
+    key: Callable[[Row], Any],
+    reverse: bool = False,
+) -> List[Row]:
+    """Первые n строк sorted(rows, key=key, reverse=reverse)."""
+    if n <= 0:
+        return []
+    if reverse:
+        return heapq.nlargest(n, rows, key=key)
+    return heapq.nsmallest(n, rows, key=key)
+
+
+def partition_top(
+    rows: Iterable[Row],
+    by: List[str],
+    n: int,
+    key: Union[Callable[[Row], Any], None] = None,
+    reverse: bool = False,
+    order: Union[str, None] = "sorted",
+) -> List[Tuple[Row, List[Row]]]:
+    """
+    Первые n строк каждой группы за один проход.
+
+    :param by: список полей группировки.
+    :param key: ключ порядка внутри группы; None — порядок списка.
+    :param order: порядок групп, см. ordered_groups().
+    :return: пары (значения группы, строки группы) в порядке distinct().
+    """
+    buckets = {}
+    limit = max(n, 0)
+    get_group = tuple_getter(by)
+    for item in rows:
+        group = get_group(item)
+        bucket = buckets.get(group)
+        if bucket is None:
+            bucket = buckets[group] = []
+        if key is None:
+            if len(bucket) < limit:
+                bucket.append(item)
+            continue
+        bucket.append(item)
+        if len(bucket) >= 2 * limit:
+            # Кандидаты упорядочены, новые строки идут после них,
+            # поэтому равные ключи сохраняют порядок списка
+            bucket[:] = top_rows(bucket, limit, key, reverse)
+
+    result = []
+    for group in ordered_groups(buckets, order):
+        bucket = buckets[group]
+        if key is not None:
+            bucket = top_rows(bucket, limit, key, reverse)
+        result.append((dict(zip(by, group)), bucket))
+    return result
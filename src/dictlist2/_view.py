@@ -0,0 +1,248 @@
+"""
+Материализованная агрегация, которая обновляется вместе со списком.
+
+AggregateView хранит накопители каждой группы. Строки, добавленные
+в конец списка (append, extend, +=), учитываются сразу — O(новых строк).
+Удалённые строки (remove, pop, del, замена) вычитаются методом
+remove() накопителя, если он есть у всех операций (sum, count, avg,
+weighted_avg); иначе, как и после вставки в середину или reverse(),
+представление помечается устаревшим и пересчитывается при следующем
+чтении. Чтение результата стоит O(групп), для group_order="sorted" —
+плюс сортировка ключей групп.
+
+Группы в порядке первого появления (group_order="first_seen" или None)
+пересчитываются после любого удаления и перестановки: порядок групп
+мог измениться. Сумма вещественных значений зависит от порядка
+слагаемых, а вычитание оставляет погрешность округления
+(0.1 + 0.2 - 0.2 != 0.1), поэтому, если в представление попало значение
+float, удаление строк и перестановки тоже ведут к пересчёту — результат
+совпадает с aggregate() без расхождений в последнем знаке.
+
+Список сообщает об изменениях представлениям из ViewSet; ссылки на
+представления слабые, поэтому ненужное представление удаляется сборщиком
+мусора как обычный объект.
+"""
+
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from ._aggregate import (
+    compile_aggregations,
+    ordered_groups,
+    split_slots,
+)
+from ._keys import tuple_getter
+
+Row = Dict[str, Any]
+
+
+def _inexact(value: Any) -> bool:
+    """Значение (или элемент кортежа) вещественное."""
+    if type(value) is tuple:
+        return any(isinstance(item, float) for item in value)
+    return isinstance(value, float)
+
+
+class AggregateView:
+    """
+    Результат aggregate(), поддерживаемый в актуальном состоянии.
+
+    :ivar stale: True — группы нужно пересчитать по списку целиком.
+    :ivar exact: False — в накопители попали значения float, и удаление
+        строк вычитанием дало бы погрешность.
+    """
+
+    __slots__ = (
+        "rows",
+        "group_keys",
+        "order",
+        "names",
+        "factories",
+        "plain",
+        "combined",
+        "get_key",
+        "invertible",
+        "groups",
+        "stale",
+        "exact",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        rows: List[Row],
+        group_keys: Union[List[str], None],
+        aggregations: Dict[Any, Union[str, List[str]]],
+        order: Union[str, None] = "sorted",
+    ):
+        self.rows = rows
+        self.group_keys = group_keys
+        self.order = order
+        self.names, self.factories, slots = compile_aggregations(aggregations)
+        self.plain, self.combined = split_slots(slots)
+        self.get_key = tuple_getter(group_keys or [])
+        self.invertible = all(
+            callable(getattr(factory(), "remove", None))
+            for factory in self.factories
+        )
+        self.groups = {}
+        self.stale = True
+        self.exact = True
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.groups = {}
+        if self.group_keys is None:
+            self._entry(())
+        self.stale = False
+        self.exact = True
+        self.add(self.rows)
+
+    def _removable(self) -> bool:
+        """Удаление строк можно учесть вычитанием."""
+        return self.invertible and self.exact and self.order == "sorted"
+
+    def _entry(self, key: Tuple[Any, ...]) -> list:
+        """Новая группа: [число строк, накопители]."""
+        self.groups[key] = [0, [factory() for factory in self.factories]]
+        return self.groups[key]
+
+    def add(self, items: Iterable[Row]) -> None:
+        """Учитывает строки, добавленные в список."""
+        if self.stale:
+            return
+        groups = self.groups
+        # Типы значений проверяются, пока удаление возможно вычитанием
+        check = self._removable()
+        for item in items:
+            key = self.get_key(item)
+            entry = groups.get(key)
+            if entry is None:
+                entry = self._entry(key)
+            entry[0] += 1
+            state = entry[1]
+            for field, indexes in self.plain:
+                value = item.get(field, 0)
+                if check and isinstance(value, float):
+                    self.exact = check = False
+                for index in indexes:
+                    state[index].update(value)
+            for read, indexes in self.combined:
+                value = read(item)
+                if check and _inexact(value):
+                    self.exact = check = False
+                for index in indexes:
+                    state[index].update(value)
+
+    def discard(self, items: Iterable[Row]) -> None:
+        """Вычитает строки, удалённые из списка."""
+        if self.stale:
+            return
+        if not self._removable():
+            self.stale = True
+            return
+        groups = self.groups
+        for item in items:
+            key = self.get_key(item)
+            entry = groups.get(key)
+            if entry is None:
+                # Строки не было в группах: состояние не согласовано
+                self.stale = True
+                return
+            entry[0] -= 1
+            if not entry[0] and self.group_keys is not None:
+                del groups[key]
+                continue
+            state = entry[1]
+            for field, indexes in self.plain:
+                value = item.get(field, 0)
+                for index in indexes:
+                    state[index].remove(value)
+            for read, indexes in self.combined:
+                value = read(item)
+                for index in indexes:
+                    state[index].remove(value)
+
+    def reordered(self) -> None:
+        """Порядок строк изменился (вставка в середину, reverse())."""
+        # Сумма float зависит от порядка слагаемых, как и first / last
+        if not self._removable():
+            self.stale = True
+
+    def cleared(self) -> None:
+        self.stale = True
+
+    def collect(self):
+        """Текущий результат, как aggregate() по списку сейчас."""
+        from . import DictList2
+
+        if self.stale:
+            self._rebuild()
+        keys = self.group_keys or []
+        result = []
+        for key in ordered_groups(self.groups, self.order):
+            row = dict(zip(keys, key))
+            for name, acc in zip(self.names, self.groups[key][1]):
+                row[name] = acc.finalize()
+            result.append(row)
+        return DictList2(result)
+
+    def close(self) -> None:
+        """Отключает представление от списка."""
+        views = getattr(self.rows, "_views", None)
+        if views is not None:
+            views.discard(self)
+        self.groups = {}
+        self.stale = True
+
+    def __iter__(self) -> Iterator[Row]:
+        return iter(self.collect())
+
+    def __len__(self) -> int:
+        if self.stale:
+            self._rebuild()
+        return len(self.groups)
+
+
+class ViewSet:
+    """Представления одного списка (слабые ссылки)."""
+
+    __slots__ = ("views",)
+
+    def __init__(self):
+        self.views = weakref.WeakSet()
+
+    def __reduce__(self):
+        # Копия списка (copy, pickle) приходит без представлений
+        return ViewSet, ()
+
+    def add(self, view: AggregateView) -> None:
+        self.views.add(view)
+
+    def discard(self, view: AggregateView) -> None:
+        self.views.discard(view)
+
+    def _own(self, rows: List[Row]) -> List[AggregateView]:
+        # Поверхностная копия списка делит ViewSet с оригиналом
+        return [view for view in self.views if view.rows is rows]
+
+    def appended(self, rows: List[Row], items: Iterable[Row]) -> None:
+        for view in self._own(rows):
+            view.add(items)
+
+    def inserted(self, rows: List[Row], items: Iterable[Row]) -> None:
+        for view in self._own(rows):
+            view.reordered()
+            view.add(items)
+
+    def removed(self, rows: List[Row], items: Iterable[Row]) -> None:
+        for view in self._own(rows):
+            view.discard(items)
+
+    def reordered(self, rows: List[Row]) -> None:
+        for view in self._own(rows):
+            view.reordered()
+
+    def cleared(self, rows: List[Row]) -> None:
+        for view in self._own(rows):
+            view.cleared()
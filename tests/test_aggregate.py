@@ -1,7 +1,11 @@
 import logging  # noqa
+import statistics
+
 import pytest
 
-from dictlist2 import DictList2
+from dictlist2 import Accumulator, DictList2, register_aggregation
+from dictlist2._aggregate import ACCUMULATORS
+from dictlist2._parallel import _SHARED
 
 
 class TestDictList2Aggregate:
@@ -243,3 +247,730 @@ class TestDictList2AggregateExtended:
             data.aggregate(
                 group_columns="category", aggregations={"value": "sum"}
             )
+
+
+class TestDictList2AggregateHash:
+    """
+    Тесты однопроходной хэш-агрегации aggregate().
+
+    Сценарии:
+    ---------
+    11. Порядок групп совпадает с distinct() (None как "").
+    12. Результат совпадает с расчётом по отфильтрованным группам.
+    13. Пустые данные без группировки — нулевые агрегаты.
+    """
+
+    def test_group_order_matches_distinct(self):
+        """✅ Группы упорядочены так же, как в distinct()"""
+        data = DictList2(
+            [
+                {"p": "b", "v": 1},
+                {"p": None, "v": 2},
+                {"p": "a", "v": 3},
+                {"p": "b", "v": 4},
+            ]
+        )
+        result = data.aggregate(group_columns="p", aggregations={"v": "sum"})
+        assert [row["p"] for row in result] == [
+            row["p"] for row in data.distinct("p")
+        ]
+        assert result == [
+            {"p": None, "v_sum": 2},
+            {"p": "a", "v_sum": 3},
+            {"p": "b", "v_sum": 5},
+        ]
+
+    def test_matches_per_group_filter(self):
+        """✅ Совпадает с построчным расчётом по каждой группе"""
+        data = DictList2(
+            [
+                {"g": i % 7, "h": i % 3, "v": (i * 13) % 11}
+                for i in range(500)
+            ]
+        )
+        result = data.aggregate(
+            group_columns=["g", "h"],
+            aggregations={"v": ["sum", "count", "avg", "min", "max"]},
+        )
+        assert len(result) == 21
+        for row in result:
+            values = [
+                item["v"]
+                for item in data.filter({"g": row["g"], "h": row["h"]})
+            ]
+            assert row["v_sum"] == sum(values)
+            assert row["v_count"] == len(values)
+            assert row["v_avg"] == sum(values) / len(values)
+            assert row["v_min"] == min(values)
+            assert row["v_max"] == max(values)
+
+    def test_empty_without_grouping(self):
+        """✅ Пустые данные без группировки — одна строка с нулями"""
+        result = DictList2([]).aggregate(
+            aggregations={"v": ["sum", "count", "avg", "min", "max"]}
+        )
+        assert result == [
+            {"v_sum": 0, "v_count": 0, "v_avg": 0, "v_min": 0, "v_max": 0}
+        ]
+
+
+class TestDictList2AggregateNumpy:
+    """
+    Тесты бэкенда NumPy для aggregate().
+
+    Сценарии:
+    ---------
+    14. Результат совпадает с бэкендом на чистом Python.
+    15. Нечисловые значения — откат на чистый Python.
+    16. Неизвестный бэкенд — ValueError.
+    """
+
+    data = DictList2(
+        [
+            {"g": "b", "i": 3, "f": 0.1, "s": "x"},
+            {"g": "a", "i": None, "f": 0.2, "s": "y"},
+            {"g": "b", "f": 0.3, "s": "z"},
+            {"g": None, "i": -4, "f": 1.5, "s": "x"},
+            {"g": "a", "i": 10, "f": None, "s": "y"},
+        ]
+    )
+    aggregations = {
+        "i": ["sum", "count", "avg", "min", "max"],
+        "f": ["sum", "avg", "min", "max"],
+        "s": "count",
+    }
+
+    def test_numpy_matches_python(self):
+        """✅ Бэкенд numpy (или откат без NumPy) совпадает с python"""
+        for group in ("g", None, ["g", "s"]):
+            expected = self.data.aggregate(group, self.aggregations)
+            result = self.data.aggregate(
+                group, self.aggregations, backend="numpy"
+            )
+            assert result == expected
+
+    def test_numpy_kernels(self):
+        """✅ Ядра NumPy считают суммы целых точно, типы — Python"""
+        pytest.importorskip("numpy")
+        data = DictList2([{"g": i % 3, "v": i} for i in range(1000)])
+        aggregations = {"v": ["sum", "min", "max", "avg"]}
+        result = data.aggregate("g", aggregations, backend="numpy")
+        assert result == data.aggregate("g", aggregations)
+        assert type(result[0]["v_sum"]) is int
+
+        # Целые и вещественные вперемешку: типы — как у накопителей Python
+        data = DictList2(
+            [
+                {"g": 1, "v": 7},
+                {"g": 1, "v": None},
+                {"g": 2, "v": 0.5},
+                {"g": 2, "v": 2},
+                {"g": 2, "v": 2.0},
+                {"g": 3, "v": 1.0},
+                {"g": 3, "v": 1},
+            ]
+        )
+        for group in ("g", None):
+            expected = data.aggregate(group, aggregations)
+            result = data.aggregate(group, aggregations, backend="numpy")
+            assert result == expected
+            for row, python_row in zip(result, expected):
+                for name, value in row.items():
+                    assert type(value) is type(python_row[name]), name
+        assert result == [
+            {"v_sum": 13.5, "v_min": 0, "v_max": 7, "v_avg": 13.5 / 7}
+        ]
+        assert type(result[0]["v_min"]) is int
+
+    def test_non_numeric_falls_back(self):
+        """✅ Строковые значения обрабатываются чистым Python"""
+        data = DictList2([{"g": 1, "s": "b"}, {"g": 1, "s": "a"}])
+        result = data.aggregate("g", {"s": ["min", "max"]}, backend="numpy")
+        assert result == [{"g": 1, "s_min": "a", "s_max": "b"}]
+
+    def test_unknown_backend(self):
+        """❌ Неизвестный бэкенд"""
+        with pytest.raises(ValueError, match="Unknown aggregation backend"):
+            self.data.aggregate("g", {"i": "sum"}, backend="gpu")
+
+
+class TestDictList2AggregateParallel:
+    """
+    Тесты параллельной агрегации aggregate(..., workers=N).
+
+    Сценарии:
+    ---------
+    17. Результат с группировкой совпадает с однопроцессным точно при
+        любом group_order; общие строки после вызова освобождаются.
+    18. Без группировки частичные накопители объединяются (avg); суммы
+        float могут отличаться от однопроцессных в последнем знаке.
+    19. Пустые данные и число частей больше числа строк.
+    20. Некорректное значение workers — ValueError.
+    """
+
+    data = DictList2(
+        [
+            {
+                "g": [None, "", "a", "b"][i % 4],
+                "k": i % 7,
+                "i": i if i % 5 else None,
+                "f": i * 0.1,
+                "s": "xyz"[i % 3],
+            }
+            for i in range(200)
+        ]
+    )
+    aggregations = {
+        "i": ["sum", "count", "avg", "min", "max"],
+        "f": ["sum", "avg", "min", "max"],
+        "s": ["min", "max"],
+    }
+
+    def test_grouped_matches_single_process(self):
+        """✅ Группы, порядок и суммы float совпадают точно"""
+        for group in ("g", ["g", "k"], "k"):
+            for order in ("sorted", "first_seen", None):
+                expected = self.data.aggregate(
+                    group, self.aggregations, group_order=order
+                )
+                result = self.data.aggregate(
+                    group, self.aggregations, workers=3, group_order=order
+                )
+                assert result == expected
+        assert _SHARED == {}
+
+    def test_ungrouped_merges_partials(self):
+        """✅ Без группировки: avg = сумма / количество по всем частям"""
+        data = DictList2([{"v": v} for v in (1, 2, 3, 4, None, 10)])
+        result = data.aggregate(
+            None, {"v": ["sum", "count", "avg", "min", "max"]}, workers=4
+        )
+        assert result == [
+            {
+                "v_sum": 20,
+                "v_count": 6,
+                "v_avg": 20 / 6,
+                "v_min": 0,
+                "v_max": 10,
+            }
+        ]
+
+    def test_ungrouped_float_rounding(self):
+        """✅ Без группировки: float суммируется по частям"""
+        data = DictList2([{"v": 0.1} for _ in range(10)])
+        aggregations = {"v": ["sum", "avg"]}
+        expected = data.aggregate(None, aggregations)
+        result = data.aggregate(None, aggregations, workers=2)
+        total = 0.9999999999999999
+        assert expected == [{"v_sum": total, "v_avg": total / 10}]
+        # Отрезки по пять строк: 0.5 + 0.5
+        assert result == [{"v_sum": 1.0, "v_avg": 0.1}]
+        assert result == [pytest.approx(expected[0])]
+
+    def test_empty_and_small(self):
+        """✅ Пустые данные и частей больше, чем строк"""
+        assert DictList2([]).aggregate(None, {"v": "sum"}, workers=2) == [
+            {"v_sum": 0}
+        ]
+        assert DictList2([]).aggregate("g", {"v": "sum"}, workers=2) == []
+        data = DictList2([{"g": 1, "v": 2}])
+        assert data.aggregate("g", {"v": "avg"}, workers=8) == [
+            {"g": 1, "v_avg": 2.0}
+        ]
+
+    def test_invalid_workers(self):
+        """❌ workers должен быть положительным целым"""
+        for workers in (0, -1, 1.5, True):
+            with pytest.raises(ValueError, match="workers"):
+                self.data.aggregate("g", {"i": "sum"}, workers=workers)
+
+
+class TestDictList2AggregateSpill:
+    """
+    Тесты агрегации с выгрузкой на диск aggregate(..., max_groups=N).
+
+    Сценарии:
+    ---------
+    21. Групп больше бюджета — результат совпадает с агрегацией в памяти,
+        включая порядок групп None и "" и суммы float.
+    22. Бюджет 1 — повторное разбиение секций.
+    23. Некорректный max_groups — ValueError.
+    24. group_order="first_seen" с выгрузкой на диск и без неё.
+    """
+
+    data = DictList2(
+        [
+            {
+                "g": [None, "", "a", str(i % 37)][i % 4],
+                "f": i * 0.1,
+                "i": i if i % 3 else None,
+            }
+            for i in range(500)
+        ]
+    )
+    aggregations = {
+        "f": ["sum", "count", "avg", "min", "max"],
+        "i": ["sum", "avg", "min", "max"],
+    }
+
+    def test_spill_matches_in_memory(self):
+        """✅ Выгрузка на диск не меняет результат"""
+        expected = self.data.aggregate("g", self.aggregations)
+        result = self.data.aggregate("g", self.aggregations, max_groups=5)
+        assert result == expected
+
+    def test_repartition(self):
+        """✅ Секции, которые сами не помещаются в бюджет"""
+        data = DictList2(
+            [{"a": i % 50, "b": i % 3, "v": i} for i in range(600)]
+        )
+        aggregations = {"v": ["sum", "avg"]}
+        expected = data.aggregate(["a", "b"], aggregations)
+        result = data.aggregate(["a", "b"], aggregations, max_groups=1)
+        assert result == expected
+
+    def test_invalid_max_groups(self):
+        """❌ max_groups должен быть положительным целым"""
+        with pytest.raises(ValueError, match="max_groups"):
+            self.data.aggregate("g", {"f": "sum"}, max_groups=0)
+
+    def test_group_order_first_seen(self):
+        """✅ Порядок первого появления групп при любом способе вычисления"""
+        seen = list(dict.fromkeys(row["g"] for row in self.data))
+        expected = self.data.aggregate(
+            "g", self.aggregations, group_order="first_seen"
+        )
+        assert [row["g"] for row in expected] == seen
+        for options in (
+            {"max_groups": 5},
+            {"max_groups": 1},
+            {"workers": 2},
+            {"backend": "numpy"},
+        ):
+            result = self.data.aggregate(
+                "g", self.aggregations, group_order="first_seen", **options
+            )
+            assert result == expected
+        with pytest.raises(ValueError, match="group order"):
+            self.data.aggregate("g", {"f": "sum"}, group_order="desc")
+
+
+class TestDictList2AggregateDistinctQuantile:
+    """
+    Тесты count_distinct, approx_count_distinct, approx_median и
+    percentile_p95.
+
+    Сценарии:
+    ---------
+    25. count_distinct — точно, включая списки в значениях и None как 0.
+    26. approx_count_distinct — точно для малых групп, с ошибкой в
+        несколько процентов для больших; параллельно, с выгрузкой на
+        диск и на NumPy — тот же результат.
+    27. Квантили малых групп точные (линейная интерполяция), больших —
+        приближённые; группы в процессах считаются так же, как в одном.
+    """
+
+    data = DictList2(
+        [
+            {"g": i % 3, "u": (i * 7919) % 5000, "v": (i * 37) % 1000}
+            for i in range(30000)
+        ]
+    )
+
+    def test_count_distinct(self):
+        """✅ Точное число различных значений"""
+        data = DictList2(
+            [
+                {"g": "a", "u": "x", "tags": [1]},
+                {"g": "a", "u": "x", "tags": [1]},
+                {"g": "a", "u": None, "tags": [2]},
+                {"g": "a", "tags": [2]},
+                {"g": "b", "u": "y", "tags": [1, 2]},
+            ]
+        )
+        result = data.aggregate(
+            "g", {"u": "count_distinct", "tags": "count_distinct"}
+        )
+        assert result == [
+            {"g": "a", "u_count_distinct": 2, "tags_count_distinct": 2},
+            {"g": "b", "u_count_distinct": 1, "tags_count_distinct": 1},
+        ]
+
+    def test_approx_count_distinct(self):
+        """✅ HyperLogLog: малые группы точно, большие — около 2 %"""
+        small = DictList2([{"u": f"user{i % 40}"} for i in range(400)])
+        assert small.aggregate(None, {"u": "approx_count_distinct"}) == [
+            {"u_approx_count_distinct": 40}
+        ]
+
+        aggregations = {"u": ["count_distinct", "approx_count_distinct"]}
+        expected = self.data.aggregate("g", aggregations)
+        for row in expected:
+            error = row["u_approx_count_distinct"] / row["u_count_distinct"]
+            assert abs(error - 1) < 0.05
+        for options in (
+            {"workers": 2},
+            {"max_groups": 1},
+            {"backend": "numpy"},
+        ):
+            result = self.data.aggregate("g", aggregations, **options)
+            assert result == expected
+        # Без группировки регистры частей объединяются без потерь
+        total = self.data.aggregate(None, aggregations)
+        assert self.data.aggregate(None, aggregations, workers=3) == total
+
+    def test_quantiles(self):
+        """✅ Медиана и 95-й перцентиль"""
+        data = DictList2([{"v": v} for v in [5, 1, None, 3, 2]])
+        assert data.aggregate(
+            None, {"v": ["approx_median", "percentile_p95"]}
+        ) == [{"v_approx_median": 2.0, "v_percentile_p95": 4.6}]
+
+        aggregations = {"v": ["approx_median", "percentile_p95"]}
+        expected = self.data.aggregate("g", aggregations)
+        for row in expected:
+            assert abs(row["v_approx_median"] - 499.5) < 10
+            assert abs(row["v_percentile_p95"] - 949.05) < 10
+        for options in ({"workers": 2}, {"max_groups": 1}):
+            result = self.data.aggregate("g", aggregations, **options)
+            assert result == expected
+        (total,) = self.data.aggregate(None, aggregations, workers=3)
+        assert abs(total["v_percentile_p95"] - 949.05) < 10
+
+
+class RangeAccumulator(Accumulator):
+    """Размах значений (пример пользовательского накопителя)."""
+
+    __slots__ = ("low", "high")
+
+    def __init__(self):
+        self.low = None
+        self.high = None
+
+    def update(self, value):
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+
+    def merge(self, other):
+        if other.low is not None:
+            self.update(other.low)
+            self.update(other.high)
+
+    def finalize(self):
+        return 0 if self.low is None else self.high - self.low
+
+
+class TestDictList2AggregateRegistry:
+    """
+    Тесты реестра накопителей и встроенных first, last, stddev,
+    string_agg, weighted_avg.
+
+    Сценарии:
+    ---------
+    28. Встроенные накопители: значения и одинаковый результат при
+        workers, max_groups, query() и колоночном представлении.
+    29. Пользовательский накопитель регистрируется и работает во всех
+        способах вычисления.
+    30. Повторная регистрация и некорректные аргументы — ошибки.
+    31. Подкласс Accumulator без merge() не создаётся (TypeError).
+    """
+
+    data = DictList2(
+        [
+            {"g": i % 4, "v": (i * 13) % 17, "w": i % 3, "s": f"x{i}"}
+            for i in range(120)
+        ]
+    )
+
+    def test_builtin_accumulators(self):
+        """✅ first, last, stddev, string_agg, weighted_avg"""
+        data = DictList2(
+            [
+                {"g": "a", "price": 10, "qty": 1, "name": "x"},
+                {"g": "a", "price": 20, "qty": 3, "name": None},
+                {"g": "a", "price": 30, "name": "z"},
+                {"g": "b", "price": 5, "qty": 2, "name": None},
+            ]
+        )
+        result = data.aggregate(
+            "g",
+            {
+                "price": ["first", "last", "stddev"],
+                "name": "string_agg",
+                ("price", "qty"): "weighted_avg",
+            },
+        )
+        assert result == [
+            {
+                "g": "a",
+                "price_first": 10,
+                "price_last": 30,
+                "price_stddev": statistics.stdev([10, 20, 30]),
+                "name_string_agg": "x, z",
+                "price_qty_weighted_avg": 17.5,
+            },
+            {
+                "g": "b",
+                "price_first": 5,
+                "price_last": 5,
+                "price_stddev": 0.0,
+                "name_string_agg": "",
+                "price_qty_weighted_avg": 5.0,
+            },
+        ]
+
+    def test_builtin_accumulators_merge(self):
+        """✅ Частичные состояния объединяются без потерь"""
+        aggregations = {
+            "v": ["first", "last", "stddev"],
+            "s": "string_agg",
+            ("v", "w"): "weighted_avg",
+        }
+        for group in ("g", None):
+            expected = self.data.aggregate(group, aggregations)
+            for options in ({"workers": 3}, {"max_groups": 1}):
+                if group is None and "max_groups" in options:
+                    continue
+                result = self.data.aggregate(group, aggregations, **options)
+                assert result == pytest.approx(expected)
+            query = self.data.query().group(group, aggregations)
+            assert query.collect() == expected
+            columns = self.data.to_columns().aggregate(group, aggregations)
+            assert columns.to_rows() == expected
+
+        # Выгрузка на диск объединяет группу с пустым накопителем:
+        # результат совпадает до последнего знака
+        data = DictList2(
+            [
+                {"g": g, "v": v}
+                for g, v in [(1, 1), (1, 0.1), (1, 0.1), (3, 0.3), (1, 0.3)]
+                + [(2, 0.1), (0, 2.5), (1, 0.1), (1, 0.1)]
+            ]
+        )
+        expected = data.aggregate("g", {"v": "stddev"})
+        assert data.aggregate("g", {"v": "stddev"}, max_groups=1) == expected
+
+    def test_register_custom_accumulator(self):
+        """✅ Пользовательская операция во всех способах вычисления"""
+        register_aggregation("range", RangeAccumulator)
+        try:
+            expected = [{"g": g, "v_range": 16} for g in range(4)]
+            assert self.data.aggregate("g", {"v": "range"}) == expected
+            for options in ({"workers": 2}, {"max_groups": 1}):
+                result = self.data.aggregate("g", {"v": "range"}, **options)
+                assert result == expected
+        finally:
+            ACCUMULATORS.pop("range")
+
+    def test_register_errors(self):
+        """❌ Имя занято, пустое имя, фабрика не вызывается"""
+        with pytest.raises(ValueError, match="already registered"):
+            register_aggregation("sum", RangeAccumulator)
+        with pytest.raises(ValueError, match="non-empty"):
+            register_aggregation("", RangeAccumulator)
+        with pytest.raises(TypeError, match="callable"):
+            register_aggregation("range", 42)
+
+    def test_incomplete_accumulator(self):
+        """❌ Накопитель без merge() не создаётся"""
+
+        class NoMerge(Accumulator):
+            def update(self, value):
+                pass
+
+            def finalize(self):
+                return 0
+
+        with pytest.raises(TypeError, match="merge"):
+            NoMerge()
+        register_aggregation("no_merge", NoMerge)
+        try:
+            with pytest.raises(TypeError, match="merge"):
+                self.data.aggregate("g", {"v": "no_merge"})
+        finally:
+            ACCUMULATORS.pop("no_merge")
+
+
+class TestDictList2AggregateView:
+    """
+    Тесты метода aggregate_view() класса DictList2.
+
+    Сценарии:
+    ---------
+    32. Добавление и удаление строк любым способом: представление
+        совпадает с aggregate() по текущему списку.
+    33. Необратимые операции (min, max) и перестановки помечают
+        представление устаревшим; следующее чтение пересчитывает группы.
+    34. Копии списка приходят без представлений; закрытое и ненужное
+        представление больше не получает изменений.
+    35. Порядок групп first_seen после удаления первой строки группы,
+        вставки в начало и reverse() совпадает с aggregate().
+    36. Удаление строк с вещественными значениями даёт тот же результат,
+        что и aggregate(), без погрешности вычитания.
+    37. reverse() и вставка в середину для float-значений: сумма
+        пересчитывается в новом порядке строк.
+    """
+
+    aggregations = {"v": ["sum", "count", "avg"], ("v", "w"): "weighted_avg"}
+
+    @staticmethod
+    def rows(start, stop):
+        return [
+            {"g": i % 3, "v": (i * 7) % 11, "w": i % 4 + 1}
+            for i in range(start, stop)
+        ]
+
+    def check(self, data, view, group):
+        expected = data.aggregate(group, self.aggregations)
+        assert view.collect() == pytest.approx(expected)
+        assert len(view) == len(expected)
+
+    def test_incremental_changes(self):
+        """✅ append, extend, +=, insert, remove, pop, del, замена"""
+        for group in ("g", ["g"], None):
+            data = DictList2(self.rows(0, 10))
+            view = data.aggregate_view(group, self.aggregations)
+            self.check(data, view, group)
+            data.append(self.rows(10, 11)[0])
+            data.extend(iter(self.rows(11, 15)))
+            data += self.rows(15, 18)
+            data.insert(len(data), self.rows(18, 19)[0])
+            data.insert(0, self.rows(19, 20)[0])
+            assert not view.stale
+            self.check(data, view, group)
+            data.remove(dict(data[3]))
+            data.pop()
+            data.pop(0)
+            del data[2]
+            del data[::3]
+            data[1] = {"g": 5, "v": 100, "w": 2}
+            data[4:6] = iter(self.rows(30, 33))
+            assert not view.stale
+            self.check(data, view, group)
+            data *= 2
+            self.check(data, view, group)
+            del data[:]
+            self.check(data, view, group)
+
+    def test_group_removed_when_empty(self):
+        """✅ Группа без строк исчезает из результата"""
+        data = DictList2([{"g": 1, "v": 2}, {"g": 2, "v": 3}])
+        view = data.aggregate_view("g", {"v": "sum"})
+        data.pop()
+        assert list(view) == [{"g": 1, "v_sum": 2}]
+
+    def test_stale_rebuild(self):
+        """✅ min/max, reverse() и clear() — пересчёт при чтении"""
+        data = DictList2(self.rows(0, 10))
+        view = data.aggregate_view(
+            "g", {"v": ["min", "max", "first"]}, group_order="first_seen"
+        )
+        data.append({"g": 0, "v": 50})
+        assert not view.stale
+        data.pop()
+        assert view.stale
+        assert view.collect() == data.aggregate(
+            "g", {"v": ["min", "max", "first"]}, group_order="first_seen"
+        )
+        assert not view.stale
+        data.reverse()
+        assert view.stale
+        assert view.collect()[0]["v_first"] == data[0]["v"]
+
+        summary = data.aggregate_view("g", {"v": "sum"})
+        data.reverse()
+        data.insert(1, {"g": 0, "v": 1})
+        assert not summary.stale
+        data.clear()
+        assert summary.stale
+        assert summary.collect() == []
+
+    def test_copies_and_close(self):
+        """✅ Копии без представлений, close() и сборка мусора"""
+        import copy
+        import gc
+        import pickle
+
+        data = DictList2(self.rows(0, 6))
+        view = data.aggregate_view(None, {"v": "count"})
+        for other in (copy.copy(data), pickle.loads(pickle.dumps(data))):
+            other.append({"v": 1})
+            other.clear()
+        assert not view.stale
+        assert view.collect() == [{"v_count": 6}]
+
+        view.close()
+        data.append({"v": 1})
+        assert len(data._views.views) == 0
+
+        data.aggregate_view(None, {"v": "count"})
+        gc.collect()
+        assert len(data._views.views) == 0
+
+    def test_invalid_arguments(self):
+        """❌ Неизвестная операция или порядок групп"""
+        data = DictList2(self.rows(0, 3))
+        with pytest.raises(ValueError):
+            data.aggregate_view("g", {"v": "unknown"})
+        with pytest.raises(ValueError, match="Unknown group order"):
+            data.aggregate_view("g", {"v": "sum"}, group_order="random")
+
+    def test_first_seen_order(self):
+        """✅ Порядок первого появления групп после изменений"""
+        data = DictList2(
+            [{"g": "A", "v": 1}, {"g": "B", "v": 2}, {"g": "A", "v": 3}]
+        )
+        view = data.aggregate_view("g", {"v": "sum"}, group_order="first_seen")
+
+        def expected():
+            return data.aggregate("g", {"v": "sum"}, group_order="first_seen")
+
+        data.pop(0)
+        assert view.collect() == expected()
+        assert [row["g"] for row in view] == ["B", "A"]
+        data.insert(0, {"g": "C", "v": 4})
+        assert view.collect() == expected()
+        data.reverse()
+        assert view.collect() == expected()
+        data[0] = {"g": "D", "v": 5}
+        assert view.collect() == expected()
+        data.append({"g": "E", "v": 6})
+        assert not view.stale
+        assert view.collect() == expected()
+
+    def test_float_removal(self):
+        """✅ Удаление float-значений без погрешности вычитания"""
+        data = DictList2(
+            [{"g": 1, "v": 0.1}, {"g": 1, "v": 0.2}, {"g": 1, "v": 5}]
+        )
+        aggregations = {"v": ["sum", "avg"]}
+        view = data.aggregate_view("g", aggregations)
+        data.remove({"g": 1, "v": 0.2})
+        assert view.collect() == data.aggregate("g", aggregations)
+        assert view.collect()[0]["v_sum"] == 5.1
+        data.pop()
+        assert view.collect() == [{"g": 1, "v_sum": 0.1, "v_avg": 0.1}]
+
+        integers = DictList2([{"g": 1, "v": 1}, {"g": 1, "v": 2}])
+        view = integers.aggregate_view("g", aggregations)
+        integers.pop()
+        integers.reverse()
+        assert not view.stale
+
+    def test_float_reorder(self):
+        """✅ reverse() и вставка в середину для float — как aggregate()"""
+        aggregations = {"v": ["sum", "avg"]}
+        data = DictList2([{"g": 1, "v": v} for v in (0.1, 0.2, 0.3)])
+        view = data.aggregate_view("g", aggregations)
+        data.reverse()
+        assert view.collect()[0]["v_sum"] == 0.6
+        assert view.collect() == data.aggregate("g", aggregations)
+
+        data = DictList2([{"g": 1, "v": v} for v in (0.1, 0.2)])
+        view = data.aggregate_view("g", aggregations)
+        data.insert(1, {"g": 1, "v": 0.3})
+        assert view.collect() == data.aggregate("g", aggregations)
+        data.insert(0, {"g": 1, "v": 0.7})
+        assert view.collect() == data.aggregate("g", aggregations)
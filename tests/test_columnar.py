@@ -0,0 +1,124 @@
+import logging  # noqa
+import pytest
+from array import array
+
+from dictlist2 import DictList2, ColumnarDictList
+
+
+class TestColumnarDictList:
+    """
+    Тесты колоночного представления `to_columns()` / ColumnarDictList.
+
+    Сценарии:
+    ---------
+    1. Туда-обратно: строки с отсутствующими полями сохраняются.
+    2. Однотипные числа хранятся в array.
+    3. filter() и sort() совпадают с DictList2.
+    4. aggregate() совпадает с DictList2 (None и пропуски — 0).
+    5. join() / left_join() совпадают с DictList2.
+    6. Сортировка по отсутствующему полю — KeyError.
+    7. Логические операции and / or / not в filter() — как в DictList2.
+    8. Пустой список: sort(), filter(), aggregate() и соединения — как в
+       DictList2.
+    """
+
+    data = DictList2(
+        [
+            {"id": 3, "project": "A", "hours": 2, "cost": 1.5},
+            {"id": 1, "project": "B", "hours": None, "cost": 2.0},
+            {"id": 2, "project": "A", "cost": 0.5},
+            {"id": 4, "project": None, "hours": 7, "cost": 3.0},
+        ]
+    )
+
+    def test_round_trip(self):
+        """Преобразование в колонки и обратно не теряет данных"""
+        columns = self.data.to_columns()
+        assert len(columns) == 4
+        assert columns.fields == ["id", "project", "hours", "cost"]
+        assert columns.to_rows() == self.data
+        assert isinstance(columns.to_rows(), DictList2)
+
+    def test_numeric_columns_use_array(self):
+        """Целые и вещественные колонки упаковываются в array"""
+        columns = self.data.to_columns()
+        assert columns.column("id") == array("q", [3, 1, 2, 4])
+        assert columns.column("cost").typecode == "d"
+        assert isinstance(columns.column("hours"), list)
+
+    def test_filter_and_sort(self):
+        """filter() и sort() работают как в DictList2"""
+        columns = self.data.to_columns()
+        assert (
+            columns.filter({"project": "A"}, order="id").to_rows()
+            == self.data.filter({"project": "A"}, order="id")
+        )
+        assert columns.filter({"hours": None}).to_rows() == [
+            {"id": 1, "project": "B", "hours": None, "cost": 2.0},
+            {"id": 2, "project": "A", "cost": 0.5},
+        ]
+        assert columns.sort(
+            ["cost", "id"], reverse=True
+        ).to_rows() == self.data.sort(["cost", "id"], reverse=True)
+
+    def test_aggregate(self):
+        """aggregate() даёт тот же результат, что и DictList2"""
+        aggregations = {
+            "hours": ["sum", "avg", "min", "max"],
+            "cost": "sum",
+            "id": "count",
+        }
+        for group in ("project", None, ["project", "id"]):
+            columns = self.data.to_columns().aggregate(group, aggregations)
+            assert columns.to_rows() == self.data.aggregate(
+                group, aggregations
+            )
+
+    def test_join(self):
+        """join() и left_join() совпадают с DictList2"""
+        right = [
+            {"id": 1, "role": "Admin", "project": "Z"},
+            {"id": 1, "role": "Owner"},
+            {"id": 3, "role": "User"},
+        ]
+        columns = self.data.to_columns()
+        assert columns.join(right, key="id").to_rows() == self.data.join(
+            right, key="id"
+        )
+        assert columns.left_join(
+            ColumnarDictList.from_rows(right), key="id"
+        ).to_rows() == self.data.left_join(right, key="id")
+
+    def test_sort_missing_field(self):
+        """Сортировка по полю, которого нет в части строк, — KeyError"""
+        with pytest.raises(KeyError):
+            self.data.to_columns().sort("hours")
+
+    def test_empty(self):
+        """Пустой список без колонок ведёт себя как DictList2"""
+        empty = DictList2([])
+        columns = empty.to_columns()
+        right = [{"id": 1, "role": "Admin"}]
+        assert columns.sort("x").to_rows() == empty.sort(by="x") == []
+        assert columns.sort(["x", "y"], reverse=True).to_rows() == []
+        assert columns.filter({"x": 1}).to_rows() == []
+        assert columns.aggregate("x", {"y": "sum"}).to_rows() == []
+        assert columns.join(right, key="id").to_rows() == []
+        assert columns.left_join(right, key="id").to_rows() == []
+        assert self.data.to_columns().left_join(
+            [], key="id"
+        ).to_rows() == self.data.left_join([], key="id")
+
+    def test_filter_logical(self):
+        """filter() с and / or / not совпадает с DictList2"""
+        columns = self.data.to_columns()
+        for where in (
+            {"or": [{"project": "B"}, {"hours": {">": 5}}]},
+            {"not": {"project": "A"}, "cost": {">=": 1}},
+            {"and": [{"project": "A"}, {"or": [{"id": 2}, {"id": 3}]}]},
+            {"or": []},
+            [("and", []), ("project", "A")],
+        ):
+            assert columns.filter(where).to_rows() == self.data.filter(where)
+        result = columns.filter({"or": [{"id": 4}, {"id": 1}]}, order="id")
+        assert [row["id"] for row in result] == [1, 4]
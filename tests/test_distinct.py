@@ -1,4 +1,5 @@
 import logging  # noqa
+import pytest
 
 from dictlist2 import DictList2
 
@@ -13,6 +14,9 @@ class TestDistinct:
     3. Уникальность по нескольким полям.
     4. Поведение с пустым списком.
     5. Поведение при одинаковых значениях и разных дополнительных ключах.
+    6. Отсутствующее поле равно None.
+    7. Списки и словари в значениях полей.
+    8. order="first_seen" / None — порядок первого появления без сортировки.
     """
 
     def test_distinct_all_fields(self):
@@ -89,3 +93,51 @@ class TestDistinct:
             {"project": "B"},
         ]
         assert data.distinct(by=["project"]) == expected
+
+    def test_distinct_missing_field_is_none(self):
+        """Строка без поля попадает в ту же группу, что и None"""
+        data = DictList2(
+            [
+                {"project": "A", "name": "Anna"},
+                {"name": "Anna"},
+                {"project": None, "name": "Anna"},
+            ]
+        )
+        expected = [
+            {"project": None, "name": "Anna"},
+            {"project": "A", "name": "Anna"},
+        ]
+        assert data.distinct(by=["project", "name"]) == expected
+
+    def test_distinct_unhashable_values(self):
+        """Поля со списками и словарями сравниваются по содержимому"""
+        data = DictList2(
+            [
+                {"id": 1, "tags": ["b"], "meta": {"a": 1}},
+                {"id": 2, "tags": ["a"], "meta": {"a": 1}},
+                {"id": 3, "tags": ["b"], "meta": {"a": 1}},
+            ]
+        )
+        assert data.distinct(by="tags") == [
+            {"tags": ["a"]},
+            {"tags": ["b"]},
+        ]
+        assert data.distinct(digest=True) == data
+
+    def test_distinct_first_seen_order(self):
+        """Порядок первого появления; int и None в одном поле"""
+        data = DictList2(
+            [
+                {"id": 3, "project": 7},
+                {"id": 1, "project": None},
+                {"id": 2, "project": 7},
+                {"id": 4, "project": 2},
+            ]
+        )
+        expected = [{"project": 7}, {"project": None}, {"project": 2}]
+        assert data.distinct(by="project", order="first_seen") == expected
+        assert data.distinct(by="project", order=None) == expected
+        with pytest.raises(TypeError):
+            data.distinct(by="project")
+        with pytest.raises(ValueError, match="group order"):
+            data.distinct(by="project", order="random")
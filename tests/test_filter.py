@@ -94,3 +94,70 @@ class TestDictList2Filter:
         data = DictList2([])
         result = data.filter(where={"name": "Alice"})
         assert result == []
+
+
+class TestDictList2FilterOperators:
+    """
+    Тесты операторов и логики в условии `filter()`.
+
+    Сценарии:
+    ---------
+    1. Операторы сравнения, in / not in, startswith, is None.
+    2. Логические and / or / not, в том числе вложенные.
+    3. Несколько операторов на одно поле.
+    4. Словарь, не являющийся набором операторов, сравнивается целиком.
+    """
+
+    data = DictList2(
+        [
+            {"id": 1, "name": "Alice", "role": "Admin", "hours": 8},
+            {"id": 2, "name": "Bob", "role": "User", "hours": None},
+            {"id": 3, "name": "Anna", "role": "Guest"},
+            {"id": 4, "name": None, "role": "User", "hours": 2},
+        ]
+    )
+
+    def ids(self, where):
+        return [row["id"] for row in self.data.filter(where)]
+
+    def test_operators(self):
+        """Операторы сравнения и принадлежности"""
+        assert self.ids({"role": {"!=": "User"}}) == [1, 3]
+        assert self.ids({"role": {"==": "User"}}) == [2, 4]
+        assert self.ids({"hours": {">": 2}}) == [1]
+        assert self.ids({"hours": {"<=": 8}}) == [1, 4]
+        assert self.ids({"role": {"in": ["Admin", "Guest"]}}) == [1, 3]
+        assert self.ids({"role": {"not in": ("Admin", "Guest")}}) == [2, 4]
+        assert self.ids({"name": {"startswith": "A"}}) == [1, 3]
+        assert self.ids({"name": {"startswith": ["B", "Al"]}}) == [1, 2]
+        assert self.ids({"hours": {"is None": True}}) == [2, 3]
+        assert self.ids({"hours": {"is None": False}}) == [1, 4]
+        assert self.ids({"id": {"in": [[1], 2]}}) == [2]
+
+    def test_logic(self):
+        """Логические and / or / not"""
+        assert self.ids({"or": [{"role": "Admin"}, {"hours": 2}]}) == [1, 4]
+        assert self.ids({"not": {"role": "User"}}) == [1, 3]
+        assert self.ids(
+            {
+                "and": [
+                    {"name": {"startswith": "A"}},
+                    {"or": [{"hours": {">": 5}}, {"role": "Guest"}]},
+                ],
+                "not": {"id": 1},
+            }
+        ) == [3]
+        assert self.ids({"or": []}) == []
+        assert self.ids({"and": []}) == [1, 2, 3, 4]
+
+    def test_several_operators_on_field(self):
+        """Несколько операторов на одно поле объединяются через «и»"""
+        assert self.ids({"id": {">": 1, "!=": 3, "between": (0, 9)}}) == [
+            2,
+            4,
+        ]
+
+    def test_plain_dict_value(self):
+        """Словарь без операторов сравнивается как значение"""
+        data = DictList2([{"meta": {"a": 1}}, {"meta": {">": 1}}])
+        assert data.filter({"meta": {"a": 1}}) == [{"meta": {"a": 1}}]
@@ -1,5 +1,7 @@
 import logging  # noqa
 
+import pytest
+
 from dictlist2 import DictList2
 
 
@@ -15,6 +17,10 @@ class TestDictList2GenFilter:
     4. Сортировка внутри группы по нескольким полям.
     5. Сортировка по словарю с направлениями ('asc', 'desc').
     6. Обработка пустого списка.
+    7. Топ-N по группам (limit) совпадает с сортировкой и срезом.
+    8. Словарь order с разными направлениями полей.
+    9. group_order="first_seen" — группы в порядке первого появления.
+    10. Поле словаря order отсутствует в части строк — без KeyError.
     """
 
     def test_group_by_single_field(self):
@@ -93,3 +99,119 @@ class TestDictList2GenFilter:
         data = DictList2([])
         result = list(data.gen_filter(by="group"))
         assert result == []
+
+    def test_group_order_matches_distinct(self):
+        """Группы выдаются в порядке distinct(), строки — в порядке списка"""
+        data = DictList2(
+            [
+                {"p": "B", "n": 1},
+                {"p": "A", "n": 2},
+                {"p": None, "n": 3},
+                {"p": "B", "n": 4},
+            ]
+        )
+        result = list(data.gen_filter(by="p"))
+        assert [key for key, _ in result] == data.distinct("p")
+        assert [[row["n"] for row in group] for _, group in result] == [
+            [3],
+            [2],
+            [1, 4],
+        ]
+
+    def test_group_by_none_uses_whole_row(self):
+        """by=None — группа по всей строке, дубликаты попадают в группу"""
+        data = DictList2(
+            [
+                {"id": 1, "name": "Alice"},
+                {"id": 2, "name": "Bob"},
+                {"id": 1, "name": "Alice"},
+            ]
+        )
+        result = list(data.gen_filter(by=None))
+        assert [key for key, _ in result] == data.distinct()
+        assert [len(group) for _, group in result] == [2, 1]
+
+        nested = DictList2(
+            [{"id": 1, "tags": ["a"]}, {"id": 1, "tags": ["a"]}, {"id": 2}]
+        )
+        result = list(nested.gen_filter(by=None))
+        assert [len(group) for _, group in result] == [2, 1]
+
+    def test_limit_top_n_per_group(self):
+        """Первые limit строк каждой группы, как после полной сортировки"""
+        data = DictList2(
+            [
+                {"project": "AB"[i % 2], "user": i, "hours": (i * 7) % 5}
+                for i in range(40)
+            ]
+        )
+        for order in ({"hours": "desc"}, "hours", ["hours", "user"]):
+            expected = [
+                (key, group[:3])
+                for key, group in data.gen_filter(by="project", order=order)
+            ]
+            result = list(data.gen_filter(by="project", order=order, limit=3))
+            assert result == expected
+
+        first = list(data.gen_filter(by="project", limit=2))
+        assert first == [
+            ({"project": "A"}, data[0:4:2]),
+            ({"project": "B"}, data[1:4:2]),
+        ]
+
+    def test_order_dict_mixed_directions(self):
+        """Разные направления в order сортируют каждое поле по-своему"""
+        data = DictList2(
+            [
+                {"team": "A", "hours": 2, "user": "Ivan"},
+                {"team": "A", "hours": 5, "user": "Anna"},
+                {"team": "A", "hours": 2, "user": "Boris"},
+                {"team": "A", "hours": 5, "user": "Oleg"},
+            ]
+        )
+        order = {"hours": "desc", "user": "asc"}
+        ((_, group),) = data.gen_filter(by="team", order=order)
+        assert [row["user"] for row in group] == [
+            "Anna",
+            "Oleg",
+            "Boris",
+            "Ivan",
+        ]
+        ((_, group),) = data.gen_filter(by="team", order=order, limit=3)
+        assert [row["user"] for row in group] == ["Anna", "Oleg", "Boris"]
+
+    def test_group_order_first_seen(self):
+        """Группы в порядке первого появления, с limit и без"""
+        data = DictList2(
+            [
+                {"team": "B", "hours": 1},
+                {"team": None, "hours": 2},
+                {"team": "A", "hours": 3},
+                {"team": "B", "hours": 4},
+            ]
+        )
+        for limit in (None, 1):
+            groups = data.gen_filter(
+                by="team", order="hours", limit=limit, group_order="first_seen"
+            )
+            assert [key["team"] for key, _ in groups] == ["B", None, "A"]
+
+    def test_order_dict_missing_field(self):
+        """Поле словаря order, которого нет в части строк, — как None"""
+        data = DictList2(
+            [
+                {"p": "A", "h": 1},
+                {"p": "B", "h": 2, "x": 3},
+                {"p": "A", "h": 3},
+            ]
+        )
+        for limit in (None, 1):
+            groups = data.gen_filter("p", order={"x": "desc"}, limit=limit)
+            groups = list(groups)
+            assert [key["p"] for key, _ in groups] == ["A", "B"]
+            assert groups[1][1] == [{"p": "B", "h": 2, "x": 3}]
+        ((_, group), _) = data.gen_filter("p", order={"x": "asc", "h": "desc"})
+        assert [row["h"] for row in group] == [3, 1]
+
+        with pytest.raises(KeyError):
+            list(data.gen_filter("p", order="x"))
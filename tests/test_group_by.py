@@ -144,3 +144,91 @@ class TestDictList2GroupBy:
         )
         result = data.group_by(group_columns=None, total_columns=None)
         assert result == DictList2([])
+
+    def test_group_by_order_matches_distinct(self):
+        """
+        ✅ Однопроходная группировка сохраняет порядок групп distinct().
+        """
+        data = DictList2(
+            [
+                {"day": "2025-06-02", "hours": 1},
+                {"day": None, "hours": 2},
+                {"day": "2025-06-01", "hours": 3},
+                {"day": "2025-06-02", "hours": 4},
+            ]
+        )
+        result = data.group_by(group_columns="day", total_columns="hours")
+        assert result == [
+            {"day": None, "hours": 2},
+            {"day": "2025-06-01", "hours": 3},
+            {"day": "2025-06-02", "hours": 5},
+        ]
+
+    def test_group_by_many_groups(self):
+        """
+        ✅ Итоги совпадают с суммой по отфильтрованной группе.
+        """
+        data = DictList2(
+            [{"g": i % 13, "v": i, "w": 1} for i in range(1000)]
+        )
+        result = data.group_by(group_columns="g", total_columns=["v", "w"])
+        assert [row["g"] for row in result] == list(range(13))
+        for row in result:
+            group = data.filter({"g": row["g"]})
+            assert row["v"] == sum(item["v"] for item in group)
+            assert row["w"] == len(group)
+
+    def test_group_by_workers(self):
+        """
+        ✅ Группировка в нескольких процессах совпадает с однопроцессной.
+        """
+        data = DictList2(
+            [
+                {"g": [None, "", str(i % 5)][i % 3], "v": i * 0.1, "w": i}
+                for i in range(300)
+            ]
+        )
+        for order in ("sorted", "first_seen"):
+            expected = data.group_by(
+                group_columns="g", total_columns=["v", "w"], group_order=order
+            )
+            result = data.group_by(
+                group_columns="g",
+                total_columns=["v", "w"],
+                workers=3,
+                group_order=order,
+            )
+            assert result == expected
+
+    def test_group_by_max_groups(self):
+        """
+        ✅ Группировка с выгрузкой на диск совпадает с группировкой в памяти.
+        """
+        data = DictList2(
+            [{"g": i % 41, "h": i % 2, "v": i * 0.5} for i in range(400)]
+        )
+        expected = data.group_by(group_columns=["g", "h"], total_columns="v")
+        result = data.group_by(
+            group_columns=["g", "h"], total_columns="v", max_groups=4
+        )
+        assert result == expected
+
+    def test_group_by_group_order(self):
+        """
+        ✅ group_order="first_seen" — группы в порядке первого появления
+        при любом способе вычисления.
+        """
+        data = DictList2(
+            [{"g": (i * 7) % 23, "v": i} for i in range(200)]
+            + [{"g": None, "v": 1}]
+        )
+        seen = list(dict.fromkeys(row["g"] for row in data))
+        for options in ({}, {"workers": 2}, {"max_groups": 3}):
+            result = data.group_by(
+                "g", "v", group_order="first_seen", **options
+            )
+            assert [row["g"] for row in result] == seen
+            unordered = data.group_by("g", "v", group_order=None, **options)
+            assert sorted(
+                unordered, key=lambda row: seen.index(row["g"])
+            ) == list(result)
@@ -0,0 +1,191 @@
+import logging  # noqa
+import pytest
+
+from dictlist2 import DictList2
+
+
+class TestDictList2HashIndex:
+    """
+    Тесты хэш-индексов `create_index()` класса DictList2.
+
+    Сценарии:
+    ---------
+    1. filter() по индексу совпадает с полным просмотром.
+    2. filter() действительно использует индекс.
+    3. Изменение списка делает индекс устаревшим — он перестраивается.
+    4. join() / left_join() используют индекс правого списка.
+    5. gen_filter(), group_by() и aggregate() используют индекс.
+    6. drop_index() удаляет индекс.
+    """
+
+    def make(self):
+        return DictList2(
+            [
+                {"id": i, "project": "AB"[i % 2], "hours": i}
+                for i in range(10)
+            ]
+        )
+
+    def test_filter_with_index(self):
+        """Результат фильтра по индексу совпадает с полным просмотром"""
+        plain = self.make()
+        data = self.make()
+        data.create_index("project")
+        data.create_index(["project", "id"])
+        for where in (
+            {"project": "A"},
+            {"project": "B", "id": 3},
+            {"project": "B", "hours": 5},
+            {"project": "C"},
+        ):
+            assert data.filter(where) == plain.filter(where)
+
+    def test_filter_uses_index(self):
+        """Изменение словаря в обход списка не видно индексу"""
+        data = self.make()
+        data.create_index("project")
+        data[0]["project"] = "Z"  # строка меняется, список — нет
+        assert data.filter({"project": "Z"}) == []
+
+    def test_index_invalidated_on_mutation(self):
+        """append, __setitem__, del и др. перестраивают индекс"""
+        data = self.make()
+        data.create_index("project")
+        data.append({"id": 10, "project": "C"})
+        assert data.filter({"project": "C"}) == [{"id": 10, "project": "C"}]
+        data[0] = {"id": 0, "project": "C"}
+        assert [r["id"] for r in data.filter({"project": "C"})] == [0, 10]
+        del data[0]
+        data.extend([{"id": 11, "project": "C"}])
+        assert [r["id"] for r in data.filter({"project": "C"})] == [10, 11]
+        data.reverse()
+        assert [r["id"] for r in data.filter({"project": "C"})] == [11, 10]
+        data.clear()
+        assert data.filter({"project": "C"}) == []
+
+    def test_join_uses_right_index(self):
+        """join() и left_join() используют индекс правого списка"""
+        left = DictList2([{"id": 1, "a": 1}, {"id": 2, "a": 2}])
+        right = DictList2([{"id": 1, "b": 1}, {"id": 1, "b": 2}])
+        expected_inner = left.join(right, key="id")
+        expected_left = left.left_join(right, key="id")
+        right.create_index("id")
+        assert left.join(right, key="id") == expected_inner
+        assert left.left_join(right, key="id") == expected_left
+        right[0]["id"] = 5  # индекс устарел в обход списка
+        assert len(left.join(right, key="id")) == 2
+
+    def test_grouping_uses_index(self):
+        """gen_filter(), group_by() и aggregate() по индексу"""
+        plain = self.make()
+        data = self.make()
+        data.create_index("project")
+        assert data.group_by("project", "hours") == plain.group_by(
+            "project", "hours"
+        )
+        assert data.aggregate(
+            "project", {"hours": ["sum", "max"]}
+        ) == plain.aggregate("project", {"hours": ["sum", "max"]})
+        assert list(data.gen_filter("project", order="id")) == list(
+            plain.gen_filter("project", order="id")
+        )
+
+    def test_drop_index(self):
+        """После drop_index() используется полный просмотр"""
+        data = self.make()
+        data.create_index("project")
+        data.drop_index("project")
+        data[0]["project"] = "Z"
+        assert data.filter({"project": "Z"}) == [data[0]]
+
+
+class TestDictList2SortedIndex:
+    """
+    Тесты упорядоченного индекса `create_index(..., kind="sorted")`.
+
+    Сценарии:
+    ---------
+    1. Диапазоны в filter() без индекса и с индексом дают одно и то же.
+    2. filter(order=поле) берёт порядок из индекса.
+    3. sort(by=поле, use_index=True) использует индекс и совпадает с
+       обычной сортировкой.
+    4. None и отсутствующие значения не попадают в диапазон.
+    5. Неверный вид индекса — ValueError.
+    """
+
+    def make(self):
+        return DictList2(
+            [{"id": i, "ts": (i * 7) % 10, "g": i % 3} for i in range(20)]
+        )
+
+    def test_range_filter(self):
+        """Диапазоны с индексом и без совпадают"""
+        plain = self.make()
+        data = self.make()
+        data.create_index("ts", kind="sorted")
+        for where in (
+            {"ts": {"between": (2, 5)}},
+            {"ts": {">=": 3, "<": 7}},
+            {"ts": {">": 8}},
+            {"ts": {"<=": 0}},
+            {"ts": {">": 3, ">=": 6, "<": 9}},
+            {"ts": {"between": (2, 5)}, "g": 1},
+        ):
+            assert data.filter(where) == plain.filter(where)
+            assert data.filter(where, order="ts") == plain.filter(
+                where, order="ts"
+            )
+        result = plain.filter({"ts": {">=": 3, "<": 5}})
+        assert [r["ts"] for r in result] == [4, 3, 4, 3]
+
+    def test_filter_order_uses_index(self):
+        """Порядок по полю индекса берётся из индекса"""
+        data = self.make()
+        data.create_index("ts", kind="sorted")
+        data[0]["ts"] = 100  # в обход списка: индекс этого не видит
+        result = data.filter({"ts": {"<=": 1}}, order="ts")
+        assert [r["id"] for r in result] == [10, 3, 13]
+
+    def test_sort_uses_index(self):
+        """sort() по полю индекса совпадает с обычной сортировкой"""
+        plain = self.make()
+        data = self.make()
+        data.create_index("ts", kind="sorted")
+        for reverse in (False, True):
+            assert data.sort(
+                "ts", reverse=reverse, use_index=True
+            ) == plain.sort("ts", reverse=reverse)
+            assert data.sort(
+                ["ts"], reverse=reverse, use_index=True
+            ) == plain.sort(["ts"], reverse=reverse)
+        data.append({"id": 99, "ts": -1, "g": 0})
+        assert data.sort("ts", use_index=True)[0]["id"] == 99
+
+    def test_sort_after_in_place_edit(self):
+        """Без use_index sort() не зависит от индекса; refresh_indexes()"""
+        data = DictList2([{"t": 1}, {"t": 2}, {"t": 3}])
+        data.create_index("t", kind="sorted")
+        data.create_index("t")
+        data[0]["t"] = 0
+        data[2]["t"] = -1
+        assert data.sort("t") == [{"t": -1}, {"t": 0}, {"t": 2}]
+        assert data.top(1, "t") == [{"t": 2}]
+        data.refresh_indexes()
+        assert data.sort("t", use_index=True) == data.sort("t")
+        assert data.bottom(2, "t", use_index=True) == data.bottom(2, "t")
+        assert data.filter({"t": -1}) == [{"t": -1}]
+
+    def test_none_not_in_range(self):
+        """None и отсутствующее поле не удовлетворяют диапазону"""
+        data = DictList2([{"ts": None}, {}, {"ts": 1}])
+        assert data.filter({"ts": {"<": 5}}) == [{"ts": 1}]
+        data.create_index("ts", kind="sorted")
+        assert data.filter({"ts": {"<": 5}}) == [{"ts": 1}]
+
+    def test_invalid_kind(self):
+        """Неизвестный вид индекса или несколько полей — ValueError"""
+        data = self.make()
+        with pytest.raises(ValueError, match="Unknown index kind"):
+            data.create_index("ts", kind="btree")
+        with pytest.raises(ValueError, match="single field"):
+            data.create_index(["ts", "g"], kind="sorted")
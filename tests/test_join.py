@@ -91,3 +91,54 @@ class TestDictList2Join:
         ]
         with pytest.raises(KeyError):
             left.join(right, key="id")
+
+    def test_multi_match_join(self):
+        """Каждая пара совпавших строк даёт отдельную строку"""
+        left = DictList2(
+            [
+                {"id": 1, "name": "Alice"},
+                {"id": 2, "name": "Bob"},
+            ]
+        )
+        right = [
+            {"id": 1, "role": "Admin"},
+            {"id": 1, "role": "Owner"},
+            {"id": 2, "role": "User"},
+        ]
+        result = left.join(right, key="id")
+        assert result == [
+            {"id": 1, "name": "Alice", "role": "Admin"},
+            {"id": 1, "name": "Alice", "role": "Owner"},
+            {"id": 2, "name": "Bob", "role": "User"},
+        ]
+
+    def test_composite_key_join(self):
+        """Inner join по составному ключу"""
+        left = DictList2(
+            [
+                {"tenant": "a", "id": 1, "name": "Alice"},
+                {"tenant": "b", "id": 1, "name": "Bob"},
+            ]
+        )
+        right = [
+            {"tenant": "b", "id": 1, "role": "User"},
+            {"tenant": "c", "id": 1, "role": "Guest"},
+        ]
+        result = left.join(right, key=["tenant", "id"])
+        assert result == [
+            {"tenant": "b", "id": 1, "name": "Bob", "role": "User"}
+        ]
+
+    def test_build_on_smaller_left_keeps_order(self):
+        """Индекс по меньшему левому списку сохраняет порядок левых строк"""
+        left = DictList2([{"id": 2, "n": "x"}, {"id": 1, "n": "y"}])
+        right = [{"id": i % 3, "v": i} for i in range(9)]
+        result = left.join(right, key="id")
+        assert [(row["n"], row["v"]) for row in result] == [
+            ("x", 2),
+            ("x", 5),
+            ("x", 8),
+            ("y", 1),
+            ("y", 4),
+            ("y", 7),
+        ]
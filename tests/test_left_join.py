@@ -99,3 +99,43 @@ class TestDictList2LeftJoin:
         ]
         with pytest.raises(KeyError):
             left.left_join(right, key="id")
+
+    def test_left_join_multi_match(self):
+        """
+        ✅ Левая строка повторяется для каждого правого совпадения.
+        """
+        left = DictList2(
+            [
+                {"id": 1, "name": "Alice"},
+                {"id": 3, "name": "Charlie"},
+            ]
+        )
+        right = [
+            {"id": 1, "role": "Admin"},
+            {"id": 1, "role": "Owner"},
+            {"id": 2, "role": "User"},
+            {"id": 4, "role": "Guest"},
+        ]
+        result = left.left_join(right, key="id")
+        assert result == [
+            {"id": 1, "name": "Alice", "role": "Admin"},
+            {"id": 1, "name": "Alice", "role": "Owner"},
+            {"id": 3, "name": "Charlie"},
+        ]
+
+    def test_left_join_composite_key(self):
+        """
+        ✅ Left join по составному ключу.
+        """
+        left = DictList2(
+            [
+                {"tenant": "a", "id": 1},
+                {"tenant": "b", "id": 1},
+            ]
+        )
+        right = [{"tenant": "a", "id": 1, "role": "Admin"}]
+        result = left.left_join(right, key=["tenant", "id"])
+        assert result == [
+            {"tenant": "a", "id": 1, "role": "Admin"},
+            {"tenant": "b", "id": 1},
+        ]
@@ -0,0 +1,92 @@
+import logging  # noqa
+import pytest
+
+from dictlist2 import DictList2
+
+
+class TestDictList2MergeJoin:
+    """
+    Тесты метода `merge_join()` класса DictList2.
+
+    Сценарии:
+    ---------
+    1. Inner join совпадает с hash join на отсортированных данных.
+    2. Left / right / full — несовпавшие строки сохраняются.
+    3. Серии одинаковых ключей с обеих сторон (многие ко многим).
+    4. Составной ключ.
+    5. Неотсортированный вход — ValueError.
+    """
+
+    left = DictList2(
+        [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": "Bob"},
+            {"id": 4, "name": "Dan"},
+        ]
+    )
+    right = [
+        {"id": 2, "role": "User"},
+        {"id": 3, "role": "Guest"},
+        {"id": 4, "role": "Admin"},
+    ]
+
+    def test_inner_matches_hash_join(self):
+        """Inner merge join даёт тот же результат, что и join()"""
+        result = self.left.merge_join(self.right, key="id")
+        assert result == self.left.join(self.right, key="id")
+
+    def test_outer_variants(self):
+        """Left, right и full сохраняют несовпавшие строки"""
+        assert self.left.merge_join(self.right, "id", how="left") == [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": "Bob", "role": "User"},
+            {"id": 4, "name": "Dan", "role": "Admin"},
+        ]
+        assert self.left.merge_join(self.right, "id", how="right") == [
+            {"id": 2, "name": "Bob", "role": "User"},
+            {"id": 3, "role": "Guest"},
+            {"id": 4, "name": "Dan", "role": "Admin"},
+        ]
+        assert self.left.merge_join(self.right, "id", how="full") == [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": "Bob", "role": "User"},
+            {"id": 3, "role": "Guest"},
+            {"id": 4, "name": "Dan", "role": "Admin"},
+        ]
+
+    def test_many_to_many(self):
+        """Каждая пара строк с одинаковым ключом даёт строку результата"""
+        left = DictList2([{"k": 1, "a": 1}, {"k": 1, "a": 2}, {"k": 2}])
+        right = [{"k": 1, "b": 1}, {"k": 1, "b": 2}, {"k": 2, "b": 3}]
+        result = left.merge_join(right, key="k")
+        assert [(row.get("a"), row["b"]) for row in result] == [
+            (1, 1),
+            (1, 2),
+            (2, 1),
+            (2, 2),
+            (None, 3),
+        ]
+
+    def test_composite_key(self):
+        """Соединение по составному ключу"""
+        left = DictList2(
+            [{"t": "a", "id": 1, "x": 1}, {"t": "b", "id": 1, "x": 2}]
+        )
+        right = [{"t": "b", "id": 1, "y": 3}]
+        result = left.merge_join(right, key=["t", "id"])
+        assert result == [{"t": "b", "id": 1, "x": 2, "y": 3}]
+
+    def test_unsorted_input(self):
+        """Неотсортированный вход — ValueError"""
+        left = DictList2([{"id": 2}, {"id": 1}])
+        with pytest.raises(ValueError, match="not sorted"):
+            left.merge_join([{"id": 1}], key="id")
+        with pytest.raises(ValueError, match="right input is not sorted"):
+            DictList2([{"id": 1}]).merge_join(
+                [{"id": 3}, {"id": 2}], key="id", how="full"
+            )
+
+    def test_unknown_join_type(self):
+        """Неизвестный тип соединения — ValueError"""
+        with pytest.raises(ValueError, match="Unknown join type"):
+            self.left.merge_join(self.right, key="id", how="cross")
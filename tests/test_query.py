@@ -0,0 +1,112 @@
+import logging  # noqa
+import pytest
+
+from dictlist2 import DictList2, Query
+
+
+class TestDictList2Query:
+    """
+    Тесты ленивого конвейера `query()` класса DictList2.
+
+    Сценарии:
+    ---------
+    1. Результат совпадает с цепочкой обычных методов.
+    2. Данные не читаются до collect() / итерации.
+    3. Соседние фильтры и проекция выполняются за один проход.
+    4. Фильтр по ключу опускается ниже join (и сортировки).
+    5. Фильтр по неключевому полю остаётся после join.
+    6. Неизвестный тип соединения — ValueError.
+    """
+
+    data = DictList2(
+        [
+            {"id": 1, "project": "A", "role": "User", "hours": 2},
+            {"id": 2, "project": "B", "role": "Admin", "hours": 5},
+            {"id": 3, "project": "A", "role": "User", "hours": 4},
+            {"id": 4, "project": "B", "role": "User", "hours": 1},
+        ]
+    )
+    teams = [
+        {"id": 1, "team": "x"},
+        {"id": 3, "team": "y"},
+        {"id": 4, "team": "x"},
+    ]
+
+    def test_same_result_as_eager_chain(self):
+        """Ленивый конвейер даёт тот же результат, что и цепочка методов"""
+        eager = (
+            self.data.filter({"role": "User"})
+            .join(self.teams, key="id")
+            .aggregate("team", {"hours": ["sum", "count"]})
+        )
+        lazy = (
+            self.data.query()
+            .where({"role": "User"})
+            .join(self.teams, key="id")
+            .group("team", {"hours": ["sum", "count"]})
+            .collect()
+        )
+        assert lazy == eager
+        assert isinstance(lazy, DictList2)
+
+    def test_nothing_read_before_iteration(self):
+        """Источник не читается, пока результат не запрошен"""
+        reads = []
+
+        def source():
+            for row in self.data:
+                reads.append(row["id"])
+                yield row
+
+        query = Query(source()).where({"role": "User"}).select(["id"])
+        assert reads == []
+        assert next(iter(query)) == {"id": 1}
+        assert reads == [1]
+
+    def test_row_steps_fused(self):
+        """Подряд идущие where/select выполняются в одном проходе"""
+        query = (
+            self.data.query()
+            .where({"role": "User"})
+            .select(["id", "hours", "role"])
+            .where({"hours": 4})
+        )
+        assert query.explain() == [
+            "scan + where(role='User', hours=4) + select(id, hours, role)"
+        ]
+        assert query.collect() == [{"id": 3, "hours": 4, "role": "User"}]
+
+    def test_key_filter_pushed_below_join(self):
+        """Фильтр по ключу выполняется до сортировки и соединения"""
+        query = (
+            self.data.query()
+            .sort("hours")
+            .join(self.teams, key="id")
+            .where({"id": 3})
+        )
+        assert query.explain() == [
+            "scan + where(id=3)",
+            "sort(by='hours', reverse=False)",
+            "join(key='id', how='inner', right where(id=3))",
+        ]
+        assert query.collect() == [
+            {"id": 3, "project": "A", "role": "User", "hours": 4, "team": "y"}
+        ]
+
+    def test_non_key_filter_stays_after_join(self):
+        """Фильтр по полю правой стороны остаётся после соединения"""
+        query = (
+            self.data.query()
+            .join(self.teams, key="id", how="left")
+            .where({"team": "x"})
+        )
+        assert query.explain() == [
+            "scan",
+            "join(key='id', how='left') + where(team='x')",
+        ]
+        assert [row["id"] for row in query] == [1, 4]
+
+    def test_unknown_join_type(self):
+        """Неизвестный тип соединения — ValueError"""
+        with pytest.raises(ValueError, match="Unknown join type"):
+            self.data.query().join(self.teams, key="id", how="full")
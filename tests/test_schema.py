@@ -0,0 +1,97 @@
+import logging  # noqa
+import pickle
+import sys
+
+import pytest
+
+from dictlist2 import DictList2, Record
+
+
+class TestDictList2WithSchema:
+    """
+    Тесты компактного представления строк with_schema().
+
+    Сценарии:
+    ---------
+    1. Строки читаются как словари и равны исходным.
+    2. Отсутствующие поля: KeyError, get() и in как у dict.
+    3. filter / sort / aggregate / join дают те же результаты.
+    4. Поле вне схемы — ValueError.
+    5. Строки сериализуются pickle и занимают меньше памяти.
+    """
+
+    rows = [
+        {"id": 3, "name": "Charlie", "role": "User", "hours": 4},
+        {"id": 1, "name": "Alice", "role": "Admin", "hours": 2},
+        {"id": 2, "name": "Bob", "role": "User"},
+        {"id": 4, "name": "Dana", "role": None, "hours": 7},
+    ]
+
+    def test_rows_are_mappings(self):
+        """Record читается как словарь и равен исходной строке"""
+        data = DictList2(self.rows).with_schema()
+        row = data[0]
+        assert isinstance(row, Record)
+        assert row["name"] == "Charlie"
+        assert dict(row) == self.rows[0]
+        assert data == self.rows
+        assert list(row.items()) == list(self.rows[0].items())
+        assert {**row, "x": 1} == {**self.rows[0], "x": 1}
+
+    def test_missing_fields(self):
+        """Пропущенное поле ведёт себя как отсутствующий ключ словаря"""
+        row = DictList2(self.rows).with_schema()[2]
+        with pytest.raises(KeyError):
+            row["hours"]
+        assert row.get("hours") is None
+        assert row.get("hours", 0) == 0
+        assert "hours" not in row and "id" in row
+        assert len(row) == 3 and list(row) == ["id", "name", "role"]
+
+    def test_methods_match_dicts(self):
+        """Методы DictList2 работают со схемой так же, как со словарями"""
+        plain = DictList2(self.rows)
+        data = plain.with_schema(["id", "name", "role", "hours"])
+
+        where = {"role": {"in": ["User", None]}, "hours": {"is None": False}}
+        assert data.filter(where) == plain.filter(where)
+        assert data.filter({"role": "User"}, order="id") == plain.filter(
+            {"role": "User"}, order="id"
+        )
+        assert data.sort(by={"role": "desc", "id": "asc"}, nulls="last") == (
+            plain.sort(by={"role": "desc", "id": "asc"}, nulls="last")
+        )
+        complete = data.filter({"hours": {"is None": False}})
+        assert complete.sort(by="hours", reverse=True) == [
+            self.rows[3],
+            self.rows[0],
+            self.rows[1],
+        ]
+        with pytest.raises(KeyError):
+            data.sort(by="hours")
+        aggregations = {"hours": ["sum", "avg", "max"], "id": "count"}
+        assert data.aggregate("role", aggregations) == plain.aggregate(
+            "role", aggregations
+        )
+        roles = [{"role": "User", "level": 1}]
+        assert data.left_join(roles, "role") == plain.left_join(roles, "role")
+        assert data.unique() == plain.unique()
+
+    def test_field_outside_schema(self):
+        """Поле строки, которого нет в схеме"""
+        with pytest.raises(ValueError, match="Fields not in schema"):
+            DictList2(self.rows).with_schema(["id", "name"])
+
+    def test_pickle_and_memory(self):
+        """Record сериализуется и меньше словаря с теми же полями"""
+        data = DictList2(self.rows).with_schema()
+        assert pickle.loads(pickle.dumps(data[1])) == self.rows[1]
+
+        def size(row):
+            if isinstance(row, Record):
+                return sys.getsizeof(row) + sys.getsizeof(row._values)
+            return sys.getsizeof(row)
+
+        wide = {f"field_{i}": i for i in range(10)}
+        compact = DictList2([wide]).with_schema()[0]
+        assert size(compact) < size(wide)
@@ -105,3 +105,140 @@ def test_sort_preserves_original_type():
 
     result = data.sort(by="id")
     assert isinstance(result, DictList2)
+
+
+def test_sort_external_matches_in_memory():
+    """
+    Проверяет, что внешняя сортировка (max_rows) совпадает с сортировкой
+    в памяти, в том числе порядок равных ключей и reverse.
+    """
+    data = DictList2(
+        [{"g": i % 7, "h": (i * 13) % 5, "n": i} for i in range(100)]
+    )
+
+    for by in ("g", ["g", "h"]):
+        for reverse in (False, True):
+            result = data.sort(by=by, reverse=reverse, max_rows=9)
+            assert result == data.sort(by=by, reverse=reverse)
+            assert isinstance(result, DictList2)
+
+
+def test_sort_external_keeps_rows_and_errors():
+    """
+    Проверяет, что внешняя сортировка возвращает исходные словари,
+    бросает KeyError при отсутствии поля и проверяет max_rows.
+    """
+    data = DictList2([{"id": i % 4} for i in range(10)] + [{"x": 1}])
+
+    result = DictList2(data[:10]).sort(by="id", max_rows=3)
+    assert all(any(row is item for item in data) for row in result)
+
+    with pytest.raises(KeyError):
+        data.sort(by="id", max_rows=3)
+    with pytest.raises(ValueError, match="max_rows"):
+        data.sort(by="id", max_rows=0)
+
+
+def test_top_and_bottom_match_sort():
+    """
+    Проверяет, что top() и bottom() совпадают с первыми n строками sort(),
+    включая порядок равных ключей и составной ключ.
+    """
+    data = DictList2(
+        [{"g": (i * 7) % 5, "h": i % 3, "n": i} for i in range(60)]
+    )
+
+    for by in ("g", ["g", "h"]):
+        assert data.top(7, by=by) == data.sort(by=by, reverse=True)[:7]
+        assert data.bottom(7, by=by) == data.sort(by=by)[:7]
+        assert data.top(7, by=by, reverse=False) == data.bottom(7, by=by)
+
+    assert data.top(0, by="g") == []
+    assert data.top(100, by="g") == data.sort(by="g", reverse=True)
+    assert isinstance(data.top(3, by="g"), DictList2)
+
+
+def test_top_uses_sorted_index():
+    """
+    Проверяет top() по упорядоченному индексу и KeyError без поля.
+    """
+    data = DictList2([{"v": (i * 3) % 7, "n": i} for i in range(30)])
+    expected = data.top(5, by="v")
+    data.create_index("v", kind="sorted")
+    assert data.top(5, by="v", use_index=True) == expected
+    assert data.bottom(5, by=["v"], use_index=True) == data.sort(by="v")[:5]
+
+    with pytest.raises(KeyError):
+        DictList2([{"v": 1}, {"x": 2}]).top(1, by="v")
+
+
+def test_sort_mixed_directions():
+    """
+    Проверяет сортировку со своим направлением для каждого ключа: она
+    совпадает с последовательной устойчивой сортировкой, в том числе
+    для строк, reverse, внешней сортировки и top().
+    """
+    data = DictList2(
+        [
+            {"city": "MLP"[i % 3], "name": "abcd"[i % 4], "n": i}
+            for i in range(24)
+        ]
+    )
+    by = {"city": "asc", "name": "desc"}
+    expected = sorted(
+        sorted(data, key=lambda item: item["name"], reverse=True),
+        key=lambda item: item["city"],
+    )
+
+    assert data.sort(by=by) == expected
+    assert data.sort(by=by, max_rows=5) == expected
+    assert data.sort(by=by, reverse=True) == data.sort(
+        by={"city": "desc", "name": "asc"}
+    )
+    assert data.bottom(5, by=by) == expected[:5]
+    assert data.top(5, by=by) == data.sort(by=by, reverse=True)[:5]
+
+    with pytest.raises(ValueError, match="Unknown sort direction"):
+        data.sort(by={"city": "up"})
+
+
+def test_top_dict_directions():
+    """
+    Проверяет одно правило для любой формы by: top() — начало
+    sort(by, reverse=True), bottom() — начало sort(by), и они различны.
+    """
+    data = DictList2([{"s": 1}, {"s": 3}, {"s": 2}])
+
+    for by in ("s", ["s"], {"s": "asc"}):
+        assert data.top(2, by=by) == [{"s": 3}, {"s": 2}]
+        assert data.bottom(2, by=by) == [{"s": 1}, {"s": 2}]
+    desc = {"s": "desc"}
+    assert data.top(2, by=desc) == [{"s": 1}, {"s": 2}]
+    assert data.bottom(2, by=desc) == [{"s": 3}, {"s": 2}]
+    assert data.top(2, by=desc) != data.bottom(2, by=desc)
+    assert data.top(2, by=desc, reverse=False) == data.sort(by=desc)[:2]
+
+
+def test_sort_nulls_first_and_last():
+    """
+    Проверяет положение None при nulls="first" / "last" независимо от
+    направления и TypeError без параметра nulls.
+    """
+    data = DictList2(
+        [{"v": 2}, {"v": None}, {"v": 1}, {"v": None}, {"v": 3}]
+    )
+
+    values = [row["v"] for row in data.sort(by="v", nulls="last")]
+    assert values == [1, 2, 3, None, None]
+    values = [row["v"] for row in data.sort(by="v", nulls="first")]
+    assert values == [None, None, 1, 2, 3]
+    result = data.sort(by={"v": "desc"}, nulls="last")
+    assert [row["v"] for row in result] == [3, 2, 1, None, None]
+    result = data.sort(by="v", reverse=True, nulls="first", max_rows=2)
+    assert [row["v"] for row in result] == [None, None, 3, 2, 1]
+    assert data.top(2, by="v", nulls="first") == [{"v": None}, {"v": None}]
+
+    with pytest.raises(TypeError):
+        data.sort(by="v")
+    with pytest.raises(ValueError, match="nulls"):
+        data.sort(by="v", nulls="middle")
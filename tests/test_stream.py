@@ -0,0 +1,129 @@
+import json
+import logging  # noqa
+
+from dictlist2 import DictList2, DictStream
+
+
+class TestDictStream:
+    """
+    Тесты потоковой обработки DictStream.
+
+    Сценарии:
+    ---------
+    1. Построчные операции ленивые — источник не читается заранее.
+    2. filter / left_join / aggregate совпадают с DictList2.
+    3. unique и distinct совпадают с DictList2.
+    4. Чтение файла JSON Lines.
+    5. Внешняя сортировка потока совпадает с DictList2.sort().
+    6. Агрегация с max_groups возвращает поток с тем же результатом.
+    7. unique и distinct для строк со списками и словарями в значениях.
+    """
+
+    rows = [
+        {"id": 1, "project": "A", "hours": 2},
+        {"id": 2, "project": "B", "hours": 5},
+        {"id": 1, "project": "A", "hours": 2},
+        {"id": 3, "project": None, "hours": 1},
+    ]
+    roles = [{"id": 1, "role": "Admin"}, {"id": 3, "role": "User"}]
+
+    def test_row_operations_are_lazy(self):
+        """Источник читается только при потреблении результата"""
+        reads = []
+
+        def source():
+            for row in self.rows:
+                reads.append(row["id"])
+                yield row
+
+        stream = DictStream(source()).filter({"project": "A"}).unique()
+        stream = stream.left_join(self.roles, key="id")
+        assert reads == []
+        assert next(iter(stream)) == {
+            "id": 1,
+            "project": "A",
+            "hours": 2,
+            "role": "Admin",
+        }
+        assert reads == [1]
+
+    def test_matches_dictlist(self):
+        """Результаты совпадают с DictList2"""
+        data = DictList2(self.rows)
+        stream = DictStream(iter(self.rows))
+        assert stream.filter({"id": 1}).collect() == data.filter({"id": 1})
+
+        stream = DictStream(iter(self.rows)).left_join(self.roles, "id")
+        assert stream.collect() == data.left_join(self.roles, "id")
+
+        stream = DictStream(iter(self.rows)).join(self.roles, "id")
+        assert stream.collect() == data.join(self.roles, "id")
+
+        aggregations = {"hours": ["sum", "avg"], "id": "count"}
+        result = DictStream(iter(self.rows)).aggregate(
+            "project", aggregations
+        )
+        assert result == data.aggregate("project", aggregations)
+        assert isinstance(result, DictList2)
+
+    def test_unique_and_distinct(self):
+        """unique() и distinct() совпадают с DictList2"""
+        data = DictList2(self.rows)
+        assert DictStream(iter(self.rows)).unique().collect() == data.unique()
+        assert DictStream(iter(self.rows)).distinct() == data.distinct()
+        for by in ("project", ["project", "id"]):
+            assert DictStream(iter(self.rows)).distinct(by) == data.distinct(
+                by
+            )
+
+    def test_unique_and_distinct_nested_values(self):
+        """Строки со списками и словарями — как в DictList2"""
+        rows = [
+            {"id": 1, "tags": ["a", "b"], "meta": {"x": 1}},
+            {"id": 1, "tags": ["a", "b"], "meta": {"x": 1}},
+            {"id": 2, "tags": ["a"], "meta": {"x": 1}},
+        ]
+        data = DictList2(rows)
+        for digest in (False, True):
+            stream = DictStream(iter(rows)).unique(digest=digest)
+            assert stream.collect() == data.unique() == rows[1:]
+        assert DictStream(iter(rows)).distinct() == data.distinct()
+        for by in ("tags", ["meta", "id"]):
+            for order in ("sorted", "first_seen"):
+                result = DictStream(iter(rows)).distinct(by, order=order)
+                assert result == data.distinct(by, order=order)
+        assert DictStream(iter(rows)).distinct("tags") == [
+            {"tags": ["a"]},
+            {"tags": ["a", "b"]},
+        ]
+
+    def test_from_jsonl(self, tmp_path):
+        """Поток строк из файла JSON Lines"""
+        path = tmp_path / "rows.jsonl"
+        path.write_text(
+            "\n".join(json.dumps(row) for row in self.rows) + "\n\n",
+            encoding="utf-8",
+        )
+        result = DictStream.from_jsonl(str(path)).aggregate(
+            "project", {"hours": "sum"}
+        )
+        assert result == DictList2(self.rows).aggregate(
+            "project", {"hours": "sum"}
+        )
+
+    def test_external_sort(self):
+        """Сортировка частями по max_rows строк с выгрузкой на диск"""
+        rows = [{"k": (i * 7) % 10, "n": i} for i in range(50)]
+        stream = DictStream(iter(rows)).sort(["k"], reverse=True, max_rows=4)
+        expected = DictList2(rows).sort(["k"], reverse=True)
+        assert stream.collect() == expected
+
+    def test_aggregate_max_groups(self):
+        """Группы сверх бюджета выгружаются на диск, результат — поток"""
+        rows = [{"k": i % 23, "v": i} for i in range(200)]
+        stream = DictStream(iter(rows)).aggregate(
+            "k", {"v": ["sum", "max"]}, max_groups=3
+        )
+        assert isinstance(stream, DictStream)
+        expected = DictList2(rows).aggregate("k", {"v": ["sum", "max"]})
+        assert stream.collect() == expected
@@ -58,20 +58,47 @@ def test_unique_all_unique():
     assert result == data
 
 
-def test_unique_nested_dicts_are_not_removed():
+def test_unique_nested_dicts_are_removed():
     """
-    демонстрирует ограничение:
-    метод .unique() не поддерживает словари с вложенными словарями
-    из-за TypeError при попытке сделать frozenset(dict.items()).
+    Строки с вложенными словарями и списками сравниваются по содержимому;
+    список и кортеж с теми же элементами различны.
     """
     data = DictList2(
         [
-            {"id": 1, "meta": {"a": 1}},  # вложенный словарь
-            {"id": 1, "meta": {"a": 1}},  # дубликат
+            {"id": 1, "meta": {"a": 1}, "tags": ["x", "y"]},
+            {"id": 1, "meta": {"a": 1}, "tags": ["x", "y"]},  # дубликат
+            {"tags": ["x", "y"], "meta": {"a": 1}, "id": 1},  # дубликат
+            {"id": 1, "meta": {"a": 2}, "tags": ["x", "y"]},
+            {"id": 1, "meta": {"a": 1}, "tags": ("x", "y")},
+            {"id": 1, "meta": {"a": [1, {"b": {2}}]}},
+            {"id": 1, "meta": {"a": [1, {"b": {2}}]}},  # дубликат
         ]
     )
 
-    # Поскольку frozenset(item.items()) не работает для вложенных словарей,
-    # ожидается исключение TypeError
+    result = data.unique()
+
+    assert result == [data[0], data[3], data[4], data[5]]
+    assert result[0] is data[0]
+
+
+def test_unique_digest():
+    """
+    digest=True даёт тот же результат; совпадение хэшей у разных строк
+    не теряет строку.
+    """
+    data = DictList2([{"id": i % 7, "tags": [i % 3]} for i in range(50)])
+    assert data.unique(digest=True) == data.unique()
+
+    # hash(-1) == hash(-2) в CPython: разные строки с одним хэшем
+    colliding = DictList2([{"v": -1}, {"v": -2}, {"v": -1}, {"v": -2}])
+    assert colliding.unique(digest=True) == [{"v": -1}, {"v": -2}]
+
+
+def test_unique_unsupported_value():
+    """Нехэшируемое значение неизвестного типа — TypeError."""
+
+    class Box:
+        __hash__ = None
+
     with pytest.raises(TypeError):
-        _ = data.unique()
+        DictList2([{"box": Box()}]).unique()